@@ -8,6 +8,7 @@ import cv2
 import json
 import threading
 import queue
+import time
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -27,6 +28,13 @@ except Exception as e:
     from id_card_verifier import IDCardVerifier
 
 from config.config import *
+from database.directory_cache import DirectoryCache, canonical_plate
+from access_matcher import PendingMatcher
+from camera_capture import open_camera, camera_source
+from degradation import DegradationController
+from model_registry import print_loaded_models
+from pipeline_timing import PipelineTimer
+from ring_buffer import SpillingRingBuffer
 
 
 class AccessControlSystem:
@@ -34,40 +42,86 @@ class AccessControlSystem:
     Unified access control system for campus entry/exit
     """
     
-    def __init__(self, vehicle_model_path=None, id_card_model_path=None):
+    def __init__(self, vehicle_model_path=None, id_card_model_path=None, db=None, model_server=None):
         """
         Initialize the unified access control system
         
         Args:
             vehicle_model_path (str): Path to vehicle detection model
             id_card_model_path (str): Path to ID card detection model
+            db (StorageBackend): Connected database for access logs
+                (Supabase or SQLite, see database.storage); None = JSON files only
+            model_server (str): Address of a running model_server.py; the
+                recognizers then live there instead of in this process
         """
         print("=" * 70)
         print("🏛️  SMART CAMPUS ACCESS VERIFICATION SYSTEM")
         print("=" * 70)
         print("🚀 Initializing modules...")
+        ensure_directories()
+        
+        # Shared model server: one connection (and frame ring) per pipeline
+        self.model_clients = {}
+        if model_server:
+            from model_server import ModelClient
+            print(f"\n[1/1] Connecting to model server at {model_server}...")
+            self.model_clients = {
+                name: ModelClient(model_server, name=name) for name in ('vehicle', 'id_card')
+            }
+            self.vehicle_recognizer = None
+            self.id_card_verifier = None
+        else:
+            # Initialize recognizers
+            print("\n[1/2] Initializing Vehicle Plate Recognizer...")
+            self.vehicle_recognizer = VehiclePlateRecognizer(
+                model_path=vehicle_model_path,
+                use_gpu=USE_GPU
+            )
+            
+            print("\n[2/2] Initializing ID Card Verifier...")
+            # Positional: the offline recognizer calls it yolo_model_path
+            self.id_card_verifier = IDCardVerifier(
+                id_card_model_path,
+                use_gpu=USE_GPU
+            )
         
-        # Initialize recognizers
-        print("\n[1/2] Initializing Vehicle Plate Recognizer...")
-        self.vehicle_recognizer = VehiclePlateRecognizer(
-            model_path=vehicle_model_path,
-            use_gpu=USE_GPU
-        )
+        # Hold TARGET_RESPONSE_TIME under load by trading recognition quality
+        self.degradation = None
+        if ADAPTIVE_DEGRADATION:
+            self.degradation = DegradationController(
+                TARGET_RESPONSE_TIME,
+                recognizers=[self.vehicle_recognizer, self.id_card_verifier],
+                degrade_at=DEGRADE_AT,
+                restore_below=RESTORE_BELOW,
+                cooldown_seconds=DEGRADATION_COOLDOWN,
+                idle_restore_seconds=DEGRADATION_IDLE_RESTORE
+            )
         
-        print("\n[2/2] Initializing ID Card Verifier...")
-        self.id_card_verifier = IDCardVerifier(
-            model_path=id_card_model_path,
-            use_gpu=USE_GPU
-        )
+        # Database backend (optional) and in-memory student/vehicle directory
+        self.db = db
+        self.directory = None
+        if db:
+            self.directory = DirectoryCache(db, refresh_interval=DIRECTORY_REFRESH_INTERVAL,
+                                            full_reload_every=DIRECTORY_FULL_RELOAD_EVERY).start()
         
         # Access records
-        self.pending_verifications = {}  # Temporary storage for partial verifications
-        self.access_log = []
+        # Partial verifications, paired by vehicle owner (see access_matcher.py)
+        self.pending_verifications = PendingMatcher(ACCESS_TIME_WINDOW, directory=self.directory)
+        # Recent decisions only: every record is already in the daily log file (and database)
+        self.access_log = SpillingRingBuffer('access_log', spill=False)
         
         # Queues for multi-threaded processing
         self.vehicle_queue = queue.Queue()
         self.id_card_queue = queue.Queue()
         
+        # Per-camera pipeline state (dual camera mode)
+        self.latest_frames = {}
+        self.pipeline_stats = {}
+        
+        # Decode, decision, log / DB write and end-to-end latency histograms
+        # (recognition stages are timed by each recognizer)
+        self.timing = PipelineTimer(enabled=PIPELINE_TIMING)
+        
         # Statistics
         self.stats = {
             'total_attempts': 0,
@@ -78,9 +132,29 @@ class AccessControlSystem:
             'both_verified': 0
         }
         
+        if not self.model_clients:
+            print_loaded_models()
+        
         print("\n✅ System initialized successfully!")
         print("=" * 70)
     
+    @property
+    def local_recognizers(self):
+        """Recognizers running in this process (none with a model server)"""
+        return [r for r in (self.vehicle_recognizer, self.id_card_verifier) if r is not None]
+    
+    @property
+    def ready(self):
+        """True once every local recognizer has finished its warm-up"""
+        # With a model server, the server warms its own models (see --preload)
+        return all(getattr(r, 'ready', True) for r in self.local_recognizers)
+    
+    def ensure_ready(self):
+        """Warm up recognizers that skipped it at init (WARMUP_ON_INIT = False)"""
+        for recognizer in self.local_recognizers:
+            if not getattr(recognizer, 'ready', True):
+                recognizer.warmup()
+    
     def match_vehicle_and_id(self, vehicle_data, id_card_data):
         """
         Match vehicle and ID card data for verification
@@ -104,6 +178,24 @@ class AccessControlSystem:
         vehicle_valid = vehicle_data and vehicle_data.get('is_valid', False)
         id_card_valid = id_card_data and id_card_data.get('is_valid', False)
         
+        # Only registered students / vehicles count (in-memory lookups)
+        unregistered = []
+        if self.directory and REQUIRE_REGISTERED_IDENTITY:
+            if id_card_valid and not self.directory.get_student(id_card_data.get('moodle_id')):
+                id_card_valid = False
+                unregistered.append(f"student {id_card_data.get('moodle_id')}")
+            if vehicle_valid and not self.directory.get_vehicle(vehicle_data.get('plate_text')):
+                vehicle_valid = False
+                unregistered.append(f"vehicle {vehicle_data.get('plate_text')}")
+        
+        # The card holder must own the vehicle
+        owner_mismatch = False
+        if self.directory and vehicle_valid and id_card_valid:
+            owner = self.directory.owner_of(vehicle_data.get('plate_text'))
+            if owner != id_card_data.get('moodle_id'):
+                vehicle_valid = False
+                owner_mismatch = True
+        
         if REQUIRE_BOTH_VERIFICATIONS:
             # Both must be valid
             if vehicle_valid and id_card_valid:
@@ -133,46 +225,35 @@ class AccessControlSystem:
                 match_result['reason'] = 'No valid identification'
                 self.stats['access_denied'] += 1
         
+        if unregistered and match_result['access_decision'] == 'denied':
+            match_result['reason'] = f"Not registered: {', '.join(unregistered)}"
+        elif owner_mismatch and match_result['access_decision'] == 'denied':
+            match_result['reason'] = 'Vehicle is not registered to the card holder'
+        
         self.stats['total_attempts'] += 1
         return match_result
     
-    def check_pending_verification(self, moodle_id=None, plate_number=None):
+    def expire_pending_verifications(self):
         """
-        Check if there's a pending verification waiting to be matched
+        Deny verifications whose partner did not arrive within ACCESS_TIME_WINDOW
         
-        Args:
-            moodle_id (str): Moodle ID to check
-            plate_number (str): Vehicle plate to check
-            
         Returns:
-            dict: Matched verification if found, None otherwise
+            int: Number of expired verifications
         """
-        current_time = datetime.now()
-        
-        # Check pending verifications
-        for key, pending in list(self.pending_verifications.items()):
-            # Check if within time window
-            pending_time = datetime.fromisoformat(pending['timestamp'])
-            if (current_time - pending_time).seconds > ACCESS_TIME_WINDOW:
-                # Expired, remove and deny
-                expired = self.pending_verifications.pop(key)
-                expired['access_decision'] = 'denied'
-                expired['reason'] = 'Verification timeout'
-                self.save_access_log(expired)
-                continue
-            
-            # Try to match
-            if moodle_id and pending.get('id_card', {}).get('moodle_id') == moodle_id:
-                return self.pending_verifications.pop(key)
-            
-            if plate_number and pending.get('vehicle', {}).get('plate_text') == plate_number:
-                return self.pending_verifications.pop(key)
-        
-        return None
+        expired = self.pending_verifications.expire()
+        for entry in expired:
+            self.save_access_log({
+                'timestamp': entry['timestamp'],
+                'vehicle': entry['vehicle'],
+                'id_card': entry['id_card'],
+                'access_decision': 'denied',
+                'reason': 'Verification timeout'
+            })
+        return len(expired)
     
     def process_vehicle_detection(self, vehicle_data):
         """
-        Process vehicle detection and check for matching ID card
+        Process vehicle detection and check for its owner's pending ID card
         
         Args:
             vehicle_data (dict): Vehicle detection data
@@ -182,28 +263,21 @@ class AccessControlSystem:
         
         plate_number = vehicle_data.get('plate_text')
         
-        # Check for pending ID card verification
-        pending = self.check_pending_verification(plate_number=plate_number)
+        with self.timing.stage('decision'):
+            self.expire_pending_verifications()
+            pending = self.pending_verifications.add_vehicle(vehicle_data, get_timestamp())
+            # Found the owner's ID card?
+            result = self.match_vehicle_and_id(vehicle_data, pending.get('id_card')) if pending else None
         
-        if pending:
-            # Found matching ID card
-            pending['vehicle'] = vehicle_data
-            result = self.match_vehicle_and_id(vehicle_data, pending.get('id_card'))
+        if result:
             self.save_access_log(result)
-            print(f"\n✅ ACCESS GRANTED: {pending.get('id_card', {}).get('name')} | Vehicle: {plate_number}")
+            self.print_decision(result)
         else:
-            # Store as pending
-            pending_key = f"vehicle_{plate_number}_{get_timestamp()}"
-            self.pending_verifications[pending_key] = {
-                'timestamp': get_timestamp(),
-                'vehicle': vehicle_data,
-                'id_card': None
-            }
             print(f"\n⏳ Vehicle detected: {plate_number} (waiting for ID card)")
     
     def process_id_card_detection(self, id_card_data):
         """
-        Process ID card detection and check for matching vehicle
+        Process ID card detection and check for a pending vehicle the holder owns
         
         Args:
             id_card_data (dict): ID card detection data
@@ -214,25 +288,29 @@ class AccessControlSystem:
         moodle_id = id_card_data.get('moodle_id')
         name = id_card_data.get('name')
         
-        # Check for pending vehicle verification
-        pending = self.check_pending_verification(moodle_id=moodle_id)
+        with self.timing.stage('decision'):
+            self.expire_pending_verifications()
+            pending = self.pending_verifications.add_id_card(id_card_data, get_timestamp())
+            # Found a vehicle registered to the card holder?
+            result = self.match_vehicle_and_id(pending.get('vehicle'), id_card_data) if pending else None
         
-        if pending:
-            # Found matching vehicle
-            pending['id_card'] = id_card_data
-            result = self.match_vehicle_and_id(pending.get('vehicle'), id_card_data)
+        if result:
             self.save_access_log(result)
-            print(f"\n✅ ACCESS GRANTED: {name} (ID: {moodle_id}) | Vehicle: {pending.get('vehicle', {}).get('plate_text')}")
+            self.print_decision(result)
         else:
-            # Store as pending
-            pending_key = f"id_card_{moodle_id}_{get_timestamp()}"
-            self.pending_verifications[pending_key] = {
-                'timestamp': get_timestamp(),
-                'vehicle': None,
-                'id_card': id_card_data
-            }
             print(f"\n⏳ ID Card detected: {name} (ID: {moodle_id}) (waiting for vehicle)")
     
+    def print_decision(self, result):
+        """Print a paired access decision"""
+        id_card = result.get('id_card') or {}
+        vehicle = result.get('vehicle') or {}
+        if result['access_decision'] == 'granted':
+            print(f"\n✅ ACCESS GRANTED: {id_card.get('name')} (ID: {id_card.get('moodle_id')}) "
+                  f"| Vehicle: {vehicle.get('plate_text')}")
+        else:
+            print(f"\n❌ ACCESS DENIED: {id_card.get('name')} (ID: {id_card.get('moodle_id')}) "
+                  f"| Vehicle: {vehicle.get('plate_text')} - {result.get('reason')}")
+    
     def save_access_log(self, access_record):
         """
         Save access decision to log
@@ -246,24 +324,67 @@ class AccessControlSystem:
         log_filename = f"access_log_{get_date_string()}.json"
         log_path = ACCESS_LOG_DIR / log_filename
         
-        # Load existing log if exists
-        if log_path.exists():
-            with open(log_path, 'r', encoding='utf-8') as f:
-                existing_log = json.load(f)
-        else:
-            existing_log = {'date': get_date_string(), 'records': []}
-        
-        # Append new record
-        existing_log['records'].append(access_record)
+        with self.timing.stage('log_write'):
+            # Load existing log if exists
+            if log_path.exists():
+                with open(log_path, 'r', encoding='utf-8') as f:
+                    existing_log = json.load(f)
+            else:
+                existing_log = {'date': get_date_string(), 'records': []}
+            
+            # Append new record
+            existing_log['records'].append(access_record)
+            
+            # Save
+            with open(log_path, 'w', encoding='utf-8') as f:
+                json.dump(existing_log, f, indent=2, ensure_ascii=False)
         
-        # Save
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_log, f, indent=2, ensure_ascii=False)
+        if self.db:
+            with self.timing.stage('db_write'):
+                self.save_access_to_db(access_record)
         
         # Alert if access denied
         if SEND_ALERTS and access_record['access_decision'] == 'denied':
             self.send_alert(access_record)
     
+    def save_access_to_db(self, access_record):
+        """
+        Write an access decision to the database backend
+        
+        Args:
+            access_record (dict): Access decision record
+        """
+        status = 'allowed' if access_record['access_decision'] == 'granted' else 'denied'
+        id_card = access_record.get('id_card')
+        vehicle = access_record.get('vehicle')
+        
+        # Recognition events never write the registry: an unregistered ID or
+        # plate only gets an inactive placeholder so the log's foreign key holds
+        if id_card and id_card.get('moodle_id'):
+            if not (self.directory and self.directory.get_student(id_card['moodle_id'])):
+                self.db.ensure_student(id_card['moodle_id'], id_card.get('name'))
+            self.db.log_id_card_access(
+                moodle_id=id_card['moodle_id'],
+                name=id_card.get('name'),
+                department=id_card.get('department'),
+                confidence=id_card.get('confidence'),
+                camera_id='id_card_camera',
+                status=status
+            )
+        
+        if vehicle and vehicle.get('plate_text'):
+            # Registered plates are logged in their registered spelling
+            registered = self.directory.get_vehicle(vehicle['plate_text']) if self.directory else None
+            plate = registered['license_plate'] if registered else canonical_plate(vehicle['plate_text'])
+            if not registered:
+                self.db.ensure_vehicle(plate)
+            self.db.log_vehicle_access(
+                license_plate=plate,
+                confidence=vehicle.get('confidence'),
+                camera_id='vehicle_camera',
+                status=status
+            )
+    
     def send_alert(self, access_record):
         """
         Send alert for unauthorized access attempt
@@ -293,80 +414,83 @@ class AccessControlSystem:
         """
         Run system with two cameras (one for vehicles, one for ID cards)
         
+        Each camera gets its own capture + recognition worker thread feeding
+        vehicle_queue / id_card_queue, and a decision thread pairs the
+        events. The cameras run at their own rates, so a slow OCR pass on
+        one never stalls the other. The main thread only displays frames.
+        
         Args:
-            vehicle_camera_index (int): Camera index for vehicle detection
-            id_card_camera_index (int): Camera index for ID card detection
+            vehicle_camera_index (int or str): Camera index for vehicle detection
+                (or a video / image directory to replay, see camera_replay.py)
+            id_card_camera_index (int or str): Camera index for ID card detection
             duration (int): Duration in seconds (None = infinite)
         """
         print("\n🎥 Starting dual camera system...")
         print(f"   Camera {vehicle_camera_index}: Vehicle Detection")
         print(f"   Camera {id_card_camera_index}: ID Card Verification")
         print("\nPress 'q' to quit")
+        self.ensure_ready()
         
-        # Open both cameras
-        vehicle_cap = cv2.VideoCapture(vehicle_camera_index)
-        id_card_cap = cv2.VideoCapture(id_card_camera_index)
+        # Open both cameras (threaded, newest frame only)
+        vehicle_cap = open_camera(vehicle_camera_index, CAMERA_WIDTH, CAMERA_HEIGHT,
+                                  CAMERA_FPS, name='vehicle', timer=self.timing)
+        id_card_cap = open_camera(id_card_camera_index, CAMERA_WIDTH, CAMERA_HEIGHT,
+                                  CAMERA_FPS, name='id_card', timer=self.timing)
         
         if not vehicle_cap.isOpened() or not id_card_cap.isOpened():
             print("❌ Failed to open one or both cameras")
+            vehicle_cap.release()
+            id_card_cap.release()
             return
         
-        # Set camera properties
-        for cap in [vehicle_cap, id_card_cap]:
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-            cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+        stop_event = threading.Event()
+        
+        workers = [
+            threading.Thread(
+                target=self._camera_worker, name='vehicle-camera', daemon=True,
+                args=('vehicle', vehicle_cap, self._recognize_vehicles, self.vehicle_queue, stop_event)
+            ),
+            threading.Thread(
+                target=self._camera_worker, name='id-card-camera', daemon=True,
+                args=('id_card', id_card_cap, self._recognize_id_cards, self.id_card_queue, stop_event)
+            ),
+            threading.Thread(
+                target=self._decision_worker, name='access-decisions', daemon=True,
+                args=(stop_event,)
+            )
+        ]
+        for worker in workers:
+            worker.start()
         
-        frame_count = 0
         start_time = datetime.now()
-        
-        while True:
-            # Read frames
-            ret1, vehicle_frame = vehicle_cap.read()
-            ret2, id_card_frame = id_card_cap.read()
-            
-            if not ret1 or not ret2:
-                print("❌ Failed to read from cameras")
-                break
-            
-            frame_count += 1
-            timestamp = get_timestamp()
-            
-            # Process vehicle frame
-            vehicle_results, vehicle_annotated = self.vehicle_recognizer.detect_and_extract(
-                vehicle_frame, frame_count, timestamp
-            )
-            
-            # Process ID card frame
-            id_card_results, id_card_annotated = self.id_card_verifier.detect_and_extract_id_card(
-                id_card_frame, frame_count, timestamp
-            )
-            
-            # Process detections
-            if vehicle_results['detections']:
-                for detection in vehicle_results['detections']:
-                    self.process_vehicle_detection(detection)
-            
-            if id_card_results['id_cards']:
-                for card in id_card_results['id_cards']:
-                    self.process_id_card_detection(card)
-            
-            # Display both feeds
-            combined = np.hstack([vehicle_annotated, id_card_annotated])
-            cv2.imshow('Campus Access Control System', combined)
+        last_stats = time.monotonic()
+        
+        while not stop_event.is_set():
+            # Display both feeds (whatever each worker finished last)
+            vehicle_annotated = self.latest_frames.get('vehicle')
+            id_card_annotated = self.latest_frames.get('id_card')
+            if vehicle_annotated is not None and id_card_annotated is not None:
+                cv2.imshow('Campus Access Control System',
+                           self._side_by_side(vehicle_annotated, id_card_annotated))
             
             # Display stats
-            if frame_count % 30 == 0:
+            if time.monotonic() - last_stats >= 5:
                 self.print_stats()
+                last_stats = time.monotonic()
             
             # Handle key press
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if cv2.waitKey(15) & 0xFF == ord('q'):
                 break
             
             # Check duration
             if duration and (datetime.now() - start_time).total_seconds() > duration:
                 break
         
+        # Stop workers; the decision thread drains queued events before exiting
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        
         # Cleanup
         vehicle_cap.release()
         id_card_cap.release()
@@ -375,63 +499,195 @@ class AccessControlSystem:
         # Final report
         self.generate_session_report()
     
+    def _recognize_vehicles(self, frame, frame_count, timestamp):
+        """Run plate recognition; returns (detections, annotated frame)"""
+        if self.model_clients:
+            results, annotated = self.model_clients['vehicle'].detect_plates(
+                frame, frame_count, timestamp, quality=self._remote_quality())
+        else:
+            results, annotated = self.vehicle_recognizer.detect_and_extract(frame, frame_count, timestamp)
+        return results['detections'], annotated
+    
+    def _recognize_id_cards(self, frame, frame_count, timestamp):
+        """Run ID card recognition; returns (cards, annotated frame)"""
+        if self.model_clients:
+            results, annotated = self.model_clients['id_card'].recognize_id_cards(
+                frame, quality=self._remote_quality())
+        elif hasattr(self.id_card_verifier, 'recognize_id_card'):
+            # OfflineIDCardRecognizer: same card dicts the model server returns
+            cards, annotated = self.id_card_verifier.recognize_id_card(frame)
+            results = {'id_cards': [dict(card['data'], is_valid=card['data'].get('moodle_id') is not None)
+                                    for card in cards]}
+        else:
+            results, annotated = self.id_card_verifier.detect_and_extract_id_card(frame, frame_count, timestamp)
+        return results['id_cards'], annotated
+    
+    def _remote_quality(self):
+        """Quality settings for the model server (None = server default)"""
+        return self.degradation.recognizer_settings() if self.degradation else None
+    
+    def _record_decision_latency(self, captured_at):
+        """Record capture-to-decision latency (and feed the degradation controller)"""
+        if not captured_at:
+            return
+        latency = time.time() - captured_at
+        self.timing.record('end_to_end', latency)
+        if self.degradation:
+            self.degradation.record(latency)
+    
+    def _camera_worker(self, name, cap, recognize, events, stop_event):
+        """
+        Capture + recognition loop for one camera
+        
+        Args:
+            name (str): Pipeline name ('vehicle' or 'id_card')
+            cap (LatestFrameCapture or ReplayCapture): Opened camera
+            recognize (callable): frame, frame_count, timestamp -> (events, annotated)
+            events (queue.Queue): Queue the (detection, captured_at) pairs are put on
+            stop_event (threading.Event): Set to stop the worker
+        """
+        stats = {'frames': 0, 'events': 0, 'started': time.monotonic(), 'fps': 0.0,
+                 'frame_age_ms': 0.0, 'frames_dropped': 0}
+        self.pipeline_stats[name] = stats
+        
+        while not stop_event.is_set():
+            ret, frame, frame_info = cap.read_latest()
+            if not ret:
+                if cap.isOpened():
+                    continue  # No new frame within the timeout: stalled, not lost
+                print(f"❌ {name} camera stopped delivering frames")
+                stop_event.set()
+                break
+            stats['frame_age_ms'] = frame_info['age_ms']
+            stats['frames_dropped'] += frame_info['dropped_before']
+            
+            stats['frames'] += 1
+            if self.degradation:
+                self.degradation.update()  # Lets a quiet gate recover quality
+            # Sparser sampling when degraded: show the frame, skip recognition
+            if self.degradation and not self.degradation.should_process(stats['frames']):
+                self.latest_frames[name] = frame
+                continue
+            
+            try:
+                detections, annotated = recognize(frame, stats['frames'], get_timestamp())
+            except Exception as e:
+                print(f"⚠️  {name} recognition failed: {e}")
+                continue
+            
+            for detection in detections:
+                events.put((detection, frame_info['captured_at']))
+            stats['events'] += len(detections)
+            stats['fps'] = round(stats['frames'] / max(time.monotonic() - stats['started'], 1e-6), 2)
+            self.latest_frames[name] = annotated
+    
+    def _decision_worker(self, stop_event):
+        """
+        Consume vehicle and ID card events and make access decisions
+        
+        The only thread that touches pending verifications and statistics,
+        so the matcher needs no locking.
+        """
+        sources = (
+            (self.vehicle_queue, self.process_vehicle_detection),
+            (self.id_card_queue, self.process_id_card_detection)
+        )
+        while True:
+            handled = 0
+            for events, handle in sources:
+                while True:
+                    try:
+                        detection, captured_at = events.get_nowait()
+                    except queue.Empty:
+                        break
+                    handle(detection)
+                    self._record_decision_latency(captured_at)
+                    handled += 1
+            
+            # Time out unmatched verifications even when no events arrive
+            self.expire_pending_verifications()
+            
+            if not handled:
+                if stop_event.is_set():
+                    break
+                stop_event.wait(0.01)
+    
+    def _side_by_side(self, left, right):
+        """Stack two frames horizontally, scaling the right one to the left's height"""
+        if left.shape[0] != right.shape[0]:
+            scale = left.shape[0] / right.shape[0]
+            right = cv2.resize(right, (int(right.shape[1] * scale), left.shape[0]))
+        return np.hstack([left, right])
+    
     def run_single_camera_system(self, camera_index=0, duration=None):
         """
         Run system with single camera (alternating between vehicle and ID card detection)
         
         Args:
-            camera_index (int): Camera index
+            camera_index (int or str): Camera index (or a recording to replay)
             duration (int): Duration in seconds (None = infinite)
         """
         print("\n📷 Starting single camera system...")
         print("   Press '1' for Vehicle Mode")
         print("   Press '2' for ID Card Mode")
         print("   Press 'q' to quit")
+        self.ensure_ready()
         
-        cap = cv2.VideoCapture(camera_index)
+        # Threaded capture: each pass works on the newest frame
+        cap = open_camera(camera_index, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, name='gate',
+                          timer=self.timing)
         if not cap.isOpened():
             print("❌ Failed to open camera")
             return
         
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-        cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
-        
         mode = 'vehicle'  # Start with vehicle mode
         frame_count = 0
         start_time = datetime.now()
+        stats = {'frames': 0, 'events': 0, 'started': time.monotonic(), 'fps': 0.0,
+                 'frame_age_ms': 0.0, 'frames_dropped': 0}
+        self.pipeline_stats['gate'] = stats
         
         while True:
-            ret, frame = cap.read()
+            ret, frame, frame_info = cap.read_latest()
             if not ret:
-                print("❌ Failed to read frame")
+                if cap.isOpened():
+                    continue  # No new frame within the timeout: stalled, not lost
+                print("❌ Camera stopped delivering frames")
                 break
             
             frame_count += 1
             timestamp = get_timestamp()
+            stats['frames'] = frame_count
+            stats['frame_age_ms'] = frame_info['age_ms']
+            stats['frames_dropped'] += frame_info['dropped_before']
+            stats['fps'] = round(frame_count / max(time.monotonic() - stats['started'], 1e-6), 2)
+            
+            if self.degradation:
+                self.degradation.update()  # Lets a quiet gate recover quality
             
-            # Process based on mode
-            if mode == 'vehicle':
-                results, annotated = self.vehicle_recognizer.detect_and_extract(
-                    frame, frame_count, timestamp
-                )
+            # Process based on mode (sparser sampling when degraded)
+            if self.degradation and not self.degradation.should_process(frame_count):
+                annotated = frame
+            
+            elif mode == 'vehicle':
+                detections, annotated = self._recognize_vehicles(frame, frame_count, timestamp)
+                stats['events'] += len(detections)
                 
-                if results['detections']:
-                    for detection in results['detections']:
-                        self.process_vehicle_detection(detection)
+                for detection in detections:
+                    self.process_vehicle_detection(detection)
+                    self._record_decision_latency(frame_info['captured_at'])
                 
                 # Add mode label
                 cv2.putText(annotated, "MODE: VEHICLE DETECTION", (10, 30),
                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             
             else:  # ID card mode
-                results, annotated = self.id_card_verifier.detect_and_extract_id_card(
-                    frame, frame_count, timestamp
-                )
+                cards, annotated = self._recognize_id_cards(frame, frame_count, timestamp)
+                stats['events'] += len(cards)
                 
-                if results['id_cards']:
-                    for card in results['id_cards']:
-                        self.process_id_card_detection(card)
+                for card in cards:
+                    self.process_id_card_detection(card)
+                    self._record_decision_latency(frame_info['captured_at'])
                 
                 # Add mode label
                 cv2.putText(annotated, "MODE: ID CARD VERIFICATION", (10, 30),
@@ -472,8 +728,38 @@ class AccessControlSystem:
         print(f"Vehicle Only:        {self.stats['vehicle_only']}")
         print(f"ID Card Only:        {self.stats['id_card_only']}")
         print(f"Pending:             {len(self.pending_verifications)}")
+        if self.degradation:
+            quality = self.degradation.get_stats()
+            print(f"Quality level:       {quality['profile']} (p95 {quality['p95_seconds']}s / "
+                  f"{quality['budget_seconds']}s budget)")
+        for name, pipeline in self.pipeline_stats.items():
+            print(f"{name + ' pipeline:':<21}{pipeline['fps']} FPS, {pipeline['events']} events")
         print("=" * 70)
     
+    def stage_latency(self):
+        """
+        Per-stage p50 / p95 / p99 for the whole system
+        
+        Returns:
+            dict: 'system' (decode, decision, writes, end_to_end) and one
+                  entry per local recognizer (detect, preprocess, ocr, parse)
+        """
+        report = {'system': self.timing.report()}
+        for name, recognizer in (('vehicle', self.vehicle_recognizer), ('id_card', self.id_card_verifier)):
+            timing = getattr(recognizer, 'timing', None)
+            if timing:
+                report[name] = timing.report()
+        return report
+
+    def profile_timers(self):
+        """Stage timers reported next to a sampling profile (same keys as stage_latency)"""
+        timers = {'system': self.timing}
+        for name, recognizer in (('vehicle', self.vehicle_recognizer), ('id_card', self.id_card_verifier)):
+            timing = getattr(recognizer, 'timing', None)
+            if timing:
+                timers[name] = timing
+        return timers
+
     def generate_session_report(self):
         """Generate final session report"""
         print("\n" + "=" * 70)
@@ -481,13 +767,27 @@ class AccessControlSystem:
         print("=" * 70)
         
         self.print_stats()
+        self.timing.print_report("System stage latency")
+        for recognizer in self.local_recognizers:
+            if getattr(recognizer, 'timing', None):
+                recognizer.timing.print_report(f"{type(recognizer).__name__} stage latency")
         
         # Save report
         report = {
             'session_ended': get_timestamp(),
             'statistics': self.stats,
             'pending_verifications': len(self.pending_verifications),
-            'total_access_logs': len(self.access_log)
+            'total_access_logs': self.access_log.total,
+            'pipelines': {
+                name: {'frames': p['frames'], 'events': p['events'], 'fps': p['fps'],
+                       'frames_dropped': p['frames_dropped']}
+                for name, p in self.pipeline_stats.items()
+            },
+            'degradation': self.degradation.get_stats() if self.degradation else None,
+            'warmup': {
+                type(r).__name__: getattr(r, 'warmup_report', None) for r in self.local_recognizers
+            },
+            'stage_latency': self.stage_latency()
         }
         
         report_path = ACCESS_LOG_DIR / get_output_filename('session_report')
@@ -505,16 +805,44 @@ def main():
     parser = argparse.ArgumentParser(description='Smart Campus Access Control System')
     parser.add_argument('--mode', choices=['single', 'dual'], default='single',
                        help='Camera mode: single or dual')
-    parser.add_argument('--vehicle-camera', type=int, default=0,
-                       help='Vehicle camera index')
-    parser.add_argument('--id-card-camera', type=int, default=1,
-                       help='ID card camera index (dual mode only)')
+    parser.add_argument('--vehicle-camera', type=camera_source, default=0,
+                       help='Vehicle camera index, or a video / image directory to replay')
+    parser.add_argument('--id-card-camera', type=camera_source, default=1,
+                       help='ID card camera index or recording (dual mode only)')
     parser.add_argument('--duration', type=int, help='Duration in seconds')
+    parser.add_argument('--db-backend', choices=['postgres', 'sqlite', 'none'],
+                       help='Access log database (default: CAMPUS_DB_BACKEND env)')
+    parser.add_argument('--model-server', nargs='?', const=MODEL_SERVER_ADDRESS,
+                       help='Use a running model_server.py instead of loading models here '
+                            f'(default address: {MODEL_SERVER_ADDRESS})')
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                       help='Serve Prometheus metrics on this port (default: CAMPUS_METRICS_PORT env, off)')
+    parser.add_argument('--profile', type=float, nargs='?', const=PROFILE_SECONDS, metavar='SECONDS',
+                       help=f'Capture a sampling profile once running (default window: {PROFILE_SECONDS:g}s); '
+                            'kill -USR1 <pid> captures one at any time')
     
     args = parser.parse_args()
     
+    # Database (optional - decisions are always saved to JSON logs)
+    db = None
+    if args.db_backend != 'none':
+        from database.storage import create_storage
+        db = create_storage(args.db_backend)
+        if db.connect():
+            db.create_tables()
+        else:
+            db = None
+    
     # Initialize system
-    system = AccessControlSystem()
+    system = AccessControlSystem(db=db, model_server=args.model_server)
+    
+    metrics = None
+    if args.metrics_port:
+        from metrics_server import MetricsServer, access_control_metrics
+        metrics = MetricsServer(access_control_metrics(system), port=args.metrics_port).start()
+    
+    from profiling import start_profiler
+    profiler = start_profiler('access_control', system.profile_timers, seconds=args.profile)
     
     # Run system
     if args.mode == 'dual':
@@ -528,6 +856,17 @@ def main():
             camera_index=args.vehicle_camera,
             duration=args.duration
         )
+    
+    profiler.stop()
+    for client in system.model_clients.values():
+        client.close()
+    
+    if metrics:
+        metrics.stop()
+    
+    if db:
+        system.directory.stop()
+        db.disconnect()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+Pending Verification Matcher
+Pairs vehicle plate and ID card events that belong together
+A plate is paired only with its registered owner's card (and vice versa),
+using the directory's owner index, so every lookup is O(1) however many
+verifications are pending at shift change
+"""
+
+import collections
+import time
+
+from database.directory_cache import canonical_plate
+
+
+class PendingMatcher:
+    """
+    Pending vehicle / ID card verifications indexed by plate and Moodle ID
+    """
+
+    def __init__(self, window_seconds, directory=None, clock=time.monotonic):
+        """
+        Initialize the matcher
+
+        Args:
+            window_seconds (float): How long an unmatched event waits for its pair
+            directory (DirectoryCache): Owner index source. Without one, any
+                vehicle is paired with the oldest pending card (legacy behaviour)
+            clock (callable): Monotonic time source (seconds)
+        """
+        self.window = window_seconds
+        self.directory = directory
+        self.clock = clock
+
+        # One pending entry per identity; dicts keep arrival order
+        self.pending_vehicles = {}   # canonical plate -> entry
+        self.pending_cards = {}      # moodle_id -> entry
+
+        # (expires, kind, key, entry) in expiry order; stale nodes are skipped
+        self._expiry = collections.deque()
+
+    def __len__(self):
+        return len(self.pending_vehicles) + len(self.pending_cards)
+
+    def add_vehicle(self, vehicle_data, timestamp):
+        """
+        Match a vehicle with its owner's pending card, or leave it pending
+
+        Args:
+            vehicle_data (dict): Vehicle detection data
+            timestamp (str): Detection timestamp (ISO)
+
+        Returns:
+            dict: Matched pending card entry, or None if the vehicle is now pending
+        """
+        plate = canonical_plate(vehicle_data.get('plate_text'))
+
+        if self.directory:
+            owner = self.directory.owner_of(plate)
+            match = self._take(self.pending_cards, owner) if owner else None
+        else:
+            match = self._take_oldest(self.pending_cards)
+
+        if match:
+            return match
+
+        self._hold(self.pending_vehicles, 'vehicle', plate, {
+            'timestamp': timestamp,
+            'vehicle': vehicle_data,
+            'id_card': None
+        })
+        return None
+
+    def add_id_card(self, id_card_data, timestamp):
+        """
+        Match a card with a pending vehicle it owns, or leave it pending
+
+        Args:
+            id_card_data (dict): ID card detection data
+            timestamp (str): Detection timestamp (ISO)
+
+        Returns:
+            dict: Matched pending vehicle entry, or None if the card is now pending
+        """
+        moodle_id = id_card_data.get('moodle_id')
+
+        if self.directory:
+            # A student owns a handful of plates; pair with the one waiting longest
+            candidates = [self.pending_vehicles[plate]
+                          for plate in self.directory.plates_of(moodle_id)
+                          if plate in self.pending_vehicles]
+            match = None
+            if candidates:
+                oldest = min(candidates, key=lambda entry: entry['expires'])
+                match = self._take(self.pending_vehicles, oldest['key'])
+        else:
+            match = self._take_oldest(self.pending_vehicles)
+
+        if match:
+            return match
+
+        self._hold(self.pending_cards, 'id_card', moodle_id, {
+            'timestamp': timestamp,
+            'vehicle': None,
+            'id_card': id_card_data
+        })
+        return None
+
+    def expire(self):
+        """
+        Remove verifications whose window has passed
+
+        Returns:
+            list: Expired entries, oldest first
+        """
+        now = self.clock()
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, kind, key, entry = self._expiry.popleft()
+            pending = self.pending_vehicles if kind == 'vehicle' else self.pending_cards
+            # Skip nodes for entries that were matched or refreshed since
+            if pending.get(key) is entry and entry['expires'] == expires:
+                del pending[key]
+                expired.append(entry)
+        return expired
+
+    def _hold(self, pending, kind, key, entry):
+        """Store (or refresh) the pending entry for an identity"""
+        # Repeated detections of the same plate / card keep one entry whose
+        # window restarts, moved to the back of the arrival order
+        pending.pop(key, None)
+        entry['key'] = key
+        entry['expires'] = self.clock() + self.window
+        pending[key] = entry
+        self._expiry.append((entry['expires'], kind, key, entry))
+
+        # Drop nodes of matched entries so the deque tracks live pendings
+        if len(self._expiry) > 4 * (len(self) + 16):
+            self._compact()
+
+    def _take(self, pending, key):
+        """Pop a live pending entry by key"""
+        entry = pending.get(key)
+        if entry is None or entry['expires'] <= self.clock():
+            return None
+        return pending.pop(key)
+
+    def _take_oldest(self, pending):
+        """Pop the oldest live pending entry"""
+        if not pending:
+            return None
+        return self._take(pending, next(iter(pending)))
+
+    def _compact(self):
+        """Rebuild the expiry queue from live entries"""
+        nodes = [(entry['expires'], kind, key, entry)
+                 for kind, pending in (('vehicle', self.pending_vehicles), ('id_card', self.pending_cards))
+                 for key, entry in pending.items()]
+        nodes.sort(key=lambda node: node[0])
+        self._expiry = collections.deque(nodes)
@@ -25,7 +25,13 @@ sys.path.append(str(Path(__file__).resolve().parent))
 
 from offline_id_card_recognizer import OfflineIDCardRecognizer
 from test_indian_plates import IndianLicensePlateRecognizer
-from database.supabase_manager import SupabaseManager
+from database.storage import create_storage
+from database.local_spool import DEFAULT_SPOOL_PATH as EVENT_SPOOL_PATH
+from model_registry import loaded_models
+
+# Dashboard log lists show clock times only, so they cover the last day
+# (a bounded range also lets Postgres skip older monthly log partitions)
+RECENT_LOGS_WINDOW = timedelta(days=1)
 
 # Page configuration
 st.set_page_config(
@@ -89,6 +95,8 @@ st.markdown("""
 # Initialize session state
 if 'db' not in st.session_state:
     st.session_state.db = None
+if 'event_db' not in st.session_state:
+    st.session_state.event_db = None
 if 'id_recognizer' not in st.session_state:
     st.session_state.id_recognizer = None
 if 'plate_recognizer' not in st.session_state:
@@ -102,10 +110,14 @@ def initialize_system():
     """Initialize all components with proper error handling"""
     try:
         # Database
-        db = SupabaseManager()
+        # Supabase or embedded SQLite, per CAMPUS_DB_BACKEND
+        db = create_storage()
         db_connected = db.connect()
         if db_connected:
             db.create_tables()
+        # Events go to a local spool first, so scans keep being logged
+        # while Supabase is unreachable and sync once it is back
+        db.enable_write_behind(spool_path=EVENT_SPOOL_PATH)
         
         # ID Card Recognizer
         id_recognizer = OfflineIDCardRecognizer()
@@ -116,6 +128,7 @@ def initialize_system():
         
         return {
             'db': db if db_connected else None,
+            'event_db': db,
             'id_recognizer': id_recognizer,
             'plate_recognizer': plate_recognizer,
             'status': 'success'
@@ -123,6 +136,7 @@ def initialize_system():
     except Exception as e:
         return {
             'db': None,
+            'event_db': None,
             'id_recognizer': None,
             'plate_recognizer': None,
             'status': 'error',
@@ -154,12 +168,8 @@ def process_id_card(image, recognizer, db=None):
             # Save to database
             if db and card_data.get('moodle_id'):
                 try:
-                    db.insert_student(
-                        moodle_id=card_data['moodle_id'],
-                        name=card_data.get('name'),
-                        department=card_data.get('department')
-                    )
-                    
+                    db.ensure_student(card_data['moodle_id'], card_data.get('name'))
+
                     db.log_id_card_access(
                         moodle_id=card_data['moodle_id'],
                         name=card_data.get('name'),
@@ -242,7 +252,7 @@ def process_license_plate(image, recognizer, db=None):
                             # Save to database
                             if db:
                                 try:
-                                    db.insert_vehicle(license_plate=plate_text)
+                                    db.ensure_vehicle(plate_text)
                                     db.log_vehicle_access(
                                         license_plate=plate_text,
                                         confidence=conf,
@@ -284,6 +294,7 @@ def main():
             
             if init_result['status'] == 'success':
                 st.session_state.db = init_result['db']
+                st.session_state.event_db = init_result['event_db']
                 st.session_state.id_recognizer = init_result['id_recognizer']
                 st.session_state.plate_recognizer = init_result['plate_recognizer']
                 st.session_state.initialized = True
@@ -303,10 +314,26 @@ def main():
     st.sidebar.markdown("---")
     st.sidebar.subheader("🗄️ Database Status")
     if st.session_state.db:
-        st.sidebar.success("✅ Connected")
+        st.sidebar.success(f"✅ Connected ({st.session_state.db.backend_name})")
+    elif st.session_state.event_db:
+        st.sidebar.warning("📦 Offline - spooling events locally")
     else:
         st.sidebar.error("❌ Disconnected")
     
+    if st.session_state.event_db:
+        sync = st.session_state.event_db.get_sync_metrics()
+        if sync:
+            st.sidebar.caption(f"Unsynced events: {sync['spool_depth']} · "
+                               f"sync lag: {sync['sync_lag_seconds']:.1f}s")
+    
+    # Models shared by the scanners (one EasyOCR reader for both)
+    with st.sidebar.expander("🧠 Loaded Models"):
+        for model in loaded_models():
+            if model['loaded']:
+                st.caption(f"{model['kind']} · {model['key'][-1]} · {model['users']} user(s) · "
+                           f"{model['parameter_mb']} MB weights · RSS +{model['rss_delta_mb']} MB · "
+                           f"{model['load_seconds']}s")
+    
     # Main content
     if page == "🏠 Dashboard":
         show_dashboard()
@@ -365,7 +392,8 @@ def show_dashboard():
         with col1:
             st.subheader("📋 Recent ID Card Logs")
             with st.spinner('Loading...'):
-                id_logs = st.session_state.db.get_recent_id_card_logs(limit=10)
+                id_logs = st.session_state.db.get_recent_id_card_logs(
+                    limit=10, since=datetime.now() - RECENT_LOGS_WINDOW)
                 
                 if id_logs:
                     for log in id_logs:
@@ -375,12 +403,13 @@ def show_dashboard():
                         ---
                         """)
                 else:
-                    st.info("No logs found")
+                    st.info("No logs in the last 24 hours")
         
         with col2:
             st.subheader("🚗 Recent Vehicle Logs")
             with st.spinner('Loading...'):
-                vehicle_logs = st.session_state.db.get_recent_vehicle_logs(limit=10)
+                vehicle_logs = st.session_state.db.get_recent_vehicle_logs(
+                    limit=10, since=datetime.now() - RECENT_LOGS_WINDOW)
                 
                 if vehicle_logs:
                     for log in vehicle_logs:
@@ -390,7 +419,7 @@ def show_dashboard():
                         ---
                         """)
                 else:
-                    st.info("No logs found")
+                    st.info("No logs in the last 24 hours")
                     
     except Exception as e:
         st.error(f"❌ Error loading dashboard: {str(e)}")
@@ -556,7 +585,7 @@ def show_live_camera_id_scanner():
                 result = process_id_card(
                     frame_pil,
                     st.session_state.id_recognizer,
-                    st.session_state.db
+                    st.session_state.event_db
                 )
             
             if result['success']:
@@ -611,7 +640,7 @@ def process_uploaded_id_card(uploaded_file):
                 result = process_id_card(
                     image,
                     st.session_state.id_recognizer,
-                    st.session_state.db
+                    st.session_state.event_db
                 )
             
             if result['success']:
@@ -793,7 +822,7 @@ def show_live_camera_plate_scanner():
                 result = process_license_plate(
                     frame_pil,
                     st.session_state.plate_recognizer,
-                    st.session_state.db
+                    st.session_state.event_db
                 )
             
             if result['success']:
@@ -902,10 +931,10 @@ def process_uploaded_video_plate(uploaded_file):
                                             })
                                             
                                             # Save to database
-                                            if st.session_state.db:
+                                            if st.session_state.event_db:
                                                 try:
-                                                    st.session_state.db.insert_vehicle(license_plate=plate_text)
-                                                    st.session_state.db.log_vehicle_access(
+                                                    st.session_state.event_db.ensure_vehicle(plate_text)
+                                                    st.session_state.event_db.log_vehicle_access(
                                                         license_plate=plate_text,
                                                         confidence=conf,
                                                         camera_id='video_upload',
@@ -973,7 +1002,7 @@ def process_uploaded_plate(uploaded_file):
                 result = process_license_plate(
                     image,
                     st.session_state.plate_recognizer,
-                    st.session_state.db
+                    st.session_state.event_db
                 )
             
             if result['success']:
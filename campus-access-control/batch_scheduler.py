@@ -0,0 +1,255 @@
+"""
+Micro-Batching Scheduler
+Groups inference requests from several cameras into small batches so the
+detector runs one forward pass for many frames. A batch closes after
+max_wait_ms or max_batch_size requests, whichever comes first, or earlier
+when a queued request would otherwise miss its deadline. Cameras are
+served round-robin, so one busy gate cannot starve the others.
+"""
+
+import collections
+import threading
+import time
+
+# A batch that closes for a deadline closes this long before it, so the
+# request is dispatched (not expired) despite thread wake-up latency
+DEFAULT_DISPATCH_MARGIN_MS = 2
+
+
+class DeadlineExceeded(TimeoutError):
+    """A request waited in the queue past its deadline and was not run"""
+
+
+class BatchRequest:
+    """
+    One queued item; wait() returns its own result from the batch
+    """
+
+    def __init__(self, item, source, deadline):
+        self.item = item
+        self.source = source
+        self.submitted = time.monotonic()
+        self.deadline = deadline      # monotonic seconds, or None
+        self.completed = None
+        self.batch_size = 0
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def _finish(self, result=None, error=None):
+        self._result = result
+        self._error = error
+        self.completed = time.monotonic()
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Block until the request's batch has run
+
+        Args:
+            timeout (float): Seconds to wait (None = forever)
+
+        Returns:
+            object: This request's entry of the batch result
+
+        Raises:
+            DeadlineExceeded: The request expired before it was batched
+            TimeoutError: timeout passed first
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("batch result not ready")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    @property
+    def latency_ms(self):
+        """Submit-to-result time (None while pending)"""
+        if self.completed is None:
+            return None
+        return (self.completed - self.submitted) * 1000
+
+
+class MicroBatchScheduler:
+    """
+    Dynamic batching in front of a batch-capable model
+    """
+
+    def __init__(self, process_batch, max_batch_size=4, max_wait_ms=10,
+                 deadline_ms=None, name='batch', dispatch_margin_ms=DEFAULT_DISPATCH_MARGIN_MS):
+        """
+        Initialize and start the batching thread
+
+        Args:
+            process_batch (callable): list of items -> list of results (same order)
+            max_batch_size (int): Largest batch handed to process_batch
+            max_wait_ms (float): Longest time the first request of a batch waits
+                for company
+            deadline_ms (float): Default queueing deadline per request (None = none)
+            name (str): Name used for the thread and in messages
+            dispatch_margin_ms (float): How long before a request's deadline
+                the batch holding it closes
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.deadline = deadline_ms / 1000 if deadline_ms else None
+        self.dispatch_margin = max(0.0, dispatch_margin_ms) / 1000
+        self.name = name
+
+        # source -> deque of requests; least recently served source first
+        self._queues = collections.OrderedDict()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self.stats = {
+            'batches': 0,
+            'items': 0,
+            'deadline_misses': 0,
+            'errors': 0,
+            'largest_batch': 0,
+            'served_by_source': {}
+        }
+
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, item, source='default', deadline_ms=None):
+        """
+        Queue an item
+
+        Args:
+            item: Whatever process_batch expects per entry
+            source (str): Camera / client the item came from (fairness key)
+            deadline_ms (float): Queueing deadline for this item (default: scheduler's)
+
+        Returns:
+            BatchRequest: Handle to wait() on
+        """
+        budget = deadline_ms / 1000 if deadline_ms else self.deadline
+        request = BatchRequest(item, source, None)
+        if budget:
+            request.deadline = request.submitted + budget
+
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError(f"{self.name} scheduler is stopped")
+            if source not in self._queues:
+                self._queues[source] = collections.deque()
+            self._queues[source].append(request)
+            self._pending += 1
+            self._cond.notify()
+        return request
+
+    def run(self, item, source='default', deadline_ms=None, timeout=None):
+        """Submit an item and wait for its result"""
+        return self.submit(item, source, deadline_ms).wait(timeout)
+
+    def _close_time(self):
+        """When the batch being gathered must be dispatched"""
+        requests = [request for queue in self._queues.values() for request in queue]
+        close_at = min(request.submitted for request in requests) + self.max_wait
+        deadlines = [request.deadline for request in requests if request.deadline]
+        if deadlines:
+            # Close early enough that _take_batch still finds it live
+            close_at = min(close_at, min(deadlines) - self.dispatch_margin)
+        return close_at
+
+    def _take_batch(self):
+        """
+        Pop up to max_batch_size live requests, one per source per round
+
+        Returns:
+            tuple: (batch, expired requests)
+        """
+        batch, expired = [], []
+        now = time.monotonic()
+        while len(batch) < self.max_batch_size and self._queues:
+            for source in list(self._queues):
+                if len(batch) >= self.max_batch_size:
+                    break
+                queue = self._queues[source]
+                request = queue.popleft()
+                self._pending -= 1
+                if request.deadline and request.deadline < now:
+                    expired.append(request)
+                else:
+                    batch.append(request)
+                    # Served: this source goes behind the ones still waiting
+                    self._queues.move_to_end(source)
+                if not queue:
+                    del self._queues[source]
+        return batch, expired
+
+    def _run(self):
+        """Batching loop"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped and not self._pending:
+                    break
+
+                # Gather until the batch is full or its first request has waited long enough
+                while not self._stopped and self._pending < self.max_batch_size:
+                    remaining = self._close_time() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch, expired = self._take_batch()
+
+            for request in expired:
+                self.stats['deadline_misses'] += 1
+                waited = (time.monotonic() - request.submitted) * 1000
+                request._finish(error=DeadlineExceeded(
+                    f"{self.name}: request from {request.source} expired after {waited:.0f} ms in queue"))
+
+            if batch:
+                self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        """Run one batch and hand every request its own result"""
+        try:
+            results = self.process_batch([request.item for request in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: batch of {len(batch)} returned {len(results)} results")
+        except Exception as e:
+            self.stats['errors'] += 1
+            for request in batch:
+                request._finish(error=e)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['items'] += len(batch)
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        served = self.stats['served_by_source']
+        for request, result in zip(batch, results):
+            request.batch_size = len(batch)
+            served[request.source] = served.get(request.source, 0) + 1
+            request._finish(result)
+
+    def stop(self, timeout=5):
+        """Run what is queued, then stop the batching thread"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def get_stats(self):
+        """
+        Scheduler statistics
+
+        Returns:
+            dict: batches, items, avg_batch_size, queue_depth, deadline_misses,
+                  errors, largest_batch and per-source counts
+        """
+        stats = dict(self.stats)
+        stats['served_by_source'] = dict(self.stats['served_by_source'])
+        stats['avg_batch_size'] = round(self.stats['items'] / self.stats['batches'], 2) if self.stats['batches'] else 0.0
+        stats['queue_depth'] = self._pending
+        return stats
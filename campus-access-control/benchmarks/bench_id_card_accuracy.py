@@ -0,0 +1,305 @@
+"""
+ID Card Extraction Accuracy
+Runs the three ID card extractors (BatchIDCardProcessor, OfflineIDCardRecognizer
+and IDCardVerifier) over data/training_data and scores moodle_id, name and
+department against data/training_data/ground_truth.json, next to images/sec
+and per-image latency. A speed change that costs accuracy shows up here.
+
+Each image is scored against the card its best reading agrees with most, so
+group photos count once per field; card_recall is the share of all labelled
+IDs found by any reading. Latency includes reading the image file; one
+unscored pass over the first image warms the models up first.
+
+Usage:
+    python benchmarks/bench_id_card_accuracy.py
+    python benchmarks/bench_id_card_accuracy.py --extractors batch offline --quick
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config.config import OUTPUT_DIR, USE_GPU, get_output_filename
+from benchmarks.run_benchmarks import (ID_CARD_IMAGES_DIR, SEED, char_accuracy, image_files,
+                                       latency_metrics, set_seeds, stage_metrics)
+
+GROUND_TRUTH_PATH = ID_CARD_IMAGES_DIR / "ground_truth.json"
+FIELDS = ('moodle_id', 'name', 'department')
+
+# Abbreviations printed on older cards -> names the extractors report
+DEPARTMENT_ALIASES = {
+    'COMP': 'COMPUTER ENGINEERING',
+    'IT': 'INFORMATION TECHNOLOGY',
+    'CIVIL': 'CIVIL ENGINEERING',
+    'MECH': 'MECHANICAL ENGINEERING'
+}
+
+
+# ========================
+# SCORING
+# ========================
+
+def load_ground_truth(path=GROUND_TRUTH_PATH):
+    """Image name -> entry ({'cards': [...]} or {'scored': false})"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['images']
+
+
+def normalize_field(field, value):
+    """
+    Field value in comparable form: digits only for IDs, upper-case words
+    without punctuation for names and departments
+
+    Returns:
+        str: Normalized value (None if empty)
+    """
+    if not value:
+        return None
+    text = str(value).upper()
+    if field == 'moodle_id':
+        return re.sub(r'\D', '', text) or None
+    text = ' '.join(re.sub(r'[^A-Z0-9]+', ' ', text).split())
+    if field == 'department':
+        text = DEPARTMENT_ALIASES.get(text, text)
+    return text or None
+
+
+def _normalize(card):
+    return {field: normalize_field(field, card.get(field)) for field in FIELDS}
+
+
+def score_image(cards, readings):
+    """
+    Score one image's readings
+
+    Args:
+        cards (list): Ground-truth cards of the image
+        readings (list): Dicts with moodle_id / name / department from an extractor
+
+    Returns:
+        dict: field -> True / False (fields not labelled on the matched card
+              are left out), name_char (0-1 or None) and found_ids (labelled
+              IDs that some reading has)
+    """
+    cards = [_normalize(card) for card in cards]
+    readings = [_normalize(reading) for reading in readings] or [{}]
+
+    def agreement(pair):
+        card, reading = pair
+        return sum(1 for field in FIELDS if card[field] and card[field] == reading.get(field))
+
+    card, reading = max(((c, r) for c in cards for r in readings), key=agreement)
+    score = {field: card[field] == reading.get(field) for field in FIELDS if card[field]}
+    score['name_char'] = char_accuracy(card['name'], reading.get('name') or '') if card['name'] else None
+
+    read_ids = {r.get('moodle_id') for r in readings}
+    labelled_ids = [c['moodle_id'] for c in cards if c['moodle_id']]
+    score['labelled_ids'] = len(labelled_ids)
+    score['found_ids'] = sum(1 for moodle_id in labelled_ids if moodle_id in read_ids)
+    return score
+
+
+def accuracy_metrics(scores):
+    """
+    Per-field accuracy over scored images
+
+    Args:
+        scores (list): score_image() results
+
+    Returns:
+        dict: <field>_accuracy, name_char_accuracy and card_recall
+    """
+    metrics = {}
+    for field in FIELDS:
+        marks = [score[field] for score in scores if field in score]
+        metrics[f"{field}_accuracy"] = round(sum(marks) / len(marks), 4) if marks else None
+    chars = [score['name_char'] for score in scores if score['name_char'] is not None]
+    metrics['name_char_accuracy'] = round(sum(chars) / len(chars), 4) if chars else None
+    labelled = sum(score['labelled_ids'] for score in scores)
+    metrics['card_recall'] = round(sum(score['found_ids'] for score in scores) / labelled, 4) if labelled else None
+    return metrics
+
+
+# ========================
+# EXTRACTORS
+# ========================
+
+def batch_extractor(use_gpu):
+    """BatchIDCardProcessor: whole-image OCR, one reading per image"""
+    from batch_process_id_cards import BatchIDCardProcessor
+
+    processor = BatchIDCardProcessor()
+
+    def read(path):
+        result = processor.process_single_image(path)
+        return [result] if result else []
+    return read, None
+
+
+def offline_extractor(use_gpu):
+    """OfflineIDCardRecognizer: card detection, then OCR per card"""
+    from offline_id_card_recognizer import OfflineIDCardRecognizer
+
+    recognizer = OfflineIDCardRecognizer(use_gpu=use_gpu)
+
+    def read(path):
+        frame = cv2.imread(str(path))
+        if frame is None:
+            return []
+        cards, _ = recognizer.recognize_id_card(frame)
+        return [card['data'] for card in cards]
+    return read, recognizer.timing
+
+
+def verifier_extractor(use_gpu):
+    """IDCardVerifier: YOLO detection, then OCR of fixed card regions"""
+    from id_card_verifier import IDCardVerifier
+
+    verifier = IDCardVerifier(use_gpu=use_gpu)
+
+    def read(path):
+        frame = cv2.imread(str(path))
+        if frame is None:
+            return []
+        results, _ = verifier.detect_and_extract_id_card(frame, 0, None)
+        return results['id_cards']
+    return read, None
+
+
+EXTRACTORS = {
+    'batch': batch_extractor,
+    'offline': offline_extractor,
+    'verifier': verifier_extractor
+}
+
+
+def evaluate(extractor, use_gpu=True, quick=False, seed=SEED, images_dir=ID_CARD_IMAGES_DIR,
+             ground_truth_path=GROUND_TRUTH_PATH):
+    """
+    Run one extractor over the labelled images
+
+    Args:
+        extractor (str): Key of EXTRACTORS
+        use_gpu (bool): Use GPU where the extractor supports it
+        quick (bool): First 10 images only
+        seed (int): RNG seed
+        images_dir (Path): Card images
+        ground_truth_path (Path): Ground-truth JSON
+
+    Returns:
+        tuple: (metrics, stage latency report, details)
+    """
+    ground_truth = load_ground_truth(ground_truth_path)
+    read, timing = EXTRACTORS[extractor](use_gpu)
+    set_seeds(seed)
+
+    paths = [p for p in image_files(images_dir) if ground_truth.get(p.name, {}).get('scored', True)]
+    if quick:
+        paths = paths[:10]
+    unlabelled = [p.name for p in paths if p.name not in ground_truth]
+    paths = [p for p in paths if p.name in ground_truth]
+    if not paths:
+        raise RuntimeError(f"no labelled images in {images_dir}")
+
+    read(paths[0])  # Warm-up, not scored
+    if timing:
+        timing.reset()
+
+    latencies, scores, misses = [], [], {}
+    for path in paths:
+        start = time.perf_counter()
+        readings = read(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        score = score_image(ground_truth[path.name]['cards'], readings)
+        scores.append(score)
+        if not all(score[field] for field in FIELDS if field in score):
+            misses[path.name] = [{field: reading.get(field) for field in FIELDS} for reading in readings]
+
+    metrics = {
+        'throughput_per_s': round(len(latencies) / (sum(latencies) / 1000), 2),
+        **latency_metrics(latencies),
+        **accuracy_metrics(scores)
+    }
+    report = timing.report() if timing else {}
+    metrics.update(stage_metrics(report))
+    return metrics, report, {'images': len(paths), 'unlabelled': unlabelled, 'misses': misses}
+
+
+# ========================
+# MAIN
+# ========================
+
+def print_table(results):
+    """Side-by-side accuracy and speed per extractor"""
+    print(f"\n   {'extractor':<10} {'id':>7} {'name':>7} {'dept':>7} {'cards':>7} {'img/s':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"   {name:<10} ❌ {result['error']}")
+            continue
+        m = result['metrics']
+
+        def pct(key):
+            return f"{m[key] * 100:.1f}%" if m.get(key) is not None else '-'
+        print(f"   {name:<10} {pct('moodle_id_accuracy'):>7} {pct('name_accuracy'):>7} "
+              f"{pct('department_accuracy'):>7} {pct('card_recall'):>7} {m['throughput_per_s']:>7} "
+              f"{m.get('p50_ms', '-'):>8} {m.get('p95_ms', '-'):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score the ID card extractors against the ground truth')
+    parser.add_argument('--extractors', nargs='+', choices=list(EXTRACTORS), default=list(EXTRACTORS),
+                        help='Extractors to run (default: all)')
+    parser.add_argument('--images', type=str, default=str(ID_CARD_IMAGES_DIR), help='Card images directory')
+    parser.add_argument('--ground-truth', type=str, default=str(GROUND_TRUTH_PATH), help='Ground-truth JSON')
+    parser.add_argument('--quick', action='store_true', help='First 10 images only')
+    parser.add_argument('--seed', type=int, default=SEED, help=f'RNG seed (default: {SEED})')
+    parser.add_argument('--cpu', action='store_true', help='Force CPU')
+    parser.add_argument('--output', type=str, help='Results JSON (default: outputs/id_card_accuracy_<time>.json)')
+    parser.add_argument('--verbose', action='store_true', help='Show the extractors\' own output')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🎴 ID CARD EXTRACTION ACCURACY")
+    print("=" * 70)
+
+    results = {}
+    for name in args.extractors:
+        print(f"\n▶️  {name}")
+        try:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+                metrics, stages, details = evaluate(name, use_gpu=USE_GPU and not args.cpu, quick=args.quick,
+                                                    seed=args.seed, images_dir=Path(args.images),
+                                                    ground_truth_path=Path(args.ground_truth))
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+            print(f"   ❌ {results[name]['error']}")
+            continue
+        results[name] = {'metrics': metrics, 'stage_latency': stages, 'details': details}
+        print(f"   {details['images']} images, {len(details['misses'])} with a wrong or missing field")
+        if details['unlabelled']:
+            print(f"   ⚠️  Not in the ground truth (skipped): {', '.join(details['unlabelled'])}")
+
+    print_table(results)
+
+    output_path = Path(args.output) if args.output else OUTPUT_DIR / get_output_filename('id_card_accuracy')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'quick': args.quick, 'results': results},
+                  f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Results saved to: {output_path}")
+    return 1 if any('error' in result for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Micro-Batching Load Test
+Drives the MicroBatchScheduler with several cameras submitting frames at a
+fixed rate and reports throughput against p99 latency for each batch window
+and batch size. By default the model is simulated (fixed + per-item cost,
+like a GPU forward pass); --real runs the YOLO plate detector instead.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from batch_scheduler import MicroBatchScheduler, DeadlineExceeded
+from benchmarks.bench_storage_backends import percentile
+
+
+def simulated_model(fixed_ms, per_item_ms):
+    """Batch function whose cost is fixed_ms + per_item_ms * batch size"""
+    def process_batch(items):
+        time.sleep((fixed_ms + per_item_ms * len(items)) / 1000)
+        return [None] * len(items)
+    return process_batch
+
+
+def real_model(image_path=None):
+    """Batch function backed by VehiclePlateRecognizer.detect_and_extract_batch"""
+    import cv2
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+
+    recognizer = VehiclePlateRecognizer()
+    frame = cv2.imread(str(image_path)) if image_path else None
+    if frame is None:
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    def process_batch(items):
+        frames = [frame.copy() for _ in items]
+        return recognizer.detect_and_extract_batch(frames, [0] * len(items), [None] * len(items))
+    return process_batch
+
+
+def run_load(process_batch, cameras, fps, seconds, batch_size, wait_ms, deadline_ms):
+    """
+    Open-loop load: every camera submits a frame every 1/fps seconds
+
+    Returns:
+        dict: Throughput, latency percentiles, misses and per-camera fairness
+    """
+    scheduler = MicroBatchScheduler(process_batch, max_batch_size=batch_size,
+                                    max_wait_ms=wait_ms, deadline_ms=deadline_ms, name='bench')
+    requests = {f"camera_{i}": [] for i in range(cameras)}
+    stop_at = time.monotonic() + seconds
+
+    def camera(name, offset):
+        next_frame = time.monotonic() + offset
+        while next_frame < stop_at:
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+            requests[name].append(scheduler.submit(name, source=name))
+            next_frame += 1 / fps
+
+    # Stagger cameras across one frame interval, like unsynchronised gates
+    threads = [threading.Thread(target=camera, args=(name, i / (fps * cameras)))
+               for i, name in enumerate(requests)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    completed, missed = [], 0
+    served = {}
+    for name, camera_requests in requests.items():
+        served[name] = 0
+        for request in camera_requests:
+            try:
+                request.wait(timeout=30)
+            except DeadlineExceeded:
+                missed += 1
+                continue
+            completed.append(request.latency_ms)
+            served[name] += 1
+    elapsed = time.monotonic() - start
+    stats = scheduler.get_stats()
+    scheduler.stop()
+
+    completed.sort()
+    return {
+        'batch_size': batch_size,
+        'wait_ms': wait_ms,
+        'submitted': sum(len(r) for r in requests.values()),
+        'completed': len(completed),
+        'throughput_fps': round(len(completed) / elapsed, 1),
+        'latency_ms_p50': round(percentile(completed, 50), 2) if completed else None,
+        'latency_ms_p99': round(percentile(completed, 99), 2) if completed else None,
+        'deadline_misses': missed,
+        'avg_batch_size': stats['avg_batch_size'],
+        'fairness': round(min(served.values()) / max(max(served.values()), 1), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the cross-camera micro-batching scheduler')
+    parser.add_argument('--cameras', type=int, default=8, help='Simulated cameras (default: 8)')
+    parser.add_argument('--fps', type=float, default=10, help='Frames per second per camera (default: 10)')
+    parser.add_argument('--seconds', type=float, default=5, help='Duration of each run (default: 5)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Max batch sizes to try')
+    parser.add_argument('--waits', type=float, nargs='+', default=[0, 5, 10, 20],
+                        help='Batch windows (ms) to try')
+    parser.add_argument('--deadline-ms', type=float, default=1000,
+                        help='Queueing deadline per frame (default: 1000)')
+    parser.add_argument('--fixed-ms', type=float, default=20,
+                        help='Simulated per-batch cost (default: 20)')
+    parser.add_argument('--per-item-ms', type=float, default=4,
+                        help='Simulated per-frame cost (default: 4)')
+    parser.add_argument('--real', action='store_true', help='Use the YOLO plate detector')
+    parser.add_argument('--image', type=str, help='Frame to feed the real model')
+    parser.add_argument('--output', type=str, help='Write results JSON here')
+    args = parser.parse_args()
+
+    if args.real:
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_batch = real_model(args.image)
+        model = 'YOLO plate detector'
+    else:
+        process_batch = simulated_model(args.fixed_ms, args.per_item_ms)
+        model = f"simulated ({args.fixed_ms} ms + {args.per_item_ms} ms/frame)"
+
+    print("=" * 70)
+    print("📊 MICRO-BATCHING LOAD TEST")
+    print("=" * 70)
+    print(f"Model:   {model}")
+    print(f"Load:    {args.cameras} cameras x {args.fps} FPS = {args.cameras * args.fps:.0f} frames/s offered")
+    print(f"\n{'size':>5} {'wait ms':>8} {'fps':>8} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'misses':>7} {'avg batch':>10} {'fairness':>9}")
+
+    results = []
+    for batch_size in args.sizes:
+        for wait_ms in args.waits:
+            if batch_size == 1 and wait_ms:
+                continue  # The window is irrelevant without batching
+            entry = run_load(process_batch, args.cameras, args.fps, args.seconds,
+                             batch_size, wait_ms, args.deadline_ms)
+            results.append(entry)
+            print(f"{batch_size:>5} {wait_ms:>8g} {entry['throughput_fps']:>8} "
+                  f"{entry['latency_ms_p50']!s:>9} {entry['latency_ms_p99']!s:>9} "
+                  f"{entry['deadline_misses']:>7} {entry['avg_batch_size']:>10} {entry['fairness']:>9}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'model': model, 'cameras': args.cameras, 'fps': args.fps,
+                       'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
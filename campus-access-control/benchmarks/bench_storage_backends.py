@@ -0,0 +1,151 @@
+"""
+Storage Backend Benchmark
+Drives the same gate workload (registrations + paired ID card / vehicle logs)
+through each storage backend and reports throughput and per-event latency
+Postgres runs in a scratch schema; SQLite runs in a temporary file
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from database.storage import create_storage
+from benchmarks.bench_student_import import generate_records, open_scratch_db
+
+CAMERAS = ['gate_1', 'gate_2', 'gate_3', 'gate_4']
+
+
+def open_backend(backend, workdir, schema):
+    """Open an empty database for a backend"""
+    if backend == 'postgres':
+        # The write-behind writer opens its own connections; keep them in the scratch schema too
+        os.environ['PGOPTIONS'] = f"-c search_path={schema}"
+        return open_scratch_db(schema)
+
+    db = create_storage('sqlite', Path(workdir) / 'bench_storage.db')
+    if not db.connect():
+        return None
+    db.create_tables()
+    return db
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def run_workload(db, students, accesses, write_behind=False, seed=42):
+    """
+    Register students and vehicles, then log paired gate accesses
+
+    Returns:
+        dict: Timings and the statistics the backend reports afterwards
+    """
+    rng = random.Random(seed)
+    records = generate_records(students, seed=seed)
+    plates = [f"MH{i % 50:02d}AB{i:04d}" for i in range(students)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.bulk_import_students(records)
+        for record, plate in zip(records, plates):
+            db.insert_vehicle(license_plate=plate, owner_moodle_id=record['moodle_id'])
+        if write_behind:
+            db.enable_write_behind()
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(accesses):
+            i = rng.randrange(students)
+            camera = rng.choice(CAMERAS)
+            t0 = time.perf_counter()
+            db.log_id_card_access(
+                moodle_id=records[i]['moodle_id'],
+                name=records[i]['name'],
+                department=records[i]['department'],
+                confidence=0.9,
+                camera_id=camera
+            )
+            db.log_vehicle_access(license_plate=plates[i], confidence=0.9, camera_id=camera)
+            latencies.append(time.perf_counter() - t0)
+        db.flush(timeout=60)
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    stats = db.get_today_statistics() or {}
+    return {
+        'events': accesses * 2,
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(accesses * 2 / elapsed, 1),
+        'pair_latency_ms_p50': round(percentile(latencies, 50) * 1000, 3),
+        'pair_latency_ms_p99': round(percentile(latencies, 99) * 1000, 3),
+        'id_card_entries': stats.get('id_card_entries'),
+        'vehicle_entries': stats.get('vehicle_entries')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark storage backends end to end')
+    parser.add_argument('--backends', nargs='+', choices=['sqlite', 'postgres'],
+                        default=['sqlite'], help='Backends to run (default: sqlite)')
+    parser.add_argument('--students', type=int, default=1000,
+                        help='Registered students / vehicles (default: 1000)')
+    parser.add_argument('--accesses', type=int, default=5000,
+                        help='Gate accesses, each logging two events (default: 5000)')
+    parser.add_argument('--write-behind', action='store_true',
+                        help='Also run Postgres with the batched write-behind writer')
+    parser.add_argument('--schema', default='bench_storage_backends',
+                        help='Scratch Postgres schema (dropped afterwards)')
+    parser.add_argument('--output', type=str, help='Write results JSON here')
+    args = parser.parse_args()
+
+    runs = [(backend, False) for backend in args.backends]
+    if args.write_behind and 'postgres' in args.backends:
+        runs.append(('postgres', True))
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend, write_behind in runs:
+            db = open_backend(backend, workdir, args.schema)
+            if db is None:
+                return 1
+
+            entry = {'backend': backend + (' (write-behind)' if write_behind else '')}
+            entry.update(run_workload(db, args.students, args.accesses, write_behind))
+
+            if backend == 'postgres':
+                db.cursor.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE;")
+                db.connection.commit()
+            db.disconnect()
+            results.append(entry)
+
+    print("\n" + "=" * 70)
+    print("📊 STORAGE BACKEND BENCHMARK")
+    print("=" * 70)
+    for entry in results:
+        print(f"\n🗄️  {entry['backend']}")
+        print(f"   Events:     {entry['events']} in {entry['seconds']}s "
+              f"({entry['events_per_second']} events/s)")
+        print(f"   Pair p50:   {entry['pair_latency_ms_p50']} ms")
+        print(f"   Pair p99:   {entry['pair_latency_ms_p99']} ms")
+        print(f"   Statistics: {entry['id_card_entries']} ID card / "
+              f"{entry['vehicle_entries']} vehicle entries")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Student Import Benchmark
+Compares row-by-row insert_student upserts against the COPY-based bulk import
+Runs in a scratch schema so the real students table is never touched
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+DEPARTMENTS = [
+    'COMPUTER ENGINEERING', 'INFORMATION TECHNOLOGY', 'MECHANICAL ENGINEERING',
+    'CIVIL ENGINEERING', 'ELECTRICAL ENGINEERING', 'ELECTRONICS ENGINEERING'
+]
+FIRST_NAMES = ['AVANISH', 'ANISH', 'ASHMIT', 'HARSH', 'ISHAN', 'ABHISHEK', 'PRIYA', 'SNEHA']
+LAST_NAMES = ['VADKE', 'NARVANKAR', 'PATIL', 'SHARMA', 'DESAI', 'JOSHI', 'KULKARNI']
+
+
+def generate_records(count, seed=42):
+    """Generate batch-processing style student records"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        moodle_id = f"2{i:07d}"
+        records.append({
+            'image_path': f"data/training_data/synthetic_{i:06d}.jpg",
+            'moodle_id': moodle_id,
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'department': rng.choice(DEPARTMENTS),
+            'success': True
+        })
+    return records
+
+
+def open_scratch_db(schema):
+    """Connect and point the session at an empty scratch schema"""
+    from database.supabase_manager import SupabaseManager
+
+    db = SupabaseManager()
+    if not db.connect():
+        return None
+    db.cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+    db.cursor.execute(f"CREATE SCHEMA {schema};")
+    db.cursor.execute(f"SET search_path TO {schema};")
+    db.connection.commit()
+    db.create_tables()
+    return db
+
+
+def run_row_by_row(db, records):
+    """Current import path: one upsert + commit per record"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for record in records:
+            db.insert_student(
+                moodle_id=record['moodle_id'],
+                name=record.get('name'),
+                department=record.get('department'),
+                card_image_path=record.get('image_path')
+            )
+    return time.perf_counter() - start
+
+
+def run_bulk(db, records):
+    """COPY into a temp table, then one INSERT ... ON CONFLICT merge"""
+    start = time.perf_counter()
+    report = db.bulk_import_students(records)
+    return time.perf_counter() - start, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark student bulk import')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 50000],
+                        help='Number of students per run (default: 5000 50000)')
+    parser.add_argument('--schema', default='bench_student_import',
+                        help='Scratch schema to run in (dropped afterwards)')
+    parser.add_argument('--skip-row-by-row', action='store_true',
+                        help='Only time the bulk path')
+    parser.add_argument('--output', type=str, help='Write results JSON here')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        records = generate_records(size)
+        entry = {'students': size}
+
+        if not args.skip_row_by_row:
+            db = open_scratch_db(args.schema)
+            if db is None:
+                return 1
+            entry['row_by_row_seconds'] = round(run_row_by_row(db, records), 3)
+            db.disconnect()
+
+        db = open_scratch_db(args.schema)
+        if db is None:
+            return 1
+        seconds, report = run_bulk(db, records)
+        entry['bulk_insert_seconds'] = round(seconds, 3)
+        entry['bulk_insert_report'] = report
+
+        # Same batch again: every row is now an update
+        seconds, report = run_bulk(db, records)
+        entry['bulk_update_seconds'] = round(seconds, 3)
+        entry['bulk_update_report'] = report
+
+        db.cursor.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE;")
+        db.connection.commit()
+        db.disconnect()
+
+        if 'row_by_row_seconds' in entry and entry['bulk_insert_seconds'] > 0:
+            entry['speedup'] = round(entry['row_by_row_seconds'] / entry['bulk_insert_seconds'], 1)
+        results.append(entry)
+
+    print("\n" + "=" * 70)
+    print("📊 STUDENT IMPORT BENCHMARK")
+    print("=" * 70)
+    for entry in results:
+        print(f"\n👥 {entry['students']} students")
+        if 'row_by_row_seconds' in entry:
+            print(f"   Row-by-row:   {entry['row_by_row_seconds']:.3f}s")
+        print(f"   Bulk insert:  {entry['bulk_insert_seconds']:.3f}s "
+              f"({entry['bulk_insert_report']['inserted']} new)")
+        print(f"   Bulk update:  {entry['bulk_update_seconds']:.3f}s "
+              f"({entry['bulk_update_report']['updated']} updated)")
+        if 'speedup' in entry:
+            print(f"   Speedup:      {entry['speedup']}x")
+    print("=" * 70)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Virtual Gate Load Test
+Runs the access control pipeline (camera workers, recognizers and the
+decision thread of AccessControlSystem) on 1-16 virtual gates at once, each
+fed by a ReplayCapture of the sample videos instead of a webcam, and reports
+processed FPS, frame drops and frame-to-result / frame-to-decision latency
+per gate count. Jitter and frame loss can be injected to see how the loop
+copes with a flaky camera. Needs no camera and no display.
+
+Usage:
+    python benchmarks/bench_virtual_gates.py --gates 1 4 8 16 --seconds 20
+    python benchmarks/bench_virtual_gates.py --gates 4 --id-cards --jitter-ms 40 --drop-rate 0.05
+    python benchmarks/bench_virtual_gates.py --gates 16 --fast --model-server
+    python benchmarks/bench_virtual_gates.py --gates 8 16 --synthetic 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config.config import OUTPUT_DIR, MODEL_SERVER_ADDRESS, get_output_filename
+from benchmarks.run_benchmarks import ID_CARD_IMAGES_DIR, PLATE_VIDEOS, SAMPLE_MEDIA_DIR
+from camera_replay import ReplayCapture
+from pipeline_timing import LatencyHistogram
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _timed(recognize, cap, histogram):
+    """Wrap a recognize function to record frame-to-result latency"""
+    def call(frame, frame_count, timestamp):
+        result = recognize(frame, frame_count, timestamp)
+        histogram.record(time.time() - cap.last_info['captured_at'])
+        return result
+    return call
+
+
+def _drain(events):
+    while True:
+        try:
+            events.get_nowait()
+        except queue.Empty:
+            return
+
+
+def run_gates(system, gates, seconds, vehicle_sources, id_card_source, replay_options):
+    """
+    Run `gates` virtual gates for `seconds`
+
+    Args:
+        system (AccessControlSystem): Initialized system (reused across runs)
+        gates (int): Number of gates
+        seconds (float): Run length
+        vehicle_sources (list): Videos, assigned to gates round-robin
+        id_card_source (Path): Image directory for each gate's ID card camera (None = vehicles only)
+        replay_options (dict): ReplayCapture options (realtime, jitter_ms, drop_rate, fps)
+
+    Returns:
+        dict: Throughput, drops and latency percentiles for this gate count
+    """
+    system.timing.reset()
+    system.pipeline_stats.clear()
+    _drain(system.vehicle_queue)
+    _drain(system.id_card_queue)
+    attempts_before = system.stats['total_attempts']
+
+    result_latency = LatencyHistogram()
+    stop_event = threading.Event()
+    captures, workers = [], []
+    for gate in range(gates):
+        cameras = [('vehicle', vehicle_sources[gate % len(vehicle_sources)],
+                    system._recognize_vehicles, system.vehicle_queue)]
+        if id_card_source:
+            cameras.append(('id_card', id_card_source, system._recognize_id_cards, system.id_card_queue))
+        for kind, source, recognize, events in cameras:
+            name = f"gate{gate}_{kind}"
+            cap = ReplayCapture(source, name=name, timer=system.timing, loop=True, seed=gate,
+                                **replay_options)
+            captures.append(cap)
+            workers.append(threading.Thread(
+                target=system._camera_worker, name=name, daemon=True,
+                args=(name, cap, _timed(recognize, cap, result_latency), events, stop_event)
+            ))
+    workers.append(threading.Thread(target=system._decision_worker, name='access-decisions',
+                                    daemon=True, args=(stop_event,)))
+
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    stop_event.wait(seconds)
+    stop_event.set()
+    for worker in workers:
+        worker.join(timeout=10)
+    elapsed = time.monotonic() - start
+    for cap in captures:
+        cap.release()
+
+    capture_stats = [cap.get_stats() for cap in captures]
+    captured = sum(s['frames_captured'] for s in capture_stats)
+    dropped = sum(s['frames_dropped'] for s in capture_stats)
+    processed = sum(p['frames'] for p in system.pipeline_stats.values())
+    per_camera_fps = [p['frames'] / elapsed for p in system.pipeline_stats.values()]
+    decision = system.timing.histograms.get('end_to_end')
+    decode = system.timing.histograms.get('decode')
+
+    return {
+        'gates': gates,
+        'cameras': len(captures),
+        'seconds': round(elapsed, 1),
+        'frames_captured': captured,
+        'frames_processed': processed,
+        'frames_dropped': dropped,
+        'frames_lost': sum(s['frames_lost'] for s in capture_stats),
+        'drop_ratio': round(dropped / captured, 4) if captured else 0.0,
+        'throughput_fps': round(processed / elapsed, 2),
+        'min_camera_fps': round(min(per_camera_fps), 2) if per_camera_fps else 0.0,
+        'events': sum(p['events'] for p in system.pipeline_stats.values()),
+        'decisions': system.stats['total_attempts'] - attempts_before,
+        'result_latency_ms': {f"p{pct}": _ms(result_latency.percentile(pct)) for pct in (50, 95, 99)},
+        'decision_latency_ms': {f"p{pct}": _ms(decision.percentile(pct) if decision else None)
+                                for pct in (50, 95, 99)},
+        'decode_p95_ms': _ms(decode.percentile(95) if decode else None),
+        'quality_level': system.degradation.get_stats()['level'] if system.degradation else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the access control loop on replayed virtual gates')
+    parser.add_argument('--gates', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Gate counts to run (default: 1 2 4 8 16)')
+    parser.add_argument('--seconds', type=float, default=15, help='Length of each run (default: 15)')
+    parser.add_argument('--videos', nargs='+', help='Vehicle camera recordings (default: the sample videos)')
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='Replay N generated gate videos (synthetic_data.py) instead of the samples')
+    parser.add_argument('--id-cards', action='store_true',
+                        help='Give every gate an ID card camera replaying data/training_data')
+    parser.add_argument('--id-card-source', type=str, default=str(ID_CARD_IMAGES_DIR),
+                        help='Image directory or video for the ID card cameras')
+    parser.add_argument('--id-card-fps', type=float, default=5, help='Pace of the ID card images (default: 5)')
+    parser.add_argument('--fast', action='store_true',
+                        help='Deliver frames as fast as they are read instead of in real time')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Frames arrive up to this much late')
+    parser.add_argument('--drop-rate', type=float, default=0, help='Share of frames the cameras lose')
+    parser.add_argument('--model-server', nargs='?', const=MODEL_SERVER_ADDRESS,
+                        help='Recognize on a running model_server.py instead of in this process')
+    parser.add_argument('--output', type=str, help='Results JSON (default: outputs/virtual_gates_<time>.json)')
+    parser.add_argument('--verbose', action='store_true', help='Show the decisions and the system\'s own output')
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    if args.synthetic:
+        from synthetic_data import write_plate_video
+
+        print(f"🧪 Generating {args.synthetic} synthetic gate videos...")
+        rng = random.Random(42)
+        videos = [Path(workdir.name) / f"gate_{i:03d}.mp4" for i in range(args.synthetic)]
+        for video in videos:
+            write_plate_video(video, rng, min(args.seconds, 30))
+    else:
+        videos = [Path(v) for v in args.videos] if args.videos else [SAMPLE_MEDIA_DIR / v for v in PLATE_VIDEOS]
+    id_card_source = args.id_card_source if args.id_cards else None
+    # fps paces image sequences only; videos keep their own
+    replay_options = {'realtime': not args.fast, 'jitter_ms': args.jitter_ms, 'drop_rate': args.drop_rate,
+                      'fps': args.id_card_fps}
+
+    print("=" * 70)
+    print("🚧 VIRTUAL GATE LOAD TEST")
+    print("=" * 70)
+    print(f"Sources: {', '.join(v.name for v in videos)}"
+          + (f" + ID cards from {id_card_source}" if id_card_source else ""))
+    print(f"Pace:    {'as fast as possible' if args.fast else 'real time'}, jitter {args.jitter_ms} ms, "
+          f"drop rate {args.drop_rate}")
+
+    from access_control_system import AccessControlSystem
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        system = AccessControlSystem(model_server=args.model_server)
+        system.ensure_ready()
+
+    results = []
+    print(f"\n   {'gates':>5} {'fps':>8} {'min fps':>8} {'drops':>7} {'lost':>6} "
+          f"{'result p50':>11} {'p95':>8} {'decision p95':>13}")
+    for gates in args.gates:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            result = run_gates(system, gates, args.seconds, videos, id_card_source, replay_options)
+        results.append(result)
+        print(f"   {gates:>5} {result['throughput_fps']:>8} {result['min_camera_fps']:>8} "
+              f"{result['drop_ratio'] * 100:>6.1f}% {result['frames_lost']:>6} "
+              f"{result['result_latency_ms']['p50']!s:>11} {result['result_latency_ms']['p95']!s:>8} "
+              f"{result['decision_latency_ms']['p95']!s:>13}")
+
+    for client in system.model_clients.values():
+        client.close()
+    workdir.cleanup()
+
+    report = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'options': {'seconds': args.seconds, 'videos': [str(v) for v in videos], 'synthetic': args.synthetic,
+                    'id_cards': args.id_cards,
+                    **replay_options},
+        'results': results
+    }
+    output_path = Path(args.output) if args.output else OUTPUT_DIR / get_output_filename('virtual_gates')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
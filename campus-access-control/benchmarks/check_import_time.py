@@ -0,0 +1,146 @@
+"""
+Import-Time Budget Check
+Runs the fast-start commands of campus.py under `python -X importtime` and
+fails if one of them imports for longer than its budget or pulls in a heavy
+dependency (torch, ultralytics, easyocr, streamlit) before a model is
+actually needed. Run it after touching module-level imports.
+
+Usage:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-ms 300 --show 10
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+CAMPUS = PROJECT_DIR / "campus.py"
+
+# Must not be imported until a model is built
+HEAVY_MODULES = ('torch', 'ultralytics', 'easyocr', 'streamlit')
+
+# Commands that should start fast: help, configuration, database and
+# report tools, and every model command's --help
+FAST_COMMANDS = [
+    ['--help'],
+    ['config'],
+    ['results', '--help'],
+    ['db-maintenance', '--help'],
+    ['access', '--help'],
+    ['plates', '--help'],
+    ['id-cards', '--help'],
+    ['batch-id-cards', '--help'],
+    ['model-server', '--help'],
+    ['prefork', '--help'],
+]
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr (str): Captured stderr of the command
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) per imported module
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            parts = line[len('import time:'):].split('|')
+            self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            continue
+        # Module names are indented two spaces per nesting level
+        stripped = name.lstrip(' ')
+        depth = (len(name) - len(stripped) - 1) // 2
+        modules.append((stripped, self_us, cumulative_us, depth))
+    return modules
+
+
+def profile_command(args):
+    """
+    Run one campus.py command under -X importtime
+
+    Args:
+        args (list): Arguments after campus.py
+
+    Returns:
+        dict: Wall time, total import time, heavy modules and slowest imports
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', str(CAMPUS)] + args,
+                               cwd=PROJECT_DIR, capture_output=True, text=True, timeout=120)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules = parse_importtime(completed.stderr)
+    top_level = [m for m in modules if m[3] == 0]
+    heavy = sorted({name.split('.')[0] for name, _, _, _ in modules
+                    if name.split('.')[0] in HEAVY_MODULES})
+    return {
+        'command': ' '.join(args),
+        'returncode': completed.returncode,
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(sum(m[2] for m in top_level) / 1000, 1),
+        'heavy_modules': heavy,
+        'slowest': [(name, round(cumulative / 1000, 1))
+                    for name, _, cumulative, _ in sorted(top_level, key=lambda m: -m[2])]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the start-up import time of campus.py commands')
+    parser.add_argument('--budget-ms', type=float, default=500,
+                        help='Import-time budget per command (default: 500)')
+    parser.add_argument('--show', type=int, default=5,
+                        help='Slowest top-level imports to list per command (default: 5)')
+    parser.add_argument('--output', type=str, help='Write results JSON here')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  IMPORT-TIME BUDGET CHECK")
+    print("=" * 70)
+    print(f"Budget: {args.budget_ms:g} ms of imports per command; "
+          f"never imported: {', '.join(HEAVY_MODULES)}\n")
+
+    results = []
+    failures = 0
+    for command in FAST_COMMANDS:
+        result = profile_command(command)
+        results.append(result)
+
+        problems = []
+        if result['returncode'] != 0:
+            problems.append(f"exit code {result['returncode']}")
+        if result['import_ms'] > args.budget_ms:
+            problems.append("over budget")
+        if result['heavy_modules']:
+            problems.append(f"imports {', '.join(result['heavy_modules'])}")
+        result['problems'] = problems
+        failures += bool(problems)
+
+        status = '❌' if problems else '✅'
+        print(f"{status} campus {result['command']:<24} imports {result['import_ms']:>7.1f} ms, "
+              f"wall {result['wall_ms']:>7.1f} ms" + (f"  ({'; '.join(problems)})" if problems else ""))
+        for name, cumulative_ms in result['slowest'][:args.show]:
+            print(f"      {cumulative_ms:>8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to: {args.output}")
+
+    print("\n" + ("✅ All commands within budget" if not failures
+                  else f"❌ {failures} command(s) failed the import-time check"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
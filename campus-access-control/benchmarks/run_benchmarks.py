@@ -0,0 +1,567 @@
+"""
+End-to-End Benchmark Suite
+Runs every recognition pipeline on the bundled sample media with fixed seeds
+and compares throughput, latency percentiles, peak RSS and accuracy against
+benchmarks/baseline.json, so speed or accuracy regressions are caught before
+rollout. Each scenario runs in its own process: peak RSS is per pipeline and
+one scenario's models do not warm the caches of the next.
+
+Scenarios:
+    plate_video   VehiclePlateRecognizer.process_video on carLicence1-3.mp4
+    plate_image   Plate detection + OCR on carImage1/2.png against known plates
+    id_cards      BatchIDCardProcessor on data/training_data, fields scored
+                  against data/training_data/ground_truth.json
+    id_cards_offline / id_cards_verifier
+                  The same cards through OfflineIDCardRecognizer / IDCardVerifier
+    id_card_frames  OfflineIDCardRecognizer on id_card_dataset images, boxes checked against the labels
+    plate_synthetic / id_cards_synthetic
+                  Generated plates and cards (synthetic_data.py, fixed seed) with
+                  known text: state codes, BH series, night and blur variety
+    live_replay   A sample video replayed at its native FPS as a camera
+                  (camera_replay.ReplayCapture), as a gate would deliver it
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenarios plate_image id_cards --quick
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to path
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_DIR))
+from config.config import OUTPUT_DIR, USE_GPU, get_output_filename
+from benchmarks.bench_storage_backends import percentile
+from camera_replay import ReplayCapture
+
+SAMPLE_MEDIA_DIR = PROJECT_DIR.parent / "License-Plate-Extraction-Save-Data-to-SQL-Database" / "data"
+PLATE_VIDEOS = ['carLicence1.mp4', 'carLicence2.mp4', 'carLicence3.mp4']
+REPLAY_VIDEO = 'carLicence2.mp4'
+
+# Plate text in each sample image (carImage1's leading province character
+# is not Latin and is not expected from the English OCR model)
+PLATE_IMAGES = {
+    'carImage1.png': 'E99999',
+    'carImage2.png': 'SN66XMZ'
+}
+
+ID_CARD_IMAGES_DIR = PROJECT_DIR / "data" / "training_data"
+ID_CARD_DATASET_DIR = PROJECT_DIR / "id_card_dataset"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SCENARIOS = ['plate_video', 'plate_image', 'id_cards', 'id_cards_offline', 'id_cards_verifier',
+             'id_card_frames', 'live_replay', 'plate_synthetic', 'id_cards_synthetic']
+SEED = 42
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+# ========================
+# HELPERS
+# ========================
+
+def set_seeds(seed=SEED):
+    """Seed every RNG the pipelines touch (torch only if already imported)"""
+    random.seed(seed)
+    np.random.seed(seed)
+    cv2.setRNGSeed(seed)
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.manual_seed(seed)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def latency_metrics(latencies_ms):
+    """p50 / p95 / p99 of a list of latencies"""
+    values = sorted(latencies_ms)
+    if not values:
+        return {}
+    return {f"p{pct}_ms": round(percentile(values, pct), 2) for pct in (50, 95, 99)}
+
+
+def stage_metrics(report):
+    """Flatten a PipelineTimer report into <stage>_p95_ms metrics"""
+    return {f"{stage}_p95_ms": summary['p95_ms'] for stage, summary in report.items()}
+
+
+def normalize_plate(text):
+    """Plate text without separators, for comparison"""
+    return ''.join(ch for ch in (text or '').upper() if ch.isalnum())
+
+
+def char_accuracy(expected, actual):
+    """1 - edit distance / expected length, floored at 0"""
+    previous = list(range(len(actual) + 1))
+    for i, expected_char in enumerate(expected, 1):
+        current = [i]
+        for j, actual_char in enumerate(actual, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (expected_char != actual_char)))
+        previous = current
+    return max(0.0, 1 - previous[-1] / max(len(expected), 1))
+
+
+def box_iou(a, b):
+    """IoU of two (x1, y1, x2, y2) boxes"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    inter = width * height
+    return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+
+def load_yolo_boxes(label_path, width, height):
+    """Pixel boxes from a YOLO label file (class cx cy w h, normalized)"""
+    boxes = []
+    for line in Path(label_path).read_text().splitlines():
+        parts = line.split()
+        if len(parts) != 5:
+            continue
+        cx, cy, w, h = (float(v) for v in parts[1:])
+        boxes.append(((cx - w / 2) * width, (cy - h / 2) * height,
+                      (cx + w / 2) * width, (cy + h / 2) * height))
+    return boxes
+
+
+def image_files(directory):
+    """Sorted image paths in a directory"""
+    return sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+# ========================
+# SCENARIOS
+# ========================
+
+def bench_plate_video(options):
+    """Whole-video processing: decoded frames per second and stage latency"""
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+
+    recognizer = VehiclePlateRecognizer(use_gpu=options.gpu)
+    set_seeds(options.seed)
+
+    videos = PLATE_VIDEOS[:1] if options.quick else PLATE_VIDEOS
+    decoded, seconds, per_video = 0, 0.0, {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in videos:
+            start = time.perf_counter()
+            results = recognizer.process_video(SAMPLE_MEDIA_DIR / name, output_json_path=Path(workdir) / f"{name}.json")
+            elapsed = time.perf_counter() - start
+            if results is None:
+                raise RuntimeError(f"could not process {name}")
+            frames = results['video_properties']['total_frames']
+            decoded += frames
+            seconds += elapsed
+            per_video[name] = {'frames': frames, 'seconds': round(elapsed, 2),
+                               'plates_detected': sum(len(f['detections']) for f in results['frames'])}
+
+    stats = recognizer.stats
+    metrics = {
+        'throughput_per_s': round(decoded / seconds, 2),
+        'read_rate': round(stats['plates_extracted'] / stats['plates_detected'], 4) if stats['plates_detected'] else 0.0
+    }
+    metrics.update(stage_metrics(recognizer.timing.report()))
+    return metrics, recognizer.timing.report(), {'videos': per_video, 'stats': dict(stats)}
+
+
+def bench_plate_image(options):
+    """Single-image plate recognition, checked against PLATE_IMAGES"""
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+
+    recognizer = VehiclePlateRecognizer(use_gpu=options.gpu)
+    set_seeds(options.seed)
+
+    images = {name: cv2.imread(str(SAMPLE_MEDIA_DIR / name)) for name in PLATE_IMAGES}
+    latencies, exact, chars, readings = [], [], [], {}
+    for run in range(options.repeats):
+        for name, image in images.items():
+            if image is None:
+                raise RuntimeError(f"could not read {name}")
+            start = time.perf_counter()
+            results, _ = recognizer.detect_and_extract(image.copy(), run, None)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            detections = sorted(results['detections'], key=lambda d: -d['confidence'])
+            read = normalize_plate(detections[0]['plate_text']) if detections else ''
+            expected = PLATE_IMAGES[name]
+            exact.append(read == expected)
+            chars.append(char_accuracy(expected, read))
+            readings.setdefault(name, read)
+
+    metrics = {
+        'throughput_per_s': round(len(latencies) / (sum(latencies) / 1000), 2),
+        **latency_metrics(latencies),
+        'accuracy': round(sum(exact) / len(exact), 4),
+        'char_accuracy': round(sum(chars) / len(chars), 4)
+    }
+    metrics.update(stage_metrics(recognizer.timing.report()))
+    return metrics, recognizer.timing.report(), {'expected': PLATE_IMAGES, 'read': readings}
+
+
+def bench_id_cards(options, extractor='batch'):
+    """ID card field extraction on data/training_data, scored against its ground truth"""
+    from benchmarks.bench_id_card_accuracy import evaluate
+
+    return evaluate(extractor, use_gpu=options.gpu, quick=options.quick, seed=options.seed)
+
+
+def bench_id_cards_offline(options):
+    return bench_id_cards(options, 'offline')
+
+
+def bench_id_cards_verifier(options):
+    return bench_id_cards(options, 'verifier')
+
+
+def bench_id_card_frames(options):
+    """Live ID card pipeline on labelled frames: detection recall at IoU 0.5"""
+    from offline_id_card_recognizer import OfflineIDCardRecognizer
+
+    recognizer = OfflineIDCardRecognizer(use_gpu=options.gpu)
+    set_seeds(options.seed)
+
+    latencies, found, labelled = [], 0, 0
+    for split in ('val', 'train'):
+        for image_path in image_files(ID_CARD_DATASET_DIR / 'images' / split):
+            label_path = ID_CARD_DATASET_DIR / 'labels' / split / f"{image_path.stem}.txt"
+            frame = cv2.imread(str(image_path))
+            if frame is None or not label_path.exists():
+                continue
+            start = time.perf_counter()
+            cards, _ = recognizer.recognize_id_card(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            detected = [(c['data']['detection_bbox']['x'], c['data']['detection_bbox']['y'],
+                         c['data']['detection_bbox']['x'] + c['data']['detection_bbox']['w'],
+                         c['data']['detection_bbox']['y'] + c['data']['detection_bbox']['h']) for c in cards]
+            for truth in load_yolo_boxes(label_path, frame.shape[1], frame.shape[0]):
+                labelled += 1
+                found += any(box_iou(truth, box) >= 0.5 for box in detected)
+
+    metrics = {
+        'throughput_per_s': round(len(latencies) / (sum(latencies) / 1000), 2),
+        **latency_metrics(latencies),
+        'detect_recall': round(found / labelled, 4) if labelled else 0.0
+    }
+    metrics.update(stage_metrics(recognizer.timing.report()))
+    return metrics, recognizer.timing.report(), {'frames': len(latencies), 'labelled_cards': labelled,
+                                                 'detector': 'yolo' if recognizer.yolo_model else 'opencv'}
+
+
+def bench_live_replay(options):
+    """Real-time replay: processed FPS, frame drops and capture-to-result latency"""
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+
+    recognizer = VehiclePlateRecognizer(use_gpu=options.gpu)
+    set_seeds(options.seed)
+
+    video = ReplayCapture(SAMPLE_MEDIA_DIR / REPLAY_VIDEO, name='replay', realtime=True,
+                          jitter_ms=0, drop_rate=0, loop=False)
+    latencies, ages, processed = [], [], 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < options.replay_seconds:
+        ok, frame, info = video.read_latest()
+        if not ok:
+            if video.isOpened():
+                continue
+            break
+        ages.append(info['age_ms'])
+        recognizer.detect_and_extract(frame, processed, None)
+        latency = time.time() - info['captured_at']
+        recognizer.timing.record('end_to_end', latency)
+        latencies.append(latency * 1000)
+        processed += 1
+    elapsed = time.perf_counter() - start
+    video.release()
+
+    dropped = video.get_stats()['frames_dropped']
+    offered = processed + dropped
+    metrics = {
+        'throughput_per_s': round(processed / elapsed, 2),
+        **latency_metrics(latencies),
+        'frame_age_p95_ms': round(percentile(sorted(ages), 95), 2) if ages else None,
+        'drop_ratio': round(dropped / offered, 4) if offered else 0.0
+    }
+    metrics.update(stage_metrics(recognizer.timing.report()))
+    return metrics, recognizer.timing.report(), {'video': REPLAY_VIDEO, 'video_fps': video.fps,
+                                                 'frames_processed': processed, 'frames_dropped': dropped}
+
+
+def bench_plate_synthetic(options):
+    """Plate detection + OCR on generated frames: accuracy overall, at night and on BH plates"""
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+    from synthetic_data import synthetic_plate_frame
+
+    recognizer = VehiclePlateRecognizer(use_gpu=options.gpu)
+    rng = random.Random(options.seed)
+    samples = [synthetic_plate_frame(rng) for _ in range(options.synthetic_count)]
+    set_seeds(options.seed)
+
+    latencies, found, groups = [], 0, {'all': [], 'night': [], 'bh': []}
+    for index, (frame, label) in enumerate(samples):
+        start = time.perf_counter()
+        results, _ = recognizer.detect_and_extract(frame, index, None)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        matches = [d for d in results['detections'] if box_iou(label['box'], d['bbox']) >= 0.5]
+        found += bool(matches)
+        read = normalize_plate(max(matches, key=lambda d: d['confidence'])['plate_text']) if matches else ''
+        score = (read == label['plate'], char_accuracy(label['plate'], read))
+        groups['all'].append(score)
+        if label['night']:
+            groups['night'].append(score)
+        if label['bh_series']:
+            groups['bh'].append(score)
+
+    metrics = {
+        'throughput_per_s': round(len(latencies) / (sum(latencies) / 1000), 2),
+        **latency_metrics(latencies),
+        'detect_recall': round(found / len(samples), 4),
+        'accuracy': round(sum(s[0] for s in groups['all']) / len(samples), 4),
+        'char_accuracy': round(sum(s[1] for s in groups['all']) / len(samples), 4)
+    }
+    for group in ('night', 'bh'):
+        if groups[group]:
+            metrics[f"{group}_accuracy"] = round(sum(s[0] for s in groups[group]) / len(groups[group]), 4)
+    metrics.update(stage_metrics(recognizer.timing.report()))
+    return metrics, recognizer.timing.report(), {'frames': len(samples), 'night': len(groups['night']),
+                                                 'bh_series': len(groups['bh'])}
+
+
+def bench_id_cards_synthetic(options):
+    """BatchIDCardProcessor on generated card photos, scored like id_cards"""
+    from benchmarks.bench_id_card_accuracy import evaluate
+    from synthetic_data import generate_id_cards
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ground_truth_path = generate_id_cards(workdir, options.synthetic_count, seed=options.seed)
+        return evaluate('batch', use_gpu=options.gpu, seed=options.seed, images_dir=Path(workdir),
+                        ground_truth_path=ground_truth_path)
+
+
+SCENARIO_FUNCTIONS = {
+    'plate_video': bench_plate_video,
+    'plate_image': bench_plate_image,
+    'id_cards': bench_id_cards,
+    'id_cards_offline': bench_id_cards_offline,
+    'id_cards_verifier': bench_id_cards_verifier,
+    'id_card_frames': bench_id_card_frames,
+    'live_replay': bench_live_replay,
+    'plate_synthetic': bench_plate_synthetic,
+    'id_cards_synthetic': bench_id_cards_synthetic
+}
+
+
+def _run_scenario(name, options, results):
+    """Child process entry: run one scenario and report it on the queue"""
+    try:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if options.verbose else output):
+            metrics, stages, details = SCENARIO_FUNCTIONS[name](options)
+        metrics['peak_rss_mb'] = peak_rss_mb()
+        results.put({'scenario': name, 'metrics': metrics, 'stage_latency': stages, 'details': details})
+    except Exception as e:
+        results.put({'scenario': name, 'error': f"{type(e).__name__}: {e}"})
+
+
+def run_scenario(name, options):
+    """Run one scenario in a fresh process"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_run_scenario, args=(name, options, results))
+    start = time.perf_counter()
+    process.start()
+    try:
+        result = results.get(timeout=options.timeout)
+    except Exception:
+        process.terminate()
+        result = {'scenario': name, 'error': f"no result within {options.timeout}s"}
+    process.join()
+    result['wall_seconds'] = round(time.perf_counter() - start, 1)
+    return result
+
+
+# ========================
+# BASELINE COMPARISON
+# ========================
+
+def metric_rule(name):
+    """
+    Which way a metric may not move, and which threshold applies
+
+    Returns:
+        tuple: ('higher' or 'lower', threshold key), or None if not compared
+    """
+    if name.endswith('_ms'):
+        return 'lower', 'latency'
+    if name.endswith('_mb'):
+        return 'lower', 'memory'
+    if name.endswith('_per_s'):
+        return 'higher', 'throughput'
+    if name.endswith(('accuracy', 'recall', '_rate')):
+        return 'higher', 'accuracy'
+    if name.endswith('_ratio'):
+        return 'lower', 'drop_ratio'
+    return None
+
+
+def compare(result, baseline):
+    """
+    Compare one scenario result with the baseline
+
+    Args:
+        result (dict): Output of run_scenario
+        baseline (dict): Parsed baseline.json
+
+    Returns:
+        list: (metric, baseline value, value, limit, ok) per compared metric
+    """
+    thresholds = baseline['thresholds']
+    reference = baseline.get('scenarios', {}).get(result['scenario'], {}).get('metrics', {})
+    rows = []
+    for metric, value in result.get('metrics', {}).items():
+        rule = metric_rule(metric)
+        base = reference.get(metric)
+        if rule is None or base is None or value is None:
+            continue
+        direction, key = rule
+        tolerance = thresholds[key]
+        if key in ('accuracy', 'drop_ratio'):
+            # Absolute change
+            limit = base - tolerance if direction == 'higher' else base + tolerance
+        elif direction == 'higher':
+            limit = base * (1 - tolerance)
+        else:
+            limit = base * (1 + tolerance) + (thresholds['latency_slack_ms'] if key == 'latency' else 0)
+        ok = value >= limit if direction == 'higher' else value <= limit
+        rows.append((metric, base, value, round(limit, 4), ok))
+    return rows
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def machine_info(options):
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'processor': platform.processor() or platform.machine(),
+        'gpu_requested': options.gpu
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every pipeline on the sample media')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS,
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--quick', action='store_true',
+                        help='One video, 10 ID cards, 30 synthetic samples, fewer repeats '
+                             '(compare against a --quick baseline)')
+    parser.add_argument('--repeats', type=int, default=10, help='Passes over the plate images (default: 10)')
+    parser.add_argument('--replay-seconds', type=float, default=20,
+                        help='Length of the live replay (default: 20, i.e. the whole video)')
+    parser.add_argument('--synthetic-count', type=int, default=200,
+                        help='Generated plates / cards per synthetic scenario (default: 200)')
+    parser.add_argument('--seed', type=int, default=SEED, help=f'RNG seed (default: {SEED})')
+    parser.add_argument('--cpu', action='store_true', help='Force CPU')
+    parser.add_argument('--timeout', type=float, default=1800, help='Seconds allowed per scenario')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_PATH), help='Baseline JSON')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store these results as the new baseline (thresholds are kept)')
+    parser.add_argument('--output', type=str, help='Results JSON (default: outputs/benchmark_<time>.json)')
+    parser.add_argument('--verbose', action='store_true', help='Show the pipelines\' own output')
+    args = parser.parse_args()
+    args.gpu = USE_GPU and not args.cpu
+    if args.quick:
+        args.repeats = min(args.repeats, 3)
+        args.replay_seconds = min(args.replay_seconds, 10)
+        args.synthetic_count = min(args.synthetic_count, 30)
+
+    baseline = load_baseline(args.baseline)
+
+    print("=" * 70)
+    print("🏁 END-TO-END BENCHMARKS")
+    print("=" * 70)
+    recorded = baseline.get('recorded')
+    print(f"Baseline: {Path(args.baseline).name}" + (f" (recorded {recorded['time']} on {recorded['machine']['platform']})"
+                                                   if recorded else " (no results recorded yet)"))
+    if recorded and recorded['options'].get('quick') != args.quick:
+        print("⚠️  Baseline was recorded " + ("with" if recorded['options'].get('quick') else "without")
+              + " --quick; numbers are not comparable")
+
+    results, failures = [], 0
+    for name in args.scenarios:
+        print(f"\n▶️  {name}")
+        result = run_scenario(name, args)
+        results.append(result)
+        if 'error' in result:
+            failures += 1
+            print(f"   ❌ {result['error']}")
+            continue
+
+        rows = {row[0]: row for row in compare(result, baseline)}
+        result['regressions'] = [row[0] for row in rows.values() if not row[4]]
+        failures += bool(result['regressions'])
+        for metric, value in result['metrics'].items():
+            row = rows.get(metric)
+            if row is None:
+                print(f"   {metric:<24} {value!s:>10}")
+            else:
+                status = '✅' if row[4] else '❌'
+                print(f"   {metric:<24} {value!s:>10}  baseline {row[1]!s:>10}  limit {row[3]!s:>10} {status}")
+
+    report = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': machine_info(args),
+        'options': {'quick': args.quick, 'repeats': args.repeats, 'replay_seconds': args.replay_seconds,
+                    'synthetic_count': args.synthetic_count, 'seed': args.seed},
+        'results': results
+    }
+    output_path = Path(args.output) if args.output else OUTPUT_DIR / get_output_filename('benchmark')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to: {output_path}")
+
+    if args.update_baseline:
+        baseline['recorded'] = {'time': report['time'], 'machine': report['machine'], 'options': report['options']}
+        for result in results:
+            if 'error' not in result:
+                baseline.setdefault('scenarios', {})[result['scenario']] = {'metrics': result['metrics']}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    print("\n" + ("✅ No regressions against the baseline" if not failures
+                  else f"❌ {failures} scenario(s) failed or regressed"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Memory Soak Test
+Runs the access control loop on replayed virtual gates (see
+bench_virtual_gates.py) for a long stretch and samples the process RSS and
+tracemalloc's traced memory at a fixed interval. After a warm-up (models
+loaded, caches and buffers filled) memory should stay flat; the test fits a
+least-squares line through the samples and fails if RSS grows faster than
+--max-slope-mb-per-hour. The tracemalloc snapshot diff between the end of
+the warm-up and the end of the run points at the source lines that grew.
+
+Set CAMPUS_SESSION_BUFFER_SIZE low (e.g. 50) to push the session buffers
+into spilling within minutes instead of hours.
+
+Usage:
+    python benchmarks/soak_test.py --minutes 60 --gates 4 --fast
+    CAMPUS_SESSION_BUFFER_SIZE=50 python benchmarks/soak_test.py --minutes 10 --id-cards
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config.config import OUTPUT_DIR, SESSION_BUFFER_SIZE, SOAK_MAX_SLOPE_MB_PER_HOUR, get_output_filename
+from benchmarks.bench_virtual_gates import run_gates
+from benchmarks.run_benchmarks import ID_CARD_IMAGES_DIR, PLATE_VIDEOS, SAMPLE_MEDIA_DIR
+from model_registry import _rss_mb
+
+TOP_GROWTH = 10
+
+
+def slope_per_hour(samples, key):
+    """
+    Least-squares slope of samples[key] over samples['elapsed']
+
+    Args:
+        samples (list): Dicts with 'elapsed' (seconds) and key (MB)
+        key (str): Value to fit
+
+    Returns:
+        float: MB per hour (None with fewer than 2 samples)
+    """
+    points = [(s['elapsed'], s[key]) for s in samples if s.get(key) is not None]
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    if not spread:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / spread * 3600
+
+
+def sample_memory(start, trace):
+    """One memory sample: RSS and (with trace) tracemalloc's current / peak"""
+    sample = {'elapsed': round(time.monotonic() - start, 1), 'rss_mb': _rss_mb()}
+    if sample['rss_mb'] is not None:
+        sample['rss_mb'] = round(sample['rss_mb'], 1)
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        sample['traced_mb'] = round(current / 2 ** 20, 2)
+        sample['traced_peak_mb'] = round(peak / 2 ** 20, 2)
+    return sample
+
+
+def top_growth(before, after, count=TOP_GROWTH):
+    """Source lines whose allocations grew most between two snapshots"""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+              tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')]
+    before = before.filter_traces(ignore)
+    after = after.filter_traces(ignore)
+    grown = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff > 0]
+    return [
+        {'line': str(stat.traceback[0]), 'size_diff_kb': round(stat.size_diff / 1024, 1),
+         'count_diff': stat.count_diff}
+        for stat in grown[:count]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that a long-running gate session keeps memory flat')
+    parser.add_argument('--minutes', type=float, default=30, help='Length of the run (default: 30)')
+    parser.add_argument('--warmup-minutes', type=float, default=2,
+                        help='Samples before this are not fitted (default: 2)')
+    parser.add_argument('--interval', type=float, default=10, help='Seconds between memory samples (default: 10)')
+    parser.add_argument('--gates', type=int, default=4, help='Virtual gates (default: 4)')
+    parser.add_argument('--videos', nargs='+', help='Vehicle camera recordings (default: the sample videos)')
+    parser.add_argument('--id-cards', action='store_true',
+                        help='Give every gate an ID card camera replaying data/training_data')
+    parser.add_argument('--fast', action='store_true',
+                        help='Deliver frames as fast as they are read instead of in real time')
+    parser.add_argument('--max-slope-mb-per-hour', type=float, default=SOAK_MAX_SLOPE_MB_PER_HOUR,
+                        help=f'Fail above this RSS growth (default: {SOAK_MAX_SLOPE_MB_PER_HOUR})')
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help='Sample RSS only (tracemalloc slows allocation-heavy code)')
+    parser.add_argument('--output', type=str, help='Results JSON (default: outputs/soak_<time>.json)')
+    parser.add_argument('--verbose', action='store_true', help='Show the system\'s own output')
+    args = parser.parse_args()
+
+    videos = [Path(v) for v in args.videos] if args.videos else [SAMPLE_MEDIA_DIR / v for v in PLATE_VIDEOS]
+    id_card_source = str(ID_CARD_IMAGES_DIR) if args.id_cards else None
+    replay_options = {'realtime': not args.fast, 'fps': 5}
+    seconds = args.minutes * 60
+    warmup = args.warmup_minutes * 60
+    trace = not args.no_tracemalloc
+
+    print("=" * 70)
+    print("🧪 MEMORY SOAK TEST")
+    print("=" * 70)
+    print(f"Gates: {args.gates}, {args.minutes:g} min (warm-up {args.warmup_minutes:g} min), "
+          f"sample every {args.interval:g}s")
+    print(f"Session buffers: {SESSION_BUFFER_SIZE} items in memory")
+    print(f"Limit: {args.max_slope_mb_per_hour:g} MB/hour RSS growth")
+
+    from access_control_system import AccessControlSystem
+
+    console = sys.stdout  # redirect_stdout swaps it for every thread
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        system = AccessControlSystem()
+        system.ensure_ready()
+
+    if trace:
+        tracemalloc.start()
+    result = {}
+
+    def run():
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            result.update(run_gates(system, args.gates, seconds, videos, id_card_source, replay_options))
+
+    runner = threading.Thread(target=run, name='soak-gates', daemon=True)
+    start = time.monotonic()
+    runner.start()
+
+    samples = []
+    warm_snapshot = None
+    print(f"\n   {'min':>6} {'rss MB':>8} {'traced MB':>10} {'access log':>11}", file=console)
+    while runner.is_alive():
+        sample = sample_memory(start, trace)
+        sample['access_log'] = system.access_log.total
+        samples.append(sample)
+        if trace and warm_snapshot is None and sample['elapsed'] >= warmup:
+            warm_snapshot = tracemalloc.take_snapshot()
+        print(f"   {sample['elapsed'] / 60:>6.1f} {sample['rss_mb']!s:>8} {sample.get('traced_mb', '-')!s:>10} "
+              f"{sample['access_log']:>11}", file=console)
+        output.seek(0)
+        output.truncate()  # Keep the captured system output from growing with the run
+        runner.join(args.interval)
+    samples.append(sample_memory(start, trace))
+
+    growth = []
+    if trace:
+        if warm_snapshot is not None:
+            growth = top_growth(warm_snapshot, tracemalloc.take_snapshot())
+        tracemalloc.stop()
+
+    fitted = [s for s in samples if s['elapsed'] >= warmup]
+    rss_slope = slope_per_hour(fitted, 'rss_mb')
+    traced_slope = slope_per_hour(fitted, 'traced_mb')
+    passed = rss_slope is not None and rss_slope <= args.max_slope_mb_per_hour
+
+    print("\n📈 RSS slope after warm-up: "
+          + (f"{rss_slope:+.1f} MB/hour" if rss_slope is not None else "n/a (too few samples)")
+          + (f", traced {traced_slope:+.1f} MB/hour" if traced_slope is not None else ""))
+    if growth:
+        print("   Largest growth since warm-up:")
+        for stat in growth[:5]:
+            print(f"   {stat['size_diff_kb']:>+10.1f} KB  {stat['line']}")
+    print(f"{'✅ PASS' if passed else '❌ FAIL'}: limit {args.max_slope_mb_per_hour:g} MB/hour")
+
+    report = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'options': {'minutes': args.minutes, 'warmup_minutes': args.warmup_minutes, 'interval': args.interval,
+                    'gates': args.gates, 'videos': [str(v) for v in videos], 'id_cards': args.id_cards,
+                    'session_buffer_size': SESSION_BUFFER_SIZE, 'tracemalloc': trace, **replay_options},
+        'max_slope_mb_per_hour': args.max_slope_mb_per_hour,
+        'rss_slope_mb_per_hour': round(rss_slope, 2) if rss_slope is not None else None,
+        'traced_slope_mb_per_hour': round(traced_slope, 2) if traced_slope is not None else None,
+        'passed': passed,
+        'access_log': system.access_log.stats(),
+        'gates': result,
+        'top_growth': growth,
+        'samples': samples
+    }
+    output_path = Path(args.output) if args.output else OUTPUT_DIR / get_output_filename('soak')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to: {output_path}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
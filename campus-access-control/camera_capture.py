@@ -0,0 +1,233 @@
+"""
+Latest-Frame Camera Capture
+Reads a camera on a background thread and keeps only the newest frame
+Recognizers that spend hundreds of milliseconds per frame always get the
+freshest image instead of working through the driver's backlog
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import cv2
+
+
+# Consecutive read failures before a live camera is treated as lost
+MAX_READ_FAILURES = 30
+
+
+class LatestFrameCapture:
+    """
+    Threaded capture source with a one-frame buffer
+
+    Drop-in for the cv2.VideoCapture calls the camera loops use
+    (isOpened / set / read / release). Frames that are replaced before
+    anyone reads them are counted as dropped.
+    """
+
+    def __init__(self, source=0, width=None, height=None, fps=None, name='camera', timer=None):
+        """
+        Open the camera and start the capture thread
+
+        Args:
+            source (int or str): Camera index or stream URL
+            width (int): Requested frame width
+            height (int): Requested frame height
+            fps (int): Requested camera FPS
+            name (str): Name used in messages and the thread name
+            timer (PipelineTimer): Records each frame's 'decode' time
+        """
+        self.source = source
+        self.name = name
+        self.timer = timer
+        self.cap = cv2.VideoCapture(source)
+
+        for prop, value in ((cv2.CAP_PROP_FRAME_WIDTH, width),
+                            (cv2.CAP_PROP_FRAME_HEIGHT, height),
+                            (cv2.CAP_PROP_FPS, fps)):
+            if value:
+                self.cap.set(prop, value)
+
+        # Newest frame and its metadata, guarded by _new_frame's lock
+        self._new_frame = threading.Condition()
+        self._frame = None
+        self._frame_info = None
+        self._seq = 0
+        self._read_seq = 0
+        self._stopped = False
+
+        self.stats = {
+            'frames_captured': 0,
+            'frames_delivered': 0,
+            'frames_dropped': 0,
+            'read_failures': 0,
+            'read_timeouts': 0
+        }
+
+        self._thread = None
+        if self.cap.isOpened():
+            self._thread = threading.Thread(target=self._run, name=f"capture-{name}", daemon=True)
+            self._thread.start()
+
+    def isOpened(self):
+        """True until the capture thread has ended (camera lost or released)"""
+        return self.cap.isOpened() and not self._stopped
+
+    def set(self, prop, value):
+        """Set a cv2.CAP_PROP_* property on the underlying capture"""
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        """Get a cv2.CAP_PROP_* property from the underlying capture"""
+        return self.cap.get(prop)
+
+    def _run(self):
+        """Capture loop: overwrite the buffered frame with every new one"""
+        failures = 0
+        while not self._stopped:
+            # grab() waits for the sensor, retrieve() decodes: only the
+            # latter is 'decode' time
+            ret, frame = self.cap.grab(), None
+            captured_at = time.time()
+            captured_mono = time.monotonic()
+            if ret:
+                decode_start = time.perf_counter()
+                ret, frame = self.cap.retrieve()
+                if self.timer:
+                    self.timer.record('decode', time.perf_counter() - decode_start)
+
+            if not ret:
+                failures += 1
+                self.stats['read_failures'] += 1
+                if failures >= MAX_READ_FAILURES:
+                    print(f"❌ {self.name}: camera stopped delivering frames")
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+
+            with self._new_frame:
+                if self._frame is not None and self._seq > self._read_seq:
+                    self.stats['frames_dropped'] += 1
+                self._seq += 1
+                self._frame = frame
+                self._frame_info = {
+                    'seq': self._seq,
+                    'captured_at': captured_at,
+                    'captured_monotonic': captured_mono
+                }
+                self.stats['frames_captured'] += 1
+                self._new_frame.notify_all()
+
+        with self._new_frame:
+            self._stopped = True
+            self._new_frame.notify_all()
+
+    def read_latest(self, timeout=1.0):
+        """
+        Wait for a frame newer than the last one returned
+
+        ok is False both when no frame arrived within the timeout (a stalled
+        camera, counted as read_timeouts) and once the capture has ended;
+        isOpened() tells the two apart, so callers keep waiting while it is True.
+
+        Args:
+            timeout (float): Seconds to wait for a new frame
+
+        Returns:
+            tuple: (ok, frame, info) where info has seq, captured_at (epoch),
+                   age_ms and dropped_before (frames skipped since the last read)
+        """
+        with self._new_frame:
+            if not self._new_frame.wait_for(lambda: self._seq > self._read_seq or self._stopped,
+                                            timeout=timeout):
+                self.stats['read_timeouts'] += 1
+                return False, None, None
+            if self._seq <= self._read_seq:
+                return False, None, None
+
+            frame = self._frame
+            info = dict(self._frame_info)
+            info['dropped_before'] = self._seq - self._read_seq - 1
+            self._read_seq = self._seq
+            # Handed over to the caller, who may draw on it
+            self._frame = None
+
+        self.stats['frames_delivered'] += 1
+        info['age_ms'] = round((time.monotonic() - info.pop('captured_monotonic')) * 1000, 2)
+        return True, frame, info
+
+    def read(self):
+        """
+        cv2.VideoCapture-compatible read of the newest frame
+
+        Blocks like cv2 does: a stalled camera is waited for, (False, None)
+        only comes once the capture has ended.
+        """
+        while True:
+            ok, frame, _ = self.read_latest()
+            if ok or not self.isOpened():
+                return ok, frame
+
+    def get_stats(self):
+        """
+        Capture statistics
+
+        Returns:
+            dict: frames_captured, frames_delivered, frames_dropped, read_failures,
+                  read_timeouts
+        """
+        return dict(self.stats)
+
+    def release(self):
+        """Stop the capture thread and release the camera"""
+        with self._new_frame:
+            self._stopped = True
+            self._new_frame.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def camera_source(value):
+    """argparse type for camera options: an index, a stream URL or a file to replay"""
+    return int(value) if str(value).isdigit() else value
+
+
+def is_replay_source(source):
+    """True for a video file, image directory or glob pattern (not an index or stream URL)"""
+    if not isinstance(source, (str, Path)) or '://' in str(source):
+        return False
+    return Path(source).exists() or any(ch in str(source) for ch in '*?[')
+
+
+def open_camera(source=0, width=None, height=None, fps=None, name='camera', timer=None, latest_only=True):
+    """
+    Open a camera, or a recording played back as one (see camera_replay.py)
+
+    Args:
+        source (int or str): Camera index, stream URL, video file, image
+            directory or glob pattern
+        width (int): Requested frame width
+        height (int): Requested frame height
+        fps (int): Requested camera FPS
+        name (str): Name used in messages and the thread name
+        timer (PipelineTimer): Records each frame's 'decode' time
+        latest_only (bool): Threaded LatestFrameCapture for cameras; False
+            returns a plain cv2.VideoCapture (replays are always threaded)
+
+    Returns:
+        LatestFrameCapture, ReplayCapture or cv2.VideoCapture
+    """
+    if is_replay_source(source):
+        from camera_replay import ReplayCapture
+        return ReplayCapture(source, width, height, fps, name=name, timer=timer)
+    if latest_only:
+        return LatestFrameCapture(source, width, height, fps, name=name, timer=timer)
+    return cv2.VideoCapture(source)
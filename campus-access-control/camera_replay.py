@@ -0,0 +1,261 @@
+"""
+Replayed Camera
+Plays a video file or an image sequence as if it were a gate camera, through
+the same interface as LatestFrameCapture, so the live loops can run (and be
+load-tested with many virtual gates) without webcams. Frames are delivered
+at the source's real-time pace or as fast as they are read, optionally late
+by a random jitter or lost altogether, and every frame carries its delivery
+time, so capture-to-decision latency is measured the same way as live.
+
+Usage:
+    python access_control_system.py --vehicle-camera data/videos/gate.mp4
+    CAMPUS_REPLAY_JITTER_MS=40 CAMPUS_REPLAY_DROP_RATE=0.05 python campus.py access --vehicle-camera gate.mp4
+"""
+
+import glob
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import CAMERA_FPS, REPLAY_REALTIME, REPLAY_JITTER_MS, REPLAY_DROP_RATE, REPLAY_LOOP
+from camera_capture import LatestFrameCapture
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def list_images(source):
+    """
+    Image files of a directory or glob pattern, sorted
+
+    Args:
+        source (str or Path): Directory or pattern such as 'frames/*.jpg'
+
+    Returns:
+        list: Paths (empty if the source is a video file)
+    """
+    path = Path(source)
+    if path.is_dir():
+        files = path.iterdir()
+    elif any(ch in str(source) for ch in '*?['):
+        files = (Path(p) for p in glob.glob(str(source)))
+    else:
+        return []
+    return sorted(p for p in files if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def fit_frame(frame, width, height):
+    """Scale a frame into width x height keeping its aspect ratio, padding the rest grey"""
+    if not width or not height or frame.shape[1] == width and frame.shape[0] == height:
+        return frame
+    scale = min(width / frame.shape[1], height / frame.shape[0])
+    resized = cv2.resize(frame, (max(1, int(frame.shape[1] * scale)), max(1, int(frame.shape[0] * scale))))
+    canvas = np.full((height, width, 3), 114, dtype=np.uint8)
+    y, x = (height - resized.shape[0]) // 2, (width - resized.shape[1]) // 2
+    canvas[y:y + resized.shape[0], x:x + resized.shape[1]] = resized
+    return canvas
+
+
+class ReplayCapture(LatestFrameCapture):
+    """
+    Video file or image sequence played back as a threaded camera
+
+    read_latest / read / get_stats / release behave as on LatestFrameCapture:
+    one-frame buffer, frames replaced before being read count as dropped.
+    Frames lost on purpose (drop_rate) are counted as frames_lost.
+    """
+
+    def __init__(self, source, width=None, height=None, fps=None, name='replay', timer=None,
+                 realtime=REPLAY_REALTIME, jitter_ms=REPLAY_JITTER_MS, drop_rate=REPLAY_DROP_RATE,
+                 loop=REPLAY_LOOP, seed=None):
+        """
+        Open the source and start the playback thread
+
+        Args:
+            source (str or Path): Video file, image directory or glob pattern
+            width (int): Frame width delivered (None = source size)
+            height (int): Frame height delivered (None = source size)
+            fps (int): Pace for image sequences (videos play at their own FPS)
+            name (str): Name used in messages and the thread name
+            timer (PipelineTimer): Records each frame's 'decode' time
+            realtime (bool): Deliver at the source FPS; False = hand over the
+                next frame whenever one is asked for (nothing overwritten or waited for)
+            jitter_ms (float): Each frame arrives up to this much late (uniform)
+            drop_rate (float): Probability that a frame is never delivered
+            loop (bool): Start over at the end instead of stopping
+            seed (int): Seed for jitter and drops (None = random)
+        """
+        self.source = source
+        self.name = name
+        self.timer = timer
+        self.width, self.height = width, height
+        self.realtime = realtime
+        self.jitter = max(0.0, jitter_ms) / 1000
+        self.drop_rate = drop_rate
+        self.loop = loop
+        self._rng = random.Random(seed)
+
+        self.images = list_images(source)
+        self.cap = None
+        if self.images:
+            self.fps = fps or CAMERA_FPS
+        else:
+            self.cap = cv2.VideoCapture(str(source))
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps or CAMERA_FPS
+
+        self._new_frame = threading.Condition()
+        self._frame = None
+        self._frame_info = None
+        self._seq = 0
+        self._read_seq = 0
+        self._stopped = False
+        self._wanted = False  # Fast mode: a reader is waiting for a frame
+        self.last_info = None
+
+        self.stats = {
+            'frames_captured': 0,
+            'frames_delivered': 0,
+            'frames_dropped': 0,
+            'frames_lost': 0,
+            'read_failures': 0,
+            'read_timeouts': 0,
+            'loops': 0
+        }
+
+        self._thread = None
+        if self.images or self.cap.isOpened():
+            self._thread = threading.Thread(target=self._run, name=f"replay-{name}", daemon=True)
+            self._thread.start()
+        else:
+            print(f"❌ {name}: cannot open {source}")
+
+    def isOpened(self):
+        """True while the source is playing"""
+        return self._thread is not None and not self._stopped
+
+    def set(self, prop, value):
+        """Frame size changes apply to the next frame; other properties are ignored"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS and self.images:
+            self.fps = value
+        else:
+            return False
+        return True
+
+    def get(self, prop):
+        """Frame size and FPS as delivered"""
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width or (self.cap.get(prop) if self.cap else 0))
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height or (self.cap.get(prop) if self.cap else 0))
+        return self.cap.get(prop) if self.cap else 0.0
+
+    def _next_frame(self, index):
+        """Decode the frame after the previous one (None at the end)"""
+        if self.images:
+            if index >= len(self.images):
+                return None
+            return cv2.imread(str(self.images[index]))
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def _rewind(self):
+        if self.cap:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.stats['loops'] += 1
+
+    def _run(self):
+        """Playback loop: decode, wait for the frame's due time, publish"""
+        start = time.perf_counter()
+        slot = 0  # Frame periods since start, lost frames included
+        position = 0  # Frame within the source
+        while not self._stopped:
+            decode_start = time.perf_counter()
+            frame = self._next_frame(position)
+            if frame is None and position < len(self.images):
+                # Unreadable image: skip it
+                self.stats['read_failures'] += 1
+                position += 1
+                continue
+            if frame is None:
+                if slot == 0:
+                    self.stats['read_failures'] += 1
+                    print(f"❌ {self.name}: no frames in {self.source}")
+                    break
+                if not self.loop:
+                    print(f"⏹️  {self.name}: end of replay")
+                    break
+                self._rewind()
+                position = 0
+                continue
+            if self.timer:
+                self.timer.record('decode', time.perf_counter() - decode_start)
+            position += 1
+            slot += 1
+
+            if self._rng.random() < self.drop_rate:
+                self.stats['frames_lost'] += 1
+                continue
+            frame = fit_frame(frame, self.width, self.height)
+
+            if self.realtime:
+                due = start + slot / self.fps + self._rng.uniform(0, self.jitter)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            with self._new_frame:
+                if not self.realtime:
+                    # As fast as possible: the decoded frame is handed over
+                    # (and stamped) when a reader asks for it
+                    self._new_frame.wait_for(lambda: self._wanted or self._stopped)
+                    if self._stopped:
+                        break
+                    self._wanted = False
+                if self._frame is not None and self._seq > self._read_seq:
+                    self.stats['frames_dropped'] += 1
+                self._seq += 1
+                self._frame = frame
+                self._frame_info = {
+                    'seq': self._seq,
+                    'captured_at': time.time(),
+                    'captured_monotonic': time.monotonic()
+                }
+                self.stats['frames_captured'] += 1
+                self._new_frame.notify_all()
+
+        with self._new_frame:
+            self._stopped = True
+            self._new_frame.notify_all()
+
+    def read_latest(self, timeout=1.0):
+        """See LatestFrameCapture.read_latest; in fast mode asks the playback thread for a frame"""
+        if not self.realtime:
+            with self._new_frame:
+                self._wanted = True
+                self._new_frame.notify_all()
+        ok, frame, info = super().read_latest(timeout=timeout)
+        if ok:
+            self.last_info = info
+        return ok, frame, info
+
+    def release(self):
+        """Stop playback and close the source"""
+        with self._new_frame:
+            self._stopped = True
+            self._new_frame.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self.cap:
+            self.cap.release()
@@ -0,0 +1,151 @@
+"""
+Campus Access Control - Unified Command Line
+One entry point for every tool. A subcommand's module (and with it OpenCV,
+torch, YOLO, EasyOCR or the database driver) is imported only when that
+subcommand runs, so --help, the database commands and the report viewers
+start in a fraction of a second. Importing a module never loads a model:
+recognizers load theirs when they are built, and `warmup` does it up front.
+
+Usage:
+    python campus.py --help
+    python campus.py access --mode dual
+    python campus.py plates --video data/videos/gate.mp4
+    python campus.py results --summary
+    python campus.py warmup --plates --id-cards
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+
+
+# name -> (module, help). The module's main() parses the remaining arguments,
+# so `campus plates --help` shows the plate recognizer's own options.
+COMMANDS = {
+    'access': ('access_control_system', 'Unified access control (vehicles + ID cards)'),
+    'plates': ('vehicle_plate_recognizer', 'Vehicle number plate recognition'),
+    'id-cards': ('offline_id_card_recognizer', 'Offline ID card recognition'),
+    'batch-id-cards': ('batch_process_id_cards', 'OCR a directory of ID card images'),
+    'results': ('view_batch_results', 'View batch ID card results'),
+    'model-server': ('model_server', 'Shared model server for camera processes'),
+    'prefork': ('prefork', 'Batch jobs on prefork workers'),
+    'db-setup': ('setup_supabase', 'Database setup and student import'),
+    'db-maintenance': ('database.maintenance', 'Log partitions, rollups and retention'),
+    'setup': ('quick_start', 'Quick start wizard'),
+}
+
+
+def run_module(command, args):
+    """
+    Import a subcommand's module and run its main() with the given arguments
+
+    Args:
+        command (str): Key of COMMANDS
+        args (list): Arguments after the subcommand
+
+    Returns:
+        int: Exit code
+    """
+    module_name = COMMANDS[command][0]
+    module = importlib.import_module(module_name)
+
+    saved_argv = sys.argv
+    sys.argv = [f"campus {command}"] + list(args)
+    try:
+        result = module.main()
+    finally:
+        sys.argv = saved_argv
+    return result if isinstance(result, int) else 0
+
+
+def show_config(args):
+    """Print the configuration (no models, no database)"""
+    from config.config import print_config
+    print_config()
+    return 0
+
+
+def warmup(args):
+    """
+    Load the requested models and warm them up, reporting cold vs warm latency
+
+    Args:
+        args: Parsed warmup arguments
+
+    Returns:
+        int: Exit code
+    """
+    from config.config import USE_GPU
+    from model_registry import print_loaded_models
+
+    use_gpu = USE_GPU and not args.cpu
+    targets = []
+    if args.plates or not args.id_cards:
+        from vehicle_plate_recognizer import VehiclePlateRecognizer
+        targets.append(('plates', VehiclePlateRecognizer))
+    if args.id_cards or not args.plates:
+        from offline_id_card_recognizer import OfflineIDCardRecognizer
+        targets.append(('id-cards', OfflineIDCardRecognizer))
+
+    summary = []
+    for name, recognizer_class in targets:
+        start = time.perf_counter()
+        recognizer = recognizer_class(use_gpu=use_gpu, warmup=False)
+        load_seconds = time.perf_counter() - start
+        summary.append((name, load_seconds, recognizer.warmup(args.runs)))
+
+    print_loaded_models()
+    print("\n🔥 Warm-up summary:")
+    for name, load_seconds, report in summary:
+        timings = ', '.join(f"{model} {t['cold_ms']:.0f} -> {t['warm_ms']:.0f} ms"
+                            for model, t in report.items())
+        print(f"   {name:<10} load {load_seconds:.2f}s; {timings}")
+    return 0
+
+
+def build_parser():
+    """Top-level parser; subcommand options are left to each module"""
+    parser = argparse.ArgumentParser(
+        prog='campus',
+        description='Smart Campus Access Verification System'
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    for name, (_, help_text) in COMMANDS.items():
+        # No option parsing at this level: everything after the subcommand,
+        # --help included, is passed through to the module
+        subparser = subparsers.add_parser(name, help=help_text, add_help=False, prefix_chars='\0')
+        subparser.add_argument('args', nargs=argparse.REMAINDER)
+
+    config_parser = subparsers.add_parser('config', help='Print the configuration')
+    config_parser.set_defaults(handler=show_config)
+
+    warmup_parser = subparsers.add_parser('warmup', help='Load and warm up the models')
+    warmup_parser.add_argument('--plates', action='store_true', help='Plate recognizer only')
+    warmup_parser.add_argument('--id-cards', action='store_true', help='ID card recognizer only')
+    warmup_parser.add_argument('--cpu', action='store_true', help='Force CPU')
+    warmup_parser.add_argument('--runs', type=int, default=3, help='Passes per model (default: 3)')
+    warmup_parser.set_defaults(handler=warmup)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+    if args.command in COMMANDS:
+        return run_module(args.command, args.args)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
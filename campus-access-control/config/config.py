@@ -24,10 +24,15 @@ ID_CARD_OUTPUT_DIR = OUTPUT_DIR / "id_card_data"
 ACCESS_LOG_DIR = OUTPUT_DIR / "access_logs"
 CAPTURED_FRAMES_DIR = OUTPUT_DIR / "captured_frames"
 
-# Ensure all directories exist
-for directory in [VIDEO_DIR, ID_CARD_DIR, VEHICLE_OUTPUT_DIR, 
-                  ID_CARD_OUTPUT_DIR, ACCESS_LOG_DIR, CAPTURED_FRAMES_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+PROJECT_DIRECTORIES = [VIDEO_DIR, ID_CARD_DIR, VEHICLE_OUTPUT_DIR,
+                       ID_CARD_OUTPUT_DIR, ACCESS_LOG_DIR, CAPTURED_FRAMES_DIR]
+
+
+def ensure_directories():
+    """Create the data / output directories (called by code that writes there)"""
+    for directory in PROJECT_DIRECTORIES:
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 # ========================
 # MODEL CONFIGURATIONS
@@ -37,6 +42,7 @@ for directory in [VIDEO_DIR, ID_CARD_DIR, VEHICLE_OUTPUT_DIR,
 YOLO_MODEL_PATH = MODEL_DIR / "best.pt"  # Path to trained YOLO model
 YOLO_CONFIDENCE_THRESHOLD = 0.5  # Minimum confidence for detection
 YOLO_IOU_THRESHOLD = 0.45  # IoU threshold for NMS
+YOLO_IMAGE_SIZE = 640  # Detector input size at full quality
 
 # EasyOCR Settings
 OCR_LANGUAGES = ['en']  # Languages for OCR
@@ -125,6 +131,13 @@ CAMERA_WIDTH = 1280  # Camera resolution width
 CAMERA_HEIGHT = 720  # Camera resolution height
 CAMERA_FPS = 30  # Camera FPS
 
+# Replayed cameras: a video file, image directory or glob given instead of a
+# camera index is played back as a camera (see camera_replay.py)
+REPLAY_REALTIME = os.getenv('CAMPUS_REPLAY_PACE', 'realtime') != 'fast'  # 'fast' = as fast as frames are read
+REPLAY_JITTER_MS = float(os.getenv('CAMPUS_REPLAY_JITTER_MS', '0'))  # Frames arrive up to this much late
+REPLAY_DROP_RATE = float(os.getenv('CAMPUS_REPLAY_DROP_RATE', '0'))  # Share of frames the "camera" loses
+REPLAY_LOOP = os.getenv('CAMPUS_REPLAY_LOOP', '0') == '1'  # Start over at the end instead of stopping
+
 # Capture settings
 AUTO_CAPTURE_DELAY = 3  # Seconds between auto-captures
 CAPTURE_ON_DETECTION = True  # Auto-capture when object detected
@@ -148,9 +161,44 @@ GPU_DEVICE = 'cuda'  # CUDA device
 CPU_DEVICE = 'cpu'
 
 # Processing settings
-BATCH_SIZE = 1  # Batch size for inference
+BATCH_SIZE = 4  # Max frames per batched inference (model server; 1 = no batching)
+BATCH_MAX_WAIT_MS = 10  # Longest a frame waits for other cameras' frames to batch with
+BATCH_DEADLINE_MS = 1000  # Frames queued longer than this are dropped, not run
 NUM_WORKERS = 2  # Number of worker threads
 
+# Shared model server (one process holds the weights for every camera)
+MODEL_SERVER_ADDRESS = os.getenv('CAMPUS_MODEL_SERVER', '127.0.0.1:6070')  # host:port or socket path
+# Shared secret for model server connections. Unset = the server makes a random
+# key per run and writes it (owner-only) to MODEL_SERVER_KEY_DIR for local
+# clients; non-loopback addresses require an explicit key
+MODEL_SERVER_AUTHKEY = os.getenv('CAMPUS_MODEL_SERVER_KEY') or None
+MODEL_SERVER_KEY_DIR = OUTPUT_DIR
+MODEL_SERVER_SLOTS = 4  # Shared-memory frame slots per camera client
+
+# Model warm-up (synthetic passes at init, see model_warmup.py)
+WARMUP_ON_INIT = True  # Recognizers are not ready until their models have run once
+WARMUP_RUNS = 3  # Passes per model; the first is the cold one
+PLATE_CROP_SIZE = (200, 50)  # Plate crop (width, height) as it reaches OCR
+ID_CARD_CROP_SIZE = (640, 400)  # Detected ID card (width, height) as it reaches OCR
+
+# Per-stage latency histograms (see pipeline_timing.py; overhead well under 1%)
+PIPELINE_TIMING = True
+
+# Prometheus metrics endpoint (see metrics_server.py; off unless a port is set)
+METRICS_HOST = os.getenv('CAMPUS_METRICS_HOST', '127.0.0.1')  # 0.0.0.0 to let a remote Prometheus scrape
+METRICS_PORT = int(os.getenv('CAMPUS_METRICS_PORT', '0')) or None  # e.g. 9108
+
+# Sampling profiler (see profiling.py; --profile or `kill -USR1 <pid>`)
+PROFILE_DIR = OUTPUT_DIR / "profiles"
+PROFILE_SECONDS = float(os.getenv('CAMPUS_PROFILE_SECONDS', '15'))  # Window captured per trigger
+PROFILE_INTERVAL_MS = float(os.getenv('CAMPUS_PROFILE_INTERVAL_MS', '5'))  # Time between stack samples
+PROFILE_ON_SIGNAL = os.getenv('CAMPUS_PROFILE_SIGNAL', '1') == '1'  # SIGUSR1 starts a capture (POSIX)
+
+# Session logs kept in memory (see ring_buffer.py); older entries spill to disk
+SESSION_BUFFER_SIZE = int(os.getenv('CAMPUS_SESSION_BUFFER_SIZE', '1000'))
+SPILL_DIR = OUTPUT_DIR / "spill"
+SOAK_MAX_SLOPE_MB_PER_HOUR = 10.0  # benchmarks/soak_test.py fails above this RSS growth
+
 # ========================
 # LOGGING SETTINGS
 # ========================
@@ -172,6 +220,9 @@ MIN_OCR_CONFIDENCE = 0.6  # Minimum confidence for OCR
 REQUIRE_BOTH_VERIFICATIONS = True  # Both vehicle and ID must match
 ACCESS_TIME_WINDOW = 30  # Seconds within which both verifications must occur
 MAX_RETRY_ATTEMPTS = 3  # Maximum verification attempts
+REQUIRE_REGISTERED_IDENTITY = True  # Student / vehicle must be in the directory (when a database is used)
+DIRECTORY_REFRESH_INTERVAL = 5  # Seconds between directory cache refreshes
+DIRECTORY_FULL_RELOAD_EVERY = 120  # Refreshes between full reloads (drops deleted rows)
 
 # Alert settings
 SEND_ALERTS = True  # Enable alert system
@@ -185,6 +236,11 @@ ALERT_MULTIPLE_FAILURES = True  # Alert on multiple failed attempts
 # Performance targets (as per problem statement)
 TARGET_ACCURACY = 0.95  # 95% accuracy requirement
 TARGET_RESPONSE_TIME = 2.0  # 2 seconds max response time
+ADAPTIVE_DEGRADATION = True  # Lower recognition quality step by step to hold TARGET_RESPONSE_TIME
+DEGRADE_AT = 0.8  # Step down when p95 decision latency passes this fraction of the target
+RESTORE_BELOW = 0.5  # Step back up when p95 is under this fraction of the target
+DEGRADATION_COOLDOWN = 5  # Seconds between quality steps
+DEGRADATION_IDLE_RESTORE = 30  # Quiet seconds (too few decisions to judge) before stepping back up
 MAX_RECORDS = 5000  # Scalability target: 5000+ records
 
 # Environmental robustness settings
@@ -216,7 +272,8 @@ def get_output_filename(prefix, extension='json'):
 # PRINT CONFIGURATION
 # ========================
 
-if __name__ == "__main__":
+def print_config():
+    """Print the main settings"""
     print("=" * 60)
     print("CAMPUS ACCESS CONTROL SYSTEM - CONFIGURATION")
     print("=" * 60)
@@ -233,3 +290,7 @@ if __name__ == "__main__":
     print(f"\n✅ Target Accuracy: {TARGET_ACCURACY * 100}%")
     print(f"⏱️  Target Response Time: {TARGET_RESPONSE_TIME}s")
     print("=" * 60)
+
+
+if __name__ == "__main__":
+    print_config()
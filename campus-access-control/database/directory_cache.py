@@ -0,0 +1,281 @@
+"""
+Student / Vehicle Directory Cache
+Process-local copy of the students and vehicles tables for access decisions
+Loaded once, then kept fresh by polling updated_at in a background thread,
+so lookups by Moodle ID or plate never wait on a network round trip.
+Polling only sees rows that still exist, so the directory is also rebuilt
+from scratch every few minutes to drop hard-deleted students and vehicles.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+
+# Seconds between incremental refreshes
+DEFAULT_REFRESH_INTERVAL = 5.0
+
+# Incremental refreshes between full reloads (10 minutes at the default
+# interval). Deactivated rows (active = FALSE) drop out on the next refresh;
+# deleted rows only drop out on a full reload.
+DEFAULT_FULL_RELOAD_EVERY = 120
+
+# Re-read rows this far behind the newest updated_at already seen. Postgres
+# stamps CURRENT_TIMESTAMP at transaction start, so a row can commit with a
+# timestamp slightly older than rows that were already visible.
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def canonical_plate(plate):
+    """
+    Canonical form of a license plate used as the lookup key
+
+    OCR output and registrations differ in spacing and punctuation
+    ("MH 01-AB 1234" vs "MH01AB1234"), so only uppercase letters and
+    digits are kept.
+
+    Args:
+        plate (str): Plate text
+
+    Returns:
+        str: Canonical plate ('' for empty input)
+    """
+    return ''.join(ch for ch in str(plate or '').upper() if ch.isalnum())
+
+
+class DirectoryCache:
+    """
+    In-memory directory of students and vehicles with O(1) lookups
+    """
+
+    def __init__(self, db, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 full_reload_every=DEFAULT_FULL_RELOAD_EVERY):
+        """
+        Initialize the cache (call load() or start() to fill it)
+
+        Args:
+            db (StorageBackend): Connected database backend
+            refresh_interval (float): Seconds between incremental refreshes
+            full_reload_every (int): Incremental refreshes between full reloads
+        """
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self.full_reload_every = full_reload_every
+
+        self.students = {}          # moodle_id -> student row
+        self.vehicles = {}          # canonical plate -> vehicle row
+        self.owner_index = {}       # canonical plate -> owner_moodle_id
+        self.plates_by_owner = {}   # owner_moodle_id -> set of canonical plates
+
+        # Newest updated_at seen per table (None until the first load)
+        self._watermarks = {'students': None, 'vehicles': None}
+
+        # Writers hold the lock; single-key reads are atomic dict lookups
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.loaded = False
+        self._refreshes_since_load = 0
+
+        self.stats = {
+            'refreshes': 0,
+            'full_reloads': 0,
+            'refresh_errors': 0,
+            'students_changed': 0,
+            'vehicles_changed': 0,
+            'last_refresh_seconds': 0.0,
+            'last_refresh_time': None,
+            'lookups': 0,
+            'hits': 0
+        }
+
+    def load(self):
+        """
+        Load the full directory
+
+        The indexes are built off to the side and swapped in at once, so
+        rows deleted from the database disappear and lookups never see a
+        half-built directory.
+
+        Returns:
+            bool: True if both tables were read
+        """
+        start = time.perf_counter()
+        students = self.db.get_students_since(None)
+        vehicles = self.db.get_vehicles_since(None)
+        if students is None or vehicles is None:
+            self.stats['refresh_errors'] += 1
+            return False
+
+        fresh_students, fresh_vehicles, owner_index, plates_by_owner = {}, {}, {}, {}
+        for row in students:
+            if row.get('active', True):
+                fresh_students[row['moodle_id']] = row
+        for row in vehicles:
+            self._apply_vehicle(row, fresh_vehicles, owner_index, plates_by_owner)
+
+        with self._lock:
+            self.students = fresh_students
+            self.vehicles = fresh_vehicles
+            self.owner_index = owner_index
+            self.plates_by_owner = plates_by_owner
+            self._watermarks = {'students': None, 'vehicles': None}
+            for row in students:
+                self._advance('students', row)
+            for row in vehicles:
+                self._advance('vehicles', row)
+
+        first = not self.loaded
+        self.loaded = True
+        self._refreshes_since_load = 0
+        self.stats['full_reloads'] += 1
+        self.stats['last_refresh_seconds'] = round(time.perf_counter() - start, 4)
+        self.stats['last_refresh_time'] = time.time()
+        if first:
+            print(f"✅ Directory loaded: {len(self.students)} students, "
+                  f"{len(self.vehicles)} vehicles")
+        return True
+
+    def refresh(self):
+        """
+        Apply rows changed since the last refresh
+
+        Returns:
+            bool: True if the refresh succeeded
+        """
+        start = time.perf_counter()
+        students = self.db.get_students_since(self._since('students'))
+        vehicles = self.db.get_vehicles_since(self._since('vehicles'))
+        if students is None or vehicles is None:
+            self.stats['refresh_errors'] += 1
+            return False
+
+        with self._lock:
+            for row in students:
+                if row.get('active', True):
+                    self.students[row['moodle_id']] = row
+                else:
+                    self.students.pop(row['moodle_id'], None)
+                self._advance('students', row)
+            for row in vehicles:
+                self._apply_vehicle(row)
+                self._advance('vehicles', row)
+
+        self._refreshes_since_load += 1
+        self.stats['refreshes'] += 1
+        self.stats['students_changed'] += len(students)
+        self.stats['vehicles_changed'] += len(vehicles)
+        self.stats['last_refresh_seconds'] = round(time.perf_counter() - start, 4)
+        self.stats['last_refresh_time'] = time.time()
+        return True
+
+    def _since(self, table):
+        """Lower bound for the next incremental query of a table"""
+        watermark = self._watermarks[table]
+        return watermark - REFRESH_OVERLAP if watermark else None
+
+    def _advance(self, table, row):
+        """Move a table's watermark forward to a row's updated_at"""
+        updated_at = row.get('updated_at')
+        if updated_at and (self._watermarks[table] is None or updated_at > self._watermarks[table]):
+            self._watermarks[table] = updated_at
+
+    def _apply_vehicle(self, row, vehicles=None, owner_index=None, plates_by_owner=None):
+        """Store a vehicle row and keep the owner indexes consistent (default: the live indexes)"""
+        vehicles = self.vehicles if vehicles is None else vehicles
+        owner_index = self.owner_index if owner_index is None else owner_index
+        plates_by_owner = self.plates_by_owner if plates_by_owner is None else plates_by_owner
+        plate = canonical_plate(row['license_plate'])
+        previous_owner = owner_index.get(plate)
+        # Inactive rows (placeholders for unregistered plates) are not registered
+        active = row.get('active', True)
+        owner = row.get('owner_moodle_id') if active else None
+
+        if previous_owner and previous_owner != owner:
+            plates = plates_by_owner.get(previous_owner)
+            if plates:
+                plates.discard(plate)
+                if not plates:
+                    del plates_by_owner[previous_owner]
+
+        if active:
+            vehicles[plate] = row
+        else:
+            vehicles.pop(plate, None)
+        if owner:
+            owner_index[plate] = owner
+            plates_by_owner.setdefault(owner, set()).add(plate)
+        else:
+            owner_index.pop(plate, None)
+
+    def _count(self, found):
+        """Lookup counters for the hit rate (approximate under contention)"""
+        self.stats['lookups'] += 1
+        if found is not None:
+            self.stats['hits'] += 1
+        return found
+
+    def get_student(self, moodle_id):
+        """Student row for a Moodle ID (None if not registered)"""
+        return self._count(self.students.get(moodle_id))
+
+    def get_vehicle(self, license_plate):
+        """Vehicle row for a plate in any spacing/case (None if not registered)"""
+        return self._count(self.vehicles.get(canonical_plate(license_plate)))
+
+    def owner_of(self, license_plate):
+        """Owner Moodle ID of a plate (None if unknown or unowned)"""
+        return self._count(self.owner_index.get(canonical_plate(license_plate)))
+
+    def plates_of(self, moodle_id):
+        """Canonical plates registered to a student"""
+        return frozenset(self.plates_by_owner.get(moodle_id, ()))
+
+    def start(self):
+        """Load the directory and keep refreshing it in a background thread"""
+        if not self.loaded:
+            self.load()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='directory-cache', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop background refreshing"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.refresh_interval + 1)
+            self._thread = None
+
+    def _run(self):
+        """Background refresh loop"""
+        failures = 0
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                full = not self.loaded or self._refreshes_since_load >= self.full_reload_every
+                ok = self.load() if full else self.refresh()
+            except Exception:
+                self.stats['refresh_errors'] += 1
+                ok = False
+            failures = 0 if ok else failures + 1
+            if failures == 1:
+                print("⚠️  Directory refresh failed; serving cached entries")
+
+    def get_metrics(self):
+        """
+        Cache size and refresh health
+
+        Returns:
+            dict: students, vehicles, staleness_seconds, hit_rate and the
+                  refresh / lookup counters
+        """
+        last = self.stats['last_refresh_time']
+        lookups = self.stats['lookups']
+        return {
+            'students': len(self.students),
+            'vehicles': len(self.vehicles),
+            'staleness_seconds': round(time.time() - last, 3) if last else None,
+            'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else None,
+            **self.stats
+        }
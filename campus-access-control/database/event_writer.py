@@ -0,0 +1,541 @@
+"""
+Write-Behind Event Writer
+Buffers ID card and vehicle access events and flushes them to Supabase
+in batches from a background thread
+
+Events are buffered either in memory (MemoryEventBuffer) or in a durable
+local SQLite spool (database.local_spool.LocalEventSpool). Every event
+carries a UUID, so a batch that is retried after an ambiguous failure
+never creates duplicate log rows.
+"""
+
+import atexit
+import collections
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from database import partitions
+from database.storage import UNKNOWN_CAMERA
+
+
+# Flush every N events or every T milliseconds, whichever comes first
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL_MS = 500
+
+# Maximum number of events held in memory before producers are blocked
+DEFAULT_MAX_PENDING = 10000
+
+# How long a producer waits for space before the event is dropped (seconds)
+SUBMIT_TIMEOUT = 1.0
+
+# Back-off between failed flush attempts (seconds)
+RETRY_DELAY = 2.0
+
+# Event kinds that insert a log row (the others are student/vehicle upserts
+# and placeholders)
+LOG_KINDS = ('id_card', 'vehicle')
+
+
+class MemoryEventBuffer:
+    """
+    Bounded in-memory FIFO of pending events
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_PENDING):
+        self.max_events = max_events
+        self._events = collections.deque()
+        self._in_flight = 0
+        self._oldest_in_flight = None
+        self._cond = threading.Condition()
+
+    def put(self, event, timeout=SUBMIT_TIMEOUT):
+        """Append an event, waiting up to timeout for space"""
+        with self._cond:
+            has_space = self._cond.wait_for(
+                lambda: len(self._events) + self._in_flight < self.max_events,
+                timeout=timeout
+            )
+            if not has_space:
+                return False
+            self._events.append((time.time(), event))
+            self._cond.notify_all()
+            return True
+
+    def take(self, limit):
+        """Remove up to limit events; they stay counted until ack()"""
+        with self._cond:
+            taken = []
+            while self._events and len(taken) < limit:
+                taken.append(self._events.popleft())
+            if taken:
+                if self._in_flight == 0:
+                    self._oldest_in_flight = taken[0][0]
+                self._in_flight += len(taken)
+            return taken
+
+    def ack(self, tokens):
+        """Mark taken events as written"""
+        with self._cond:
+            self._in_flight -= len(tokens)
+            if self._in_flight == 0:
+                self._oldest_in_flight = None
+            self._cond.notify_all()
+
+    def wait(self, timeout):
+        """Wait for new events to arrive"""
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+
+    def depth(self):
+        """Events not yet written (queued + in flight)"""
+        with self._cond:
+            return len(self._events) + self._in_flight
+
+    def oldest_age(self):
+        """Seconds since the oldest unwritten event was buffered"""
+        with self._cond:
+            oldest = self._oldest_in_flight
+            if oldest is None and self._events:
+                oldest = self._events[0][0]
+        return time.time() - oldest if oldest is not None else 0.0
+
+    def close(self):
+        pass
+
+
+class BatchedEventWriter:
+    """
+    Background writer that batches access log inserts into one transaction
+    """
+
+    def __init__(self, connection_factory, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval_ms=DEFAULT_FLUSH_INTERVAL_MS,
+                 max_pending=DEFAULT_MAX_PENDING, buffer=None):
+        """
+        Initialize the writer and start the flush thread
+
+        Args:
+            connection_factory (callable): Returns a new psycopg2 connection
+            batch_size (int): Flush once this many events are buffered
+            flush_interval_ms (int): Flush at least this often (milliseconds)
+            max_pending (int): Upper bound on buffered events (memory buffer)
+            buffer: Event buffer (default: MemoryEventBuffer(max_pending))
+        """
+        self.connection_factory = connection_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+
+        self.buffer = buffer if buffer is not None else MemoryEventBuffer(max_pending)
+        self.connection = None
+
+        # Monthly partitions known to exist (when the log tables are partitioned)
+        self.partitioned = None
+        self._partition_months = set()
+
+        self._stop = threading.Event()
+        self._flush_requested = threading.Event()
+        self._flushed = threading.Condition()
+        self._last_sync = None
+
+        self.stats = {
+            'events_submitted': 0,
+            'events_written': 0,
+            'events_duplicate': 0,
+            'events_rejected': 0,
+            'events_dropped': 0,
+            'batches_flushed': 0,
+            'flush_errors': 0,
+            'last_flush_seconds': 0.0
+        }
+
+        self._thread = threading.Thread(
+            target=self._run, name='db-event-writer', daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit_id_card(self, moodle_id, name, department=None, confidence=None,
+                       camera_id=None, frame_path=None, status='allowed'):
+        """Queue an ID card access event"""
+        row = (moodle_id, name, department, confidence, camera_id,
+               frame_path, status, datetime.now())
+        return self._submit('id_card', row)
+
+    def submit_vehicle(self, license_plate, confidence=None, camera_id=None,
+                       frame_path=None, status='allowed'):
+        """Queue a vehicle access event"""
+        row = (license_plate, confidence, camera_id, frame_path, status,
+               datetime.now())
+        return self._submit('vehicle', row)
+
+    def submit_student(self, moodle_id, name, department=None, photo_path=None,
+                       card_image_path=None):
+        """Queue a student upsert (used while the database is unreachable)"""
+        return self._submit('student_upsert',
+                            (moodle_id, name, department, photo_path, card_image_path))
+
+    def submit_vehicle_registration(self, license_plate, owner_moodle_id=None,
+                                    vehicle_type=None, color=None, model=None):
+        """Queue a vehicle upsert (used while the database is unreachable)"""
+        return self._submit('vehicle_upsert',
+                            (license_plate, owner_moodle_id, vehicle_type, color, model))
+
+    def submit_student_placeholder(self, moodle_id, name):
+        """Queue an insert-if-absent placeholder student (see StorageBackend.ensure_student)"""
+        return self._submit('student_placeholder', (moodle_id, name))
+
+    def submit_vehicle_placeholder(self, license_plate):
+        """Queue an insert-if-absent placeholder vehicle"""
+        return self._submit('vehicle_placeholder', (license_plate,))
+
+    def _submit(self, kind, row):
+        """
+        Put an event on the buffer
+
+        Returns:
+            bool: True if the event was accepted
+        """
+        if self._stop.is_set():
+            return False
+
+        if not self.buffer.put((str(uuid.uuid4()), kind, row)):
+            self.stats['events_dropped'] += 1
+            print(f"⚠️  Event buffer full, dropped {kind} event")
+            return False
+
+        self.stats['events_submitted'] += 1
+        if self.buffer.depth() >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    def flush(self, timeout=10.0):
+        """
+        Block until the buffer has been fully written
+
+        Args:
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            bool: True if the buffer was fully flushed
+        """
+        self._flush_requested.set()
+        with self._flushed:
+            self._flushed.wait_for(
+                lambda: self.buffer.depth() == 0 or not self._thread.is_alive(),
+                timeout=timeout
+            )
+        return self.buffer.depth() == 0
+
+    def get_metrics(self):
+        """
+        Buffer depth, sync lag and write counters
+
+        Returns:
+            dict: spool_depth, sync_lag_seconds (age of the oldest unwritten
+                event), seconds_since_last_sync and the writer stats
+        """
+        metrics = {
+            'buffer': type(self.buffer).__name__,
+            'spool_depth': self.buffer.depth(),
+            'sync_lag_seconds': round(self.buffer.oldest_age(), 3),
+            'seconds_since_last_sync': (
+                round(time.time() - self._last_sync, 3) if self._last_sync else None
+            )
+        }
+        metrics.update(self.stats)
+        return metrics
+
+    def close(self, timeout=10.0):
+        """Flush remaining events and stop the writer thread"""
+        if self._stop.is_set():
+            return
+
+        self._stop.set()
+        self._flush_requested.set()
+        self._thread.join(timeout=timeout)
+
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+        pending = self.buffer.depth()
+        self.buffer.close()
+        if pending:
+            print(f"⚠️  Event writer stopped with {pending} unwritten events")
+
+    def _collect(self):
+        """Gather events until the batch is full, a flush is requested or the interval elapses"""
+        deadline = time.monotonic() + self.flush_interval
+        batch = []
+
+        while len(batch) < self.batch_size:
+            batch.extend(self.buffer.take(self.batch_size - len(batch)))
+            if len(batch) >= self.batch_size or self._flush_requested.is_set():
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.buffer.wait(min(remaining, 0.05))
+
+        self._flush_requested.clear()
+        return batch
+
+    def _run(self):
+        """Flush loop: collect a batch, write it, repeat"""
+        batch = []
+        failures = 0
+
+        while True:
+            if not batch:
+                batch = self._collect()
+
+            if batch:
+                error = self._write_batch([event for _, event in batch])
+                if error is None:
+                    self.buffer.ack(batch)
+                    self._last_sync = time.time()
+                    batch = []
+                    failures = 0
+                    with self._flushed:
+                        self._flushed.notify_all()
+                else:
+                    failures += 1
+                    if failures == 1 or failures % 30 == 0:
+                        print(f"❌ Error flushing access events "
+                              f"(attempt {failures}, {self.buffer.depth()} pending): {error}")
+                    if self._stop.wait(RETRY_DELAY) and failures >= 3:
+                        # Database unreachable during shutdown: give up on the rest
+                        break
+
+            if self._stop.is_set() and not batch and self.buffer.depth() == 0:
+                break
+
+        with self._flushed:
+            self._flushed.notify_all()
+
+    def _connect(self):
+        """(Re)open the writer connection and detect partitioned log tables"""
+        if self.connection is None or self.connection.closed:
+            self.connection = self.connection_factory()
+            self.partitioned = None
+
+        if self.partitioned is None:
+            self.partitioned = all(
+                partitions.is_partitioned(self.connection, table)
+                for table in partitions.LOG_TABLES
+            )
+
+    def _write_batch(self, batch):
+        """
+        Write one batch of events and the matching counters in a single transaction
+
+        If a row violates a constraint (e.g. a log for an unknown student),
+        the batch is retried row by row and only the offending events are
+        rejected, so one bad event cannot block the rest.
+
+        Args:
+            batch (list): [(event_id, kind, row), ...]
+
+        Returns:
+            Exception: None if the transaction committed
+        """
+        start = time.perf_counter()
+        try:
+            self._connect()
+
+            # Events may fall in a month nobody has created a partition for yet
+            if self.partitioned:
+                new_months = {
+                    partitions.month_start(row[-1])
+                    for _, kind, row in batch if kind in LOG_KINDS
+                } - self._partition_months
+                if new_months:
+                    partitions.ensure_partitions(self.connection, new_months)
+                    self.connection.commit()
+                    self._partition_months |= new_months
+
+            with self.connection.cursor() as cursor:
+                try:
+                    written, counters = self._apply(cursor, batch)
+                    rejected = 0
+                except (psycopg2.IntegrityError, psycopg2.DataError):
+                    self.connection.rollback()
+                    written, counters, rejected = self._apply_one_by_one(cursor, batch)
+
+                self._apply_counters(cursor, counters)
+
+            self.connection.commit()
+
+        except Exception as e:
+            self.stats['flush_errors'] += 1
+            try:
+                self.connection.rollback()
+            except Exception:
+                self.connection = None
+            return e
+
+        logs = sum(1 for _, kind, _ in batch if kind in LOG_KINDS)
+        self.stats['events_written'] += written
+        self.stats['events_duplicate'] += max(logs - written - rejected, 0)
+        self.stats['events_rejected'] += rejected
+        self.stats['batches_flushed'] += 1
+        self.stats['last_flush_seconds'] = round(time.perf_counter() - start, 4)
+        return None
+
+    def _apply_one_by_one(self, cursor, batch):
+        """Write events individually inside savepoints, skipping ones that fail"""
+        written = 0
+        rejected = 0
+        counters = collections.Counter()
+
+        for event in batch:
+            cursor.execute("SAVEPOINT event;")
+            try:
+                count, event_counters = self._apply(cursor, [event])
+                written += count
+                counters.update(event_counters)
+                cursor.execute("RELEASE SAVEPOINT event;")
+            except (psycopg2.IntegrityError, psycopg2.DataError) as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT event;")
+                rejected += 1
+                print(f"⚠️  Rejected {event[1]} event {event[0]}: {str(e).splitlines()[0]}")
+
+        return written, counters, rejected
+
+    def _apply(self, cursor, batch):
+        """
+        Execute the upserts and inserts for a list of events
+
+        Returns:
+            tuple: (log rows inserted, Counter of (bucket, camera, kind) -> count)
+        """
+        # Later upserts of the same key win, as with sequential insert_* calls
+        students = {}
+        vehicles = {}
+        student_placeholders = {}
+        vehicle_placeholders = {}
+        id_card_rows = []
+        vehicle_rows = []
+        for event_id, kind, row in batch:
+            if kind == 'student_upsert':
+                students[row[0]] = row
+            elif kind == 'vehicle_upsert':
+                vehicles[row[0]] = row
+            elif kind == 'student_placeholder':
+                student_placeholders.setdefault(row[0], tuple(row))
+            elif kind == 'vehicle_placeholder':
+                vehicle_placeholders.setdefault(row[0], tuple(row))
+            elif kind == 'id_card':
+                id_card_rows.append(tuple(row) + (event_id,))
+            elif kind == 'vehicle':
+                vehicle_rows.append(tuple(row) + (event_id,))
+
+        if students:
+            execute_values(cursor, """
+                INSERT INTO students (moodle_id, name, department, photo_path, card_image_path)
+                VALUES %s
+                ON CONFLICT (moodle_id)
+                DO UPDATE SET
+                    name = EXCLUDED.name,
+                    department = EXCLUDED.department,
+                    photo_path = EXCLUDED.photo_path,
+                    card_image_path = EXCLUDED.card_image_path,
+                    active = TRUE,
+                    updated_at = CURRENT_TIMESTAMP;
+            """, list(students.values()), page_size=self.batch_size)
+
+        if vehicles:
+            execute_values(cursor, """
+                INSERT INTO vehicles (license_plate, owner_moodle_id, vehicle_type, color, model)
+                VALUES %s
+                ON CONFLICT (license_plate)
+                DO UPDATE SET
+                    owner_moodle_id = EXCLUDED.owner_moodle_id,
+                    vehicle_type = EXCLUDED.vehicle_type,
+                    color = EXCLUDED.color,
+                    model = EXCLUDED.model,
+                    active = TRUE,
+                    updated_at = CURRENT_TIMESTAMP;
+            """, list(vehicles.values()), page_size=self.batch_size)
+
+        # Placeholders never touch existing (or just upserted) rows
+        if student_placeholders:
+            execute_values(cursor, """
+                INSERT INTO students (moodle_id, name, active)
+                VALUES %s
+                ON CONFLICT (moodle_id) DO NOTHING;
+            """, list(student_placeholders.values()), template="(%s, %s, FALSE)",
+                page_size=self.batch_size)
+
+        if vehicle_placeholders:
+            execute_values(cursor, """
+                INSERT INTO vehicles (license_plate, active)
+                VALUES %s
+                ON CONFLICT (license_plate) DO NOTHING;
+            """, list(vehicle_placeholders.values()), template="(%s, FALSE)",
+                page_size=self.batch_size)
+
+        # Only rows actually inserted are counted, so replays never double count
+        counters = collections.Counter()
+        written = 0
+
+        if id_card_rows:
+            inserted = execute_values(cursor, """
+                INSERT INTO id_card_logs
+                (moodle_id, name, department, confidence_score, camera_id,
+                 frame_path, status, access_time, event_id)
+                VALUES %s
+                ON CONFLICT (event_id, access_time) DO NOTHING
+                RETURNING camera_id, access_time;
+            """, id_card_rows, page_size=self.batch_size, fetch=True)
+            for camera_id, access_time in inserted:
+                counters[(access_time.replace(second=0, microsecond=0),
+                          camera_id or UNKNOWN_CAMERA, 'id_card')] += 1
+            written += len(inserted)
+
+        if vehicle_rows:
+            inserted = execute_values(cursor, """
+                INSERT INTO vehicle_logs
+                (license_plate, confidence_score, camera_id, frame_path,
+                 status, access_time, event_id)
+                VALUES %s
+                ON CONFLICT (event_id, access_time) DO NOTHING
+                RETURNING camera_id, access_time;
+            """, vehicle_rows, page_size=self.batch_size, fetch=True)
+            for camera_id, access_time in inserted:
+                counters[(access_time.replace(second=0, microsecond=0),
+                          camera_id or UNKNOWN_CAMERA, 'vehicle')] += 1
+            written += len(inserted)
+
+        return written, counters
+
+    def _apply_counters(self, cursor, counters):
+        """Upsert per-camera, per-minute counters for the inserted log rows"""
+        shards = {}
+        for (bucket, camera_id, kind), count in counters.items():
+            counts = shards.setdefault((bucket, camera_id), [0, 0])
+            counts[0 if kind == 'id_card' else 1] += count
+
+        if not shards:
+            return
+
+        # Sorted so concurrent writers lock counter rows in the same order
+        execute_values(cursor, """
+            INSERT INTO access_counters
+            (bucket, camera_id, id_card_entries, vehicle_entries)
+            VALUES %s
+            ON CONFLICT (bucket, camera_id)
+            DO UPDATE SET
+                id_card_entries = access_counters.id_card_entries + EXCLUDED.id_card_entries,
+                vehicle_entries = access_counters.vehicle_entries + EXCLUDED.vehicle_entries;
+        """, [(bucket, camera_id, ids, vehicles)
+              for (bucket, camera_id), (ids, vehicles) in sorted(shards.items())])
@@ -0,0 +1,149 @@
+"""
+Local Event Spool
+Durable SQLite write-ahead buffer for access events
+Accepts events even when Supabase is unreachable; the BatchedEventWriter
+drains it to Postgres in batches once the connection is back
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_SPOOL_PATH = Path(__file__).resolve().parent.parent / "outputs" / "event_spool.db"
+
+# Upper bound on spooled events (roughly 300 bytes each on disk)
+DEFAULT_MAX_SPOOLED = 1000000
+
+
+class LocalEventSpool:
+    """
+    SQLite-backed FIFO with the same interface as MemoryEventBuffer
+    """
+
+    def __init__(self, path=DEFAULT_SPOOL_PATH, max_events=DEFAULT_MAX_SPOOLED):
+        """
+        Open (or create) the spool database
+
+        Args:
+            path (str): SQLite file path
+            max_events (int): Events kept before new ones are refused
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_events = max_events
+
+        self._lock = threading.Lock()
+        self._new_event = threading.Condition(self._lock)
+
+        # Autocommit; WAL + synchronous=NORMAL keeps appends well under a millisecond
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL;")
+        self._db.execute("PRAGMA synchronous=NORMAL;")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS spooled_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+        """)
+
+        self._depth = self._db.execute("SELECT COUNT(*) FROM spooled_events;").fetchone()[0]
+        self._taken_seq = 0
+
+        if self._depth:
+            print(f"📦 Event spool has {self._depth} unsynced events from a previous run")
+
+    def put(self, event, timeout=None):
+        """
+        Append an event
+
+        Args:
+            event (tuple): (event_id, kind, row)
+
+        Returns:
+            bool: False if the spool is full
+        """
+        event_id, kind, row = event
+        payload = json.dumps([
+            {'$dt': value.isoformat()} if isinstance(value, datetime) else value
+            for value in row
+        ])
+        with self._lock:
+            if self._depth >= self.max_events:
+                return False
+            self._db.execute(
+                "INSERT INTO spooled_events (event_id, kind, payload, created_at) "
+                "VALUES (?, ?, ?, ?);",
+                (event_id, kind, payload, time.time())
+            )
+            self._depth += 1
+            self._new_event.notify_all()
+        return True
+
+    def take(self, limit):
+        """
+        Read the next events after the ones already handed out
+
+        Events stay in the spool until ack(), so a crash before the write
+        commits replays them on the next start.
+
+        Returns:
+            list: [(seq, (event_id, kind, row)), ...]
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, event_id, kind, payload FROM spooled_events "
+                "WHERE seq > ? ORDER BY seq LIMIT ?;",
+                (self._taken_seq, limit)
+            ).fetchall()
+            if rows:
+                self._taken_seq = rows[-1][0]
+
+        return [(seq, (event_id, kind, self._decode(payload)))
+                for seq, event_id, kind, payload in rows]
+
+    def ack(self, tokens):
+        """Delete events that were written to Postgres"""
+        seqs = [(seq,) for seq, _ in tokens]
+        with self._lock:
+            self._db.execute("BEGIN;")
+            self._db.executemany("DELETE FROM spooled_events WHERE seq = ?;", seqs)
+            self._db.execute("COMMIT;")
+            self._depth -= len(seqs)
+
+    def wait(self, timeout):
+        """Wait for a new event to be appended"""
+        with self._lock:
+            self._new_event.wait(timeout)
+
+    def depth(self):
+        """Events not yet synced"""
+        return self._depth
+
+    def oldest_age(self):
+        """Seconds since the oldest unsynced event was spooled"""
+        with self._lock:
+            oldest = self._db.execute(
+                "SELECT created_at FROM spooled_events ORDER BY seq LIMIT 1;"
+            ).fetchone()
+        return time.time() - oldest[0] if oldest else 0.0
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _decode(payload):
+        """Restore datetimes encoded by put()"""
+        return tuple(
+            datetime.fromisoformat(value['$dt']) if isinstance(value, dict) else value
+            for value in json.loads(payload)
+        )
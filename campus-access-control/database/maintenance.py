@@ -0,0 +1,65 @@
+"""
+Database Maintenance Job
+Creates upcoming log partitions, rolls up statistics and applies retention
+Run once a day (cron / Task Scheduler): python database/maintenance.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running this file directly
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from database.supabase_manager import (
+    SupabaseManager, LOG_PARTITION_MONTHS_AHEAD, LOG_RETENTION_MONTHS, COUNTER_RETENTION_DAYS
+)
+
+
+def run_maintenance(months_ahead=LOG_PARTITION_MONTHS_AHEAD, retain_months=LOG_RETENTION_MONTHS,
+                    counter_retention_days=COUNTER_RETENTION_DAYS):
+    """
+    Run all periodic database housekeeping
+
+    Args:
+        months_ahead (int): Log partitions to create past the current month
+        retain_months (int): Months of access logs to keep
+        counter_retention_days (int): Days of per-minute counters to keep
+
+    Returns:
+        bool: True if the job ran
+    """
+    db = SupabaseManager()
+    if not db.connect():
+        return False
+
+    try:
+        db.create_tables()
+        if db.partitioned_logs:
+            db.ensure_log_partitions(months_ahead=months_ahead)
+        dropped = db.apply_retention(
+            retain_months=retain_months,
+            counter_retention_days=counter_retention_days
+        )
+        for name in dropped:
+            print(f"   🗑️  {name}")
+        return True
+    finally:
+        db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Campus access database maintenance')
+    parser.add_argument('--months-ahead', type=int, default=LOG_PARTITION_MONTHS_AHEAD,
+                        help=f'Log partitions to pre-create (default: {LOG_PARTITION_MONTHS_AHEAD})')
+    parser.add_argument('--retain-months', type=int, default=LOG_RETENTION_MONTHS,
+                        help=f'Months of access logs to keep (default: {LOG_RETENTION_MONTHS})')
+    parser.add_argument('--counter-days', type=int, default=COUNTER_RETENTION_DAYS,
+                        help=f'Days of per-minute counters to keep (default: {COUNTER_RETENTION_DAYS})')
+    args = parser.parse_args()
+
+    ok = run_maintenance(args.months_ahead, args.retain_months, args.counter_days)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
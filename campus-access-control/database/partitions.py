@@ -0,0 +1,128 @@
+"""
+Monthly Partition Helpers
+Creates and drops monthly range partitions of the access log tables
+Partition names follow <table>_yYYYYmMM, e.g. vehicle_logs_y2025m10
+"""
+
+import re
+from datetime import date, datetime
+
+
+# Access log tables that can be range-partitioned on access_time
+LOG_TABLES = ('id_card_logs', 'vehicle_logs')
+
+PARTITION_NAME_PATTERN = re.compile(r'^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$')
+
+
+def month_start(value):
+    """First day of the month containing value (date or datetime)"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    """Shift a month start date by count months"""
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    """Partition table name for a month"""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(connection, table):
+    """Check whether a table exists as a partitioned (parent) table"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relkind = 'p'
+            FROM pg_class c
+            WHERE c.oid = to_regclass(%s);
+        """, (table,))
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def ensure_partitions(connection, months, tables=LOG_TABLES):
+    """
+    Create monthly partitions if they do not exist yet
+
+    Runs in the caller's transaction; the caller commits.
+
+    Args:
+        connection: psycopg2 connection
+        months (iterable): Dates/datetimes inside each month to cover
+        tables (tuple): Partitioned parent tables
+
+    Returns:
+        set: Month start dates that are now covered
+    """
+    covered = set()
+    with connection.cursor() as cursor:
+        for month in sorted({month_start(m) for m in months}):
+            upper = add_months(month, 1)
+            for table in tables:
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {partition_name(table, month)}
+                    PARTITION OF {table}
+                    FOR VALUES FROM (%s) TO (%s);
+                """, (month, upper))
+            covered.add(month)
+    return covered
+
+
+def list_partitions(connection, table):
+    """
+    List monthly partitions attached to a table
+
+    Returns:
+        list: [(partition_name, month_start), ...] sorted by month
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.oid = to_regclass(%s);
+        """, (table,))
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match and match.group('table') == table:
+            month = date(int(match.group('year')), int(match.group('month')), 1)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def drop_partitions_before(connection, cutoff, tables=LOG_TABLES):
+    """
+    Drop whole monthly partitions that end on or before the cutoff month
+
+    Dropping a partition is a metadata operation, so retention costs the
+    same no matter how many rows the month holds.
+
+    Args:
+        connection: psycopg2 connection
+        cutoff (date): Months starting before month_start(cutoff) are dropped
+        tables (tuple): Partitioned parent tables
+
+    Returns:
+        list: Names of dropped partitions
+    """
+    cutoff = month_start(cutoff)
+    dropped = []
+    with connection.cursor() as cursor:
+        for table in tables:
+            for name, month in list_partitions(connection, table):
+                if month < cutoff:
+                    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name};")
+                    cursor.execute(f"DROP TABLE {name};")
+                    dropped.append(name)
+    return dropped
+
+
+def current_month():
+    """Month start for the local current date"""
+    return month_start(datetime.now())
@@ -0,0 +1,228 @@
+"""
+Storage Backend Interface
+Common interface for the access control database backends
+- postgres: SupabaseManager (remote Supabase / any Postgres)
+- sqlite:   SQLiteManager (embedded file, no server needed)
+"""
+
+import abc
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Backend used by create_storage() when none is given: postgres | sqlite
+STORAGE_BACKEND = os.getenv("CAMPUS_DB_BACKEND", "postgres").lower()
+
+# Database file for the embedded SQLite backend
+SQLITE_DB_PATH = os.getenv(
+    "CAMPUS_SQLITE_PATH",
+    str(Path(__file__).resolve().parent.parent / "outputs" / "campus_access.db")
+)
+
+STORAGE_BACKENDS = ('postgres', 'sqlite')
+
+# Counter shard used for events logged without a camera ID
+UNKNOWN_CAMERA = 'unknown'
+
+# Column limits enforced by every backend (VARCHAR sizes in the Postgres schema)
+MAX_MOODLE_ID_LENGTH = 20
+MAX_NAME_LENGTH = 100
+
+
+class StorageBackend(abc.ABC):
+    """
+    Base class for access control storage backends
+
+    Backends return rows as dicts with the same keys, and datetimes /
+    dates as Python objects, so callers never need to know which one
+    they are talking to.
+    """
+
+    backend_name = None
+
+    @abc.abstractmethod
+    def connect(self):
+        """Open the database; returns True on success"""
+
+    @abc.abstractmethod
+    def disconnect(self):
+        """Close the database"""
+
+    @property
+    @abc.abstractmethod
+    def is_connected(self):
+        """True if the backend can serve queries"""
+
+    @abc.abstractmethod
+    def create_tables(self):
+        """Create all required tables; returns True on success"""
+
+    @abc.abstractmethod
+    def insert_student(self, moodle_id, name, department=None, photo_path=None, card_image_path=None):
+        """Insert or update a student; returns the row id or None"""
+
+    @abc.abstractmethod
+    def insert_vehicle(self, license_plate, owner_moodle_id=None, vehicle_type=None, color=None, model=None):
+        """Insert or update a vehicle; returns the row id or None"""
+
+    @abc.abstractmethod
+    def ensure_student(self, moodle_id, name=None):
+        """
+        Make sure an ID card log can reference a Moodle ID
+
+        Creates an inactive placeholder (active = FALSE) for an unknown ID and
+        leaves an existing row untouched, so recognition events never change
+        or register students.
+        """
+
+    @abc.abstractmethod
+    def ensure_vehicle(self, license_plate):
+        """Same as ensure_student for vehicle logs"""
+
+    @abc.abstractmethod
+    def log_id_card_access(self, moodle_id, name, department=None, confidence=None,
+                           camera_id=None, frame_path=None, status='allowed'):
+        """Log an ID card access event"""
+
+    @abc.abstractmethod
+    def log_vehicle_access(self, license_plate, confidence=None, camera_id=None,
+                           frame_path=None, status='allowed'):
+        """Log a vehicle access event"""
+
+    @abc.abstractmethod
+    def get_student(self, moodle_id):
+        """Get student details by Moodle ID (dict or None)"""
+
+    @abc.abstractmethod
+    def get_vehicle(self, license_plate):
+        """Get vehicle details with owner_name / owner_department (dict or None)"""
+
+    @abc.abstractmethod
+    def get_students_since(self, since=None):
+        """Students with updated_at at or after since, oldest first (None on error)"""
+
+    @abc.abstractmethod
+    def get_vehicles_since(self, since=None):
+        """Vehicles with updated_at at or after since, oldest first (None on error)"""
+
+    @abc.abstractmethod
+    def get_recent_id_card_logs(self, limit=10, since=None):
+        """Most recent ID card logs first (list of dicts)"""
+
+    @abc.abstractmethod
+    def get_recent_vehicle_logs(self, limit=10, since=None):
+        """Most recent vehicle logs first (list of dicts)"""
+
+    @abc.abstractmethod
+    def get_today_statistics(self):
+        """
+        Get today's access statistics
+
+        "Today" is the calling host's date, the clock that stamps access_time.
+
+        Returns:
+            dict: id (access_statistics row of the day, None until it is
+                  rolled up), date, id_card_entries, vehicle_entries,
+                  total_entries (None when nothing was logged today)
+        """
+
+    @abc.abstractmethod
+    def bulk_import_students(self, records):
+        """
+        Upsert many students from batch processing records
+
+        Returns:
+            dict: {'inserted': int, 'updated': int, 'skipped': int}
+        """
+
+    def enable_write_behind(self, **options):
+        """Buffer access logs in the background (backends that benefit from it)"""
+        return None
+
+    def get_sync_metrics(self):
+        """Write-behind metrics; empty when writes are synchronous"""
+        return {}
+
+    def flush(self, timeout=10.0):
+        """Wait until buffered writes are stored"""
+        return True
+
+    def bulk_import_students_from_json(self, json_path):
+        """Import students from batch processing JSON"""
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            report = self.bulk_import_students(data)
+            if report is None:
+                return 0
+
+            imported = report['inserted'] + report['updated']
+            print(f"✅ Imported {imported} students from {json_path} "
+                  f"({report['inserted']} new, {report['updated']} updated, "
+                  f"{report['skipped']} skipped)")
+            return imported
+
+        except Exception as e:
+            print(f"❌ Error importing students: {e}")
+            return 0
+
+
+def student_import_rows(records):
+    """
+    Select the batch processing records a bulk import can store
+
+    Args:
+        records (list): Batch processing records (dicts)
+
+    Returns:
+        list: (moodle_id, name, department, card_image_path) in input order
+    """
+    rows = []
+    for record in records:
+        moodle_id = record.get('moodle_id')
+        name = record.get('name')
+        if not (record.get('success') and moodle_id and name):
+            continue
+        if len(str(moodle_id)) > MAX_MOODLE_ID_LENGTH or len(name) > MAX_NAME_LENGTH:
+            continue
+        rows.append((moodle_id, name, record.get('department'), record.get('image_path')))
+    return rows
+
+
+def day_start(day):
+    """Midnight at the start of a date, for bounding TIMESTAMP columns"""
+    return datetime(day.year, day.month, day.day)
+
+
+def create_storage(backend=None, sqlite_path=None):
+    """
+    Create the configured storage backend (not yet connected)
+
+    Backend modules are imported on demand, so the SQLite backend works
+    on machines without psycopg2.
+
+    Args:
+        backend (str): 'postgres' or 'sqlite' (default: CAMPUS_DB_BACKEND env)
+        sqlite_path (str): Database file for the SQLite backend
+
+    Returns:
+        StorageBackend: Backend instance
+    """
+    backend = (backend or STORAGE_BACKEND).lower()
+
+    if backend == 'sqlite':
+        from database.sqlite_manager import SQLiteManager
+        return SQLiteManager(sqlite_path or SQLITE_DB_PATH)
+
+    if backend == 'postgres':
+        from database.supabase_manager import SupabaseManager
+        return SupabaseManager()
+
+    raise ValueError(f"Unknown storage backend '{backend}' (expected one of {STORAGE_BACKENDS})")
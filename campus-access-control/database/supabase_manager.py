@@ -7,24 +7,59 @@ Stores ID card data, vehicle plates, and access logs
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
+import csv
+import io
 import os
-from datetime import datetime
+import sys
+from datetime import date, datetime, timedelta
 from pathlib import Path
-import json
+
+# Allow running this file directly as well as importing it as database.supabase_manager
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from database.event_writer import BatchedEventWriter
+from database.local_spool import LocalEventSpool
+from database import partitions
+from database.storage import (StorageBackend, UNKNOWN_CAMERA, MAX_NAME_LENGTH, day_start,
+                              student_import_rows)
 
 # Load environment variables
 load_dotenv()
 
+# Entities remembered per session to skip redundant upserts
+MAX_SEEN_ENTITIES = 50000
+
+# Monthly range partitioning of id_card_logs / vehicle_logs (new databases only)
+PARTITION_LOGS = os.getenv("SUPABASE_PARTITION_LOGS", "false").lower() in ("1", "true", "yes")
+LOG_PARTITION_MONTHS_AHEAD = 2    # Partitions created ahead of the current month
+LOG_RETENTION_MONTHS = 12         # Months of access logs kept by apply_retention
+COUNTER_RETENTION_DAYS = 35       # Days of per-minute counters kept after rollup
+
+
+def local_utc_offset():
+    """This host's current UTC offset as '+HH:MM' (e.g. '+05:30' for IST)"""
+    minutes = int(datetime.now().astimezone().utcoffset().total_seconds() // 60)
+    sign = '-' if minutes < 0 else '+'
+    return f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+
 
-class SupabaseManager:
+class SupabaseManager(StorageBackend):
     """
     Manages Supabase database connections and operations
     """
     
+    backend_name = 'postgres'
+    
     def __init__(self):
         """Initialize database connection"""
         self.connection = None
         self.cursor = None
+        self.writer = None
+        self.partitioned_logs = False
+        self._partition_months = set()
+        
+        # Students / vehicles already upserted this session: key -> (values, id)
+        self._seen_students = {}
+        self._seen_vehicles = {}
         
         # Load credentials
         self.user = os.getenv("SUPABASE_USER")
@@ -40,13 +75,7 @@ class SupabaseManager:
     def connect(self):
         """Connect to Supabase database"""
         try:
-            self.connection = psycopg2.connect(
-                user=self.user,
-                password=self.password,
-                host=self.host,
-                port=self.port,
-                dbname=self.dbname
-            )
+            self.connection = self._open_connection()
             self.cursor = self.connection.cursor(cursor_factory=RealDictCursor)
             print("✅ Connected to Supabase database")
             return True
@@ -55,16 +84,104 @@ class SupabaseManager:
             print(f"❌ Failed to connect to Supabase: {e}")
             return False
     
+    def _open_connection(self):
+        """Open a new psycopg2 connection with the configured credentials"""
+        connection = psycopg2.connect(
+            user=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            dbname=self.dbname
+        )
+        # TIMESTAMP columns hold the gates' local time (access_time is stamped
+        # by the caller, as on SQLite). Run the session in the same zone so
+        # CURRENT_TIMESTAMP defaults (created_at, updated_at) agree instead
+        # of following the server's zone (UTC on Supabase). The offset is
+        # taken when the connection opens.
+        with connection.cursor() as cursor:
+            cursor.execute("SET TIME ZONE INTERVAL %s HOUR TO MINUTE;", (local_utc_offset(),))
+        connection.commit()
+        return connection
+    
+    def enable_write_behind(self, batch_size=None, flush_interval_ms=None, max_pending=None,
+                            spool_path=None):
+        """
+        Route log_*_access calls through a background batched writer
+        
+        Events are buffered and written with execute_values in one
+        transaction every batch_size events or flush_interval_ms milliseconds.
+        The writer uses its own connection so reads on this manager never
+        wait behind a flush.
+        
+        With spool_path, events go to a local SQLite spool first: they are
+        accepted even when Supabase is down (or connect() failed) and synced
+        once the database is reachable again.
+        
+        Args:
+            batch_size (int): Events per flush (default: 100)
+            flush_interval_ms (int): Maximum delay before a flush (default: 500)
+            max_pending (int): Maximum buffered events in memory (default: 10000)
+            spool_path (str): SQLite spool file for offline-first logging
+        """
+        if self.writer:
+            return self.writer
+        
+        options = {
+            'batch_size': batch_size,
+            'flush_interval_ms': flush_interval_ms,
+            'max_pending': max_pending
+        }
+        buffer = LocalEventSpool(spool_path) if spool_path else None
+        self.writer = BatchedEventWriter(
+            self._open_connection,
+            buffer=buffer,
+            **{key: value for key, value in options.items() if value is not None}
+        )
+        print(f"✅ Write-behind logging enabled (batch: {self.writer.batch_size}, "
+              f"interval: {int(self.writer.flush_interval * 1000)}ms"
+              f"{', spool: ' + str(spool_path) if spool_path else ''})")
+        return self.writer
+    
+    @property
+    def is_connected(self):
+        """True if the manager holds an open connection for queries"""
+        return self.connection is not None and not self.connection.closed
+    
+    def get_sync_metrics(self):
+        """
+        Write-behind metrics: spool depth, sync lag and write counters
+        
+        Returns:
+            dict: Empty when write-behind is not enabled
+        """
+        return self.writer.get_metrics() if self.writer else {}
+    
+    def flush(self, timeout=10.0):
+        """Wait until all buffered access events are written"""
+        if self.writer:
+            return self.writer.flush(timeout=timeout)
+        return True
+    
     def disconnect(self):
         """Close database connection"""
+        if self.writer:
+            self.writer.close()
+            self.writer = None
         if self.cursor:
             self.cursor.close()
         if self.connection:
             self.connection.close()
         print("🔌 Disconnected from database")
     
-    def create_tables(self):
-        """Create all required tables for campus access control"""
+    def create_tables(self, partition_logs=None):
+        """
+        Create all required tables for campus access control
+        
+        Args:
+            partition_logs (bool): Range-partition the access log tables by
+                month on access_time (default: SUPABASE_PARTITION_LOGS env).
+                Only applies when the log tables do not exist yet.
+        """
         try:
             # Students table
             self.cursor.execute("""
@@ -75,6 +192,7 @@ class SupabaseManager:
                     department VARCHAR(100),
                     photo_path TEXT,
                     card_image_path TEXT,
+                    active BOOLEAN NOT NULL DEFAULT TRUE,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
@@ -89,42 +207,66 @@ class SupabaseManager:
                     vehicle_type VARCHAR(50),
                     color VARCHAR(50),
                     model VARCHAR(100),
+                    active BOOLEAN NOT NULL DEFAULT TRUE,
                     registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (owner_moodle_id) REFERENCES students(moodle_id)
                 );
             """)
             
+            if partition_logs is None:
+                partition_logs = PARTITION_LOGS
+            
+            # Partitioned tables need access_time in the primary key
+            log_key = "PRIMARY KEY (id, access_time)" if partition_logs else "PRIMARY KEY (id)"
+            log_partitioning = "PARTITION BY RANGE (access_time)" if partition_logs else ""
+            
             # ID card access logs
-            self.cursor.execute("""
+            self.cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS id_card_logs (
-                    id SERIAL PRIMARY KEY,
+                    id SERIAL,
                     moodle_id VARCHAR(20),
                     name VARCHAR(100),
                     department VARCHAR(100),
                     confidence_score FLOAT,
-                    access_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    access_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                     camera_id VARCHAR(50),
                     frame_path TEXT,
                     status VARCHAR(20) DEFAULT 'allowed',
+                    event_id UUID,
+                    {log_key},
                     FOREIGN KEY (moodle_id) REFERENCES students(moodle_id)
-                );
+                ) {log_partitioning};
             """)
             
             # Vehicle access logs
-            self.cursor.execute("""
+            self.cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS vehicle_logs (
-                    id SERIAL PRIMARY KEY,
+                    id SERIAL,
                     license_plate VARCHAR(20),
                     confidence_score FLOAT,
-                    access_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    access_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                     camera_id VARCHAR(50),
                     frame_path TEXT,
                     status VARCHAR(20) DEFAULT 'allowed',
+                    event_id UUID,
+                    {log_key},
                     FOREIGN KEY (license_plate) REFERENCES vehicles(license_plate)
+                ) {log_partitioning};
+            """)
+            
+            # Access counters (one row per camera per minute)
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS access_counters (
+                    bucket TIMESTAMP NOT NULL,
+                    camera_id VARCHAR(50) NOT NULL,
+                    id_card_entries INT DEFAULT 0,
+                    vehicle_entries INT DEFAULT 0,
+                    PRIMARY KEY (bucket, camera_id)
                 );
             """)
             
-            # Access statistics
+            # Daily statistics for completed days (see rollup_statistics)
             self.cursor.execute("""
                 CREATE TABLE IF NOT EXISTS access_statistics (
                     id SERIAL PRIMARY KEY,
@@ -142,10 +284,37 @@ class SupabaseManager:
                 CREATE INDEX IF NOT EXISTS idx_vehicles_plate ON vehicles(license_plate);
                 CREATE INDEX IF NOT EXISTS idx_id_logs_time ON id_card_logs(access_time);
                 CREATE INDEX IF NOT EXISTS idx_vehicle_logs_time ON vehicle_logs(access_time);
+                
+                -- Idempotent event IDs: a spooled event replayed after a
+                -- lost acknowledgement is ignored instead of logged twice
+                ALTER TABLE id_card_logs ADD COLUMN IF NOT EXISTS event_id UUID;
+                ALTER TABLE vehicle_logs ADD COLUMN IF NOT EXISTS event_id UUID;
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_id_logs_event ON id_card_logs(event_id, access_time);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_vehicle_logs_event ON vehicle_logs(event_id, access_time);
+                
+                -- updated_at lets directory caches poll for changed rows
+                ALTER TABLE vehicles ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+                CREATE INDEX IF NOT EXISTS idx_students_updated ON students(updated_at);
+                CREATE INDEX IF NOT EXISTS idx_vehicles_updated ON vehicles(updated_at);
+                
+                -- FALSE for placeholders added so access logs of unregistered
+                -- IDs / plates satisfy their foreign keys (see ensure_student)
+                ALTER TABLE students ADD COLUMN IF NOT EXISTS active BOOLEAN NOT NULL DEFAULT TRUE;
+                ALTER TABLE vehicles ADD COLUMN IF NOT EXISTS active BOOLEAN NOT NULL DEFAULT TRUE;
             """)
             
             self.connection.commit()
             print("✅ All tables created successfully")
+            
+            self.partitioned_logs = all(
+                partitions.is_partitioned(self.connection, table)
+                for table in partitions.LOG_TABLES
+            )
+            if partition_logs and not self.partitioned_logs:
+                print("⚠️  Access log tables already exist unpartitioned; "
+                      "partitioning only applies to new databases")
+            if self.partitioned_logs:
+                self.ensure_log_partitions()
             return True
             
         except Exception as e:
@@ -153,8 +322,88 @@ class SupabaseManager:
             self.connection.rollback()
             return False
     
+    def ensure_log_partitions(self, months_ahead=LOG_PARTITION_MONTHS_AHEAD):
+        """
+        Create monthly log partitions from the current month onwards
+        
+        Args:
+            months_ahead (int): Extra months to create after the current one
+            
+        Returns:
+            bool: True if the partitions exist
+        """
+        this_month = partitions.current_month()
+        months = [partitions.add_months(this_month, i) for i in range(months_ahead + 1)]
+        try:
+            self._partition_months |= partitions.ensure_partitions(self.connection, months)
+            self.connection.commit()
+            return True
+        except Exception as e:
+            print(f"❌ Error creating log partitions: {e}")
+            self.connection.rollback()
+            return False
+    
+    def _ensure_current_partition(self):
+        """Make sure the partition for this month exists before logging"""
+        if self.partitioned_logs and partitions.current_month() not in self._partition_months:
+            self.ensure_log_partitions()
+    
+    def apply_retention(self, retain_months=LOG_RETENTION_MONTHS,
+                        counter_retention_days=COUNTER_RETENTION_DAYS):
+        """
+        Drop access logs and counters that fall outside the retention window
+        
+        Whole monthly partitions are dropped, which is a metadata operation
+        regardless of how many rows they hold. Counters are rolled up into
+        access_statistics before old ones are deleted.
+        
+        Args:
+            retain_months (int): Months of access logs to keep, including this one
+            counter_retention_days (int): Days of per-minute counters to keep
+            
+        Returns:
+            list: Names of dropped partitions
+        """
+        if not self.partitioned_logs:
+            print("⚠️  Access logs are not partitioned; skipping log retention")
+            dropped = []
+        else:
+            cutoff = partitions.add_months(partitions.current_month(), -(retain_months - 1))
+            try:
+                dropped = partitions.drop_partitions_before(self.connection, cutoff)
+                self.connection.commit()
+                self._partition_months = {m for m in self._partition_months if m >= cutoff}
+                print(f"✅ Dropped {len(dropped)} log partition(s) older than {cutoff}")
+            except Exception as e:
+                print(f"❌ Error dropping log partitions: {e}")
+                self.connection.rollback()
+                dropped = []
+        
+        self.rollup_statistics()
+        try:
+            # Days on the gates' clock, which stamps the buckets
+            self.cursor.execute("""
+                DELETE FROM access_counters
+                WHERE bucket < %s;
+            """, (day_start(date.today() - timedelta(days=counter_retention_days)),))
+            self.connection.commit()
+        except Exception as e:
+            print(f"❌ Error pruning access counters: {e}")
+            self.connection.rollback()
+        
+        return dropped
+    
     def insert_student(self, moodle_id, name, department=None, photo_path=None, card_image_path=None):
         """Insert or update student record"""
+        values = (name, department, photo_path, card_image_path)
+        seen = self._seen_students.get(moodle_id)
+        if seen and seen[0] == values:
+            return seen[1]
+        
+        if self.writer and not self.is_connected:
+            # Offline: spool the upsert so later access logs can reference it
+            return self.writer.submit_student(moodle_id, *values)
+        
         try:
             self.cursor.execute("""
                 INSERT INTO students (moodle_id, name, department, photo_path, card_image_path)
@@ -165,12 +414,14 @@ class SupabaseManager:
                     department = EXCLUDED.department,
                     photo_path = EXCLUDED.photo_path,
                     card_image_path = EXCLUDED.card_image_path,
+                    active = TRUE,
                     updated_at = CURRENT_TIMESTAMP
                 RETURNING id;
             """, (moodle_id, name, department, photo_path, card_image_path))
             
             result = self.cursor.fetchone()
             self.connection.commit()
+            self._remember(self._seen_students, moodle_id, values, result['id'])
             print(f"✅ Student {moodle_id} - {name} saved")
             return result['id']
             
@@ -181,6 +432,15 @@ class SupabaseManager:
     
     def insert_vehicle(self, license_plate, owner_moodle_id=None, vehicle_type=None, color=None, model=None):
         """Insert or update vehicle record"""
+        values = (owner_moodle_id, vehicle_type, color, model)
+        seen = self._seen_vehicles.get(license_plate)
+        if seen and seen[0] == values:
+            return seen[1]
+        
+        if self.writer and not self.is_connected:
+            # Offline: spool the upsert so later access logs can reference it
+            return self.writer.submit_vehicle_registration(license_plate, *values)
+        
         try:
             self.cursor.execute("""
                 INSERT INTO vehicles (license_plate, owner_moodle_id, vehicle_type, color, model)
@@ -190,12 +450,15 @@ class SupabaseManager:
                     owner_moodle_id = EXCLUDED.owner_moodle_id,
                     vehicle_type = EXCLUDED.vehicle_type,
                     color = EXCLUDED.color,
-                    model = EXCLUDED.model
+                    model = EXCLUDED.model,
+                    active = TRUE,
+                    updated_at = CURRENT_TIMESTAMP
                 RETURNING id;
             """, (license_plate, owner_moodle_id, vehicle_type, color, model))
             
             result = self.cursor.fetchone()
             self.connection.commit()
+            self._remember(self._seen_vehicles, license_plate, values, result['id'])
             print(f"✅ Vehicle {license_plate} saved")
             return result['id']
             
@@ -204,22 +467,78 @@ class SupabaseManager:
             self.connection.rollback()
             return None
     
+    def ensure_student(self, moodle_id, name=None):
+        """Create an inactive placeholder student unless the Moodle ID exists"""
+        if moodle_id in self._seen_students:
+            return True
+        name = (name or 'UNKNOWN')[:MAX_NAME_LENGTH]
+
+        if self.writer and not self.is_connected:
+            return self.writer.submit_student_placeholder(moodle_id, name)
+
+        return self._ensure_row(self._seen_students, moodle_id, """
+            INSERT INTO students (moodle_id, name, active) VALUES (%s, %s, FALSE)
+            ON CONFLICT (moodle_id) DO NOTHING;
+        """, (moodle_id, name))
+
+    def ensure_vehicle(self, license_plate):
+        """Create an inactive placeholder vehicle unless the plate exists"""
+        if license_plate in self._seen_vehicles:
+            return True
+
+        if self.writer and not self.is_connected:
+            return self.writer.submit_vehicle_placeholder(license_plate)
+
+        return self._ensure_row(self._seen_vehicles, license_plate, """
+            INSERT INTO vehicles (license_plate, active) VALUES (%s, FALSE)
+            ON CONFLICT (license_plate) DO NOTHING;
+        """, (license_plate,))
+
+    def _ensure_row(self, seen, key, sql, params):
+        """Run an insert-if-absent once per key and session"""
+        try:
+            self.cursor.execute(sql, params)
+            self.connection.commit()
+            # No values: a later insert_student / insert_vehicle is never skipped
+            self._remember(seen, key, None, None)
+            return True
+
+        except Exception as e:
+            print(f"❌ Error adding placeholder: {e}")
+            self.connection.rollback()
+            return False
+
+    def _remember(self, seen, key, values, row_id):
+        """Record an upserted entity so identical upserts can be skipped"""
+        if len(seen) >= MAX_SEEN_ENTITIES:
+            seen.clear()
+        seen[key] = (values, row_id)
+    
     def log_id_card_access(self, moodle_id, name, department=None, confidence=None, 
                           camera_id=None, frame_path=None, status='allowed'):
         """Log an ID card access event"""
+        if self.writer:
+            return self.writer.submit_id_card(
+                moodle_id, name, department, confidence, camera_id, frame_path, status
+            )
+        
+        # Stamped here, like write-behind events, so both paths use the gate's clock
+        now = datetime.now()
+        self._ensure_current_partition()
         try:
             self.cursor.execute("""
                 INSERT INTO id_card_logs 
-                (moodle_id, name, department, confidence_score, camera_id, frame_path, status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                (moodle_id, name, department, confidence_score, access_time,
+                 camera_id, frame_path, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 RETURNING id;
-            """, (moodle_id, name, department, confidence, camera_id, frame_path, status))
+            """, (moodle_id, name, department, confidence, now, camera_id, frame_path, status))
             
             result = self.cursor.fetchone()
             self.connection.commit()
             
             # Update statistics
-            self._update_statistics('id_card')
+            self._update_statistics('id_card', camera_id, now)
             
             print(f"✅ ID card access logged: {moodle_id} - {name}")
             return result['id']
@@ -232,19 +551,26 @@ class SupabaseManager:
     def log_vehicle_access(self, license_plate, confidence=None, camera_id=None, 
                           frame_path=None, status='allowed'):
         """Log a vehicle access event"""
+        if self.writer:
+            return self.writer.submit_vehicle(
+                license_plate, confidence, camera_id, frame_path, status
+            )
+        
+        now = datetime.now()
+        self._ensure_current_partition()
         try:
             self.cursor.execute("""
                 INSERT INTO vehicle_logs 
-                (license_plate, confidence_score, camera_id, frame_path, status)
-                VALUES (%s, %s, %s, %s, %s)
+                (license_plate, confidence_score, access_time, camera_id, frame_path, status)
+                VALUES (%s, %s, %s, %s, %s, %s)
                 RETURNING id;
-            """, (license_plate, confidence, camera_id, frame_path, status))
+            """, (license_plate, confidence, now, camera_id, frame_path, status))
             
             result = self.cursor.fetchone()
             self.connection.commit()
             
             # Update statistics
-            self._update_statistics('vehicle')
+            self._update_statistics('vehicle', camera_id, now)
             
             print(f"✅ Vehicle access logged: {license_plate}")
             return result['id']
@@ -254,32 +580,67 @@ class SupabaseManager:
             self.connection.rollback()
             return None
     
-    def _update_statistics(self, access_type):
-        """Update daily access statistics"""
+    def _update_statistics(self, access_type, camera_id, access_time):
+        """
+        Bump the per-camera, per-minute access counter
+        
+        Each gate camera writes its own row for the event's minute, so
+        concurrent writers never queue behind a single daily row lock.
+        Daily totals are rolled up on read by get_today_statistics.
+        """
+        column = 'id_card_entries' if access_type == 'id_card' else 'vehicle_entries'
         try:
-            if access_type == 'id_card':
-                self.cursor.execute("""
-                    INSERT INTO access_statistics (date, id_card_entries, total_entries)
-                    VALUES (CURRENT_DATE, 1, 1)
-                    ON CONFLICT (date) 
-                    DO UPDATE SET 
-                        id_card_entries = access_statistics.id_card_entries + 1,
-                        total_entries = access_statistics.total_entries + 1;
-                """)
-            elif access_type == 'vehicle':
-                self.cursor.execute("""
-                    INSERT INTO access_statistics (date, vehicle_entries, total_entries)
-                    VALUES (CURRENT_DATE, 1, 1)
-                    ON CONFLICT (date) 
-                    DO UPDATE SET 
-                        vehicle_entries = access_statistics.vehicle_entries + 1,
-                        total_entries = access_statistics.total_entries + 1;
-                """)
+            self.cursor.execute(f"""
+                INSERT INTO access_counters (bucket, camera_id, {column})
+                VALUES (%s, %s, 1)
+                ON CONFLICT (bucket, camera_id) 
+                DO UPDATE SET 
+                    {column} = access_counters.{column} + 1;
+            """, (access_time.replace(second=0, microsecond=0), camera_id or UNKNOWN_CAMERA))
             
             self.connection.commit()
             
         except Exception as e:
             print(f"⚠️  Warning: Could not update statistics: {e}")
+            self.connection.rollback()
+    
+    def rollup_statistics(self):
+        """
+        Fold counters for completed days into access_statistics
+        
+        Recomputes each past day from access_counters, so it is safe to run
+        repeatedly (e.g. once a night). Today's figures always come from
+        the counters directly.
+        
+        Returns:
+            int: Number of days written
+        """
+        try:
+            self.cursor.execute("""
+                INSERT INTO access_statistics (date, id_card_entries, vehicle_entries, total_entries)
+                SELECT
+                    bucket::date,
+                    SUM(id_card_entries),
+                    SUM(vehicle_entries),
+                    SUM(id_card_entries + vehicle_entries)
+                FROM access_counters
+                WHERE bucket < %s
+                GROUP BY bucket::date
+                ON CONFLICT (date)
+                DO UPDATE SET
+                    id_card_entries = EXCLUDED.id_card_entries,
+                    vehicle_entries = EXCLUDED.vehicle_entries,
+                    total_entries = EXCLUDED.total_entries;
+            """, (day_start(date.today()),))
+            days = self.cursor.rowcount
+            self.connection.commit()
+            print(f"✅ Rolled up statistics for {days} day(s)")
+            return days
+            
+        except Exception as e:
+            print(f"❌ Error rolling up statistics: {e}")
+            self.connection.rollback()
+            return 0
     
     def get_student(self, moodle_id):
         """Get student details by Moodle ID"""
@@ -310,14 +671,61 @@ class SupabaseManager:
             print(f"❌ Error fetching vehicle: {e}")
             return None
     
-    def get_recent_id_card_logs(self, limit=10):
-        """Get recent ID card access logs"""
+    def get_students_since(self, since=None):
+        """
+        Get students changed at or after a time (all students when since is None)
+        
+        Uses its own cursor so a background cache refresh can run while
+        other threads use the shared one.
+        """
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT * FROM students
+                    WHERE (%s::timestamp IS NULL OR updated_at >= %s::timestamp)
+                    ORDER BY updated_at;
+                """, (since, since))
+                return cursor.fetchall()
+            
+        except Exception as e:
+            print(f"❌ Error fetching students: {e}")
+            self.connection.rollback()
+            return None
+    
+    def get_vehicles_since(self, since=None):
+        """
+        Get vehicles changed at or after a time (all vehicles when since is None)
+        """
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT * FROM vehicles
+                    WHERE (%s::timestamp IS NULL OR updated_at >= %s::timestamp)
+                    ORDER BY updated_at;
+                """, (since, since))
+                return cursor.fetchall()
+            
+        except Exception as e:
+            print(f"❌ Error fetching vehicles: {e}")
+            self.connection.rollback()
+            return None
+    
+    def get_recent_id_card_logs(self, limit=10, since=None):
+        """
+        Get recent ID card access logs
+        
+        Args:
+            limit (int): Maximum rows to return
+            since (datetime): Only logs at or after this time; lets Postgres
+                skip older monthly partitions entirely
+        """
         try:
             self.cursor.execute("""
                 SELECT * FROM id_card_logs 
+                WHERE (%s::timestamp IS NULL OR access_time >= %s::timestamp)
                 ORDER BY access_time DESC 
                 LIMIT %s;
-            """, (limit,))
+            """, (since, since, limit))
             
             return self.cursor.fetchall()
             
@@ -325,14 +733,22 @@ class SupabaseManager:
             print(f"❌ Error fetching logs: {e}")
             return []
     
-    def get_recent_vehicle_logs(self, limit=10):
-        """Get recent vehicle access logs"""
+    def get_recent_vehicle_logs(self, limit=10, since=None):
+        """
+        Get recent vehicle access logs
+        
+        Args:
+            limit (int): Maximum rows to return
+            since (datetime): Only logs at or after this time; lets Postgres
+                skip older monthly partitions entirely
+        """
         try:
             self.cursor.execute("""
                 SELECT * FROM vehicle_logs 
+                WHERE (%s::timestamp IS NULL OR access_time >= %s::timestamp)
                 ORDER BY access_time DESC 
                 LIMIT %s;
-            """, (limit,))
+            """, (since, since, limit))
             
             return self.cursor.fetchall()
             
@@ -342,11 +758,22 @@ class SupabaseManager:
     
     def get_today_statistics(self):
         """Get today's access statistics"""
+        # "Today" on the gates' clock, which stamps the counter buckets
+        today = date.today()
+        start = day_start(today)
         try:
             self.cursor.execute("""
-                SELECT * FROM access_statistics 
-                WHERE date = CURRENT_DATE;
-            """)
+                SELECT
+                    (SELECT id FROM access_statistics WHERE date = %s) AS id,
+                    %s::date AS date,
+                    SUM(id_card_entries)::INT AS id_card_entries,
+                    SUM(vehicle_entries)::INT AS vehicle_entries,
+                    SUM(id_card_entries + vehicle_entries)::INT AS total_entries
+                FROM access_counters
+                WHERE bucket >= %s
+                  AND bucket < %s
+                HAVING COUNT(*) > 0;
+            """, (today, today, start, start + timedelta(days=1)))
             
             return self.cursor.fetchone()
             
@@ -354,31 +781,87 @@ class SupabaseManager:
             print(f"❌ Error fetching statistics: {e}")
             return None
     
-    def bulk_import_students_from_json(self, json_path):
-        """Import students from batch processing JSON"""
+    def bulk_import_students(self, records):
+        """
+        Upsert many students with COPY + one set-based merge
+        
+        Records are streamed into a temporary table with COPY FROM STDIN and
+        merged into students with a single INSERT ... ON CONFLICT. When the
+        same Moodle ID appears more than once, the last record wins, as it
+        would with repeated insert_student calls.
+        
+        Args:
+            records (list): Batch processing records (dicts)
+            
+        Returns:
+            dict: {'inserted': int, 'updated': int, 'skipped': int}
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        rows = 0
+        
+        for row in student_import_rows(records):
+            writer.writerow([rows, *row])
+            rows += 1
+        
+        report = {'inserted': 0, 'updated': 0, 'skipped': len(records) - rows}
+        if rows == 0:
+            return report
+        
+        buffer.seek(0)
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            inserted = 0
-            for record in data:
-                if record.get('success') and record.get('moodle_id'):
-                    result = self.insert_student(
-                        moodle_id=record['moodle_id'],
-                        name=record.get('name'),
-                        department=record.get('department'),
-                        card_image_path=record.get('image_path')
-                    )
-                    if result:
-                        inserted += 1
-            
-            print(f"✅ Imported {inserted} students from {json_path}")
-            return inserted
+            self.cursor.execute("""
+                CREATE TEMP TABLE students_import (
+                    ord INT,
+                    moodle_id VARCHAR(20),
+                    name VARCHAR(100),
+                    department VARCHAR(100),
+                    card_image_path TEXT
+                ) ON COMMIT DROP;
+            """)
+            self.cursor.copy_expert(
+                "COPY students_import FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            
+            # xmax = 0 only for rows created by this statement
+            self.cursor.execute("""
+                WITH merged AS (
+                    INSERT INTO students (moodle_id, name, department, photo_path, card_image_path)
+                    SELECT DISTINCT ON (moodle_id)
+                        moodle_id, name, department, NULL, card_image_path
+                    FROM students_import
+                    ORDER BY moodle_id, ord DESC
+                    ON CONFLICT (moodle_id)
+                    DO UPDATE SET
+                        name = EXCLUDED.name,
+                        department = EXCLUDED.department,
+                        photo_path = EXCLUDED.photo_path,
+                        card_image_path = EXCLUDED.card_image_path,
+                        active = TRUE,
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT
+                    COUNT(*) FILTER (WHERE inserted) AS inserted,
+                    COUNT(*) FILTER (WHERE NOT inserted) AS updated
+                FROM merged;
+            """)
+            
+            result = self.cursor.fetchone()
+            self.connection.commit()
             
         except Exception as e:
-            print(f"❌ Error importing students: {e}")
-            return 0
-
+            print(f"❌ Error bulk importing students: {e}")
+            self.connection.rollback()
+            return None
+        
+        # Cached upserts may no longer match what is stored
+        self._seen_students.clear()
+        
+        report['inserted'] = result['inserted']
+        report['updated'] = result['updated']
+        report['skipped'] += rows - (result['inserted'] + result['updated'])
+        return report
 
 def test_connection():
     """Test database connection and setup"""
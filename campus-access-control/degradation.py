@@ -0,0 +1,224 @@
+"""
+Deadline-Aware Degradation Controller
+Keeps access decisions inside TARGET_RESPONSE_TIME under load. The p95 of
+end-to-end decision latency (frame capture -> decision) is tracked over a
+sliding window; when it nears the budget the recognizers step down one
+quality level (skip denoise, fast preprocessing, smaller YOLO input,
+sparser frame sampling), and they step back up once there is headroom.
+A gate that goes quiet after a burst also steps back up, one level per
+idle period, so it does not stay degraded until enough new decisions arrive.
+"""
+
+import collections
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import YOLO_IMAGE_SIZE
+
+
+def _input_size(fraction):
+    """Fraction of the full YOLO input size, on the model's 32-pixel stride"""
+    return max(32, int(YOLO_IMAGE_SIZE * fraction) // 32 * 32)
+
+
+# Quality levels, cheapest change first. Each level keeps the previous ones'
+# savings. imgsz = YOLO input size, sample_every = process every Nth frame.
+QUALITY_LEVELS = [
+    {'name': 'full', 'imgsz': YOLO_IMAGE_SIZE, 'denoise': True, 'fast_preprocess': False, 'sample_every': 1},
+    {'name': 'no-denoise', 'imgsz': YOLO_IMAGE_SIZE, 'denoise': False, 'fast_preprocess': False, 'sample_every': 1},
+    {'name': 'fast-preprocess', 'imgsz': YOLO_IMAGE_SIZE, 'denoise': False, 'fast_preprocess': True, 'sample_every': 1},
+    {'name': 'input-3/4', 'imgsz': _input_size(0.75), 'denoise': False, 'fast_preprocess': True, 'sample_every': 1},
+    {'name': 'input-1/2', 'imgsz': _input_size(0.5), 'denoise': False, 'fast_preprocess': True, 'sample_every': 1},
+    {'name': 'sample-1-in-2', 'imgsz': _input_size(0.5), 'denoise': False, 'fast_preprocess': True, 'sample_every': 2},
+    {'name': 'sample-1-in-3', 'imgsz': _input_size(0.5), 'denoise': False, 'fast_preprocess': True, 'sample_every': 3},
+]
+
+# Recognizer settings a level controls (see set_quality on the recognizers)
+RECOGNIZER_SETTINGS = ('imgsz', 'denoise', 'fast_preprocess')
+
+
+class DegradationController:
+    """
+    Steps recognizer quality down / up to hold a latency budget
+    """
+
+    def __init__(self, budget_seconds, recognizers=(), degrade_at=0.8, restore_below=0.5,
+                 cooldown_seconds=5.0, window=100, min_samples=20, idle_restore_seconds=30.0,
+                 levels=QUALITY_LEVELS, clock=time.monotonic):
+        """
+        Initialize at full quality
+
+        Args:
+            budget_seconds (float): End-to-end latency target (TARGET_RESPONSE_TIME)
+            recognizers (iterable): Objects with set_quality(imgsz, denoise, fast_preprocess)
+            degrade_at (float): Step down when p95 exceeds this fraction of the budget
+            restore_below (float): Step up when p95 is under this fraction of the budget
+            cooldown_seconds (float): Minimum time between step changes
+            window (int): Latency samples kept for the p95
+            min_samples (int): Samples needed (at the current level) before acting
+            idle_restore_seconds (float): Step up after this long at a level with
+                fewer than min_samples decisions, none of them near the budget
+            levels (list): Quality levels, best first
+            clock (callable): Monotonic time source (seconds)
+        """
+        self.budget = budget_seconds
+        self.recognizers = list(recognizers)
+        self.degrade_at = degrade_at
+        self.restore_below = restore_below
+        self.cooldown = cooldown_seconds
+        self.min_samples = min_samples
+        self.idle_restore = idle_restore_seconds
+        self.levels = levels
+        self.clock = clock
+
+        self.level = 0
+        self.samples = collections.deque(maxlen=window)
+        # Camera threads call update() while the decision thread records
+        self._lock = threading.RLock()
+        self.last_change = clock()
+        self.history = []
+
+        self.stats = {
+            'decisions': 0,
+            'over_budget': 0,
+            'step_downs': 0,
+            'step_ups': 0,
+            'idle_step_ups': 0
+        }
+        self._apply()
+
+    @property
+    def profile(self):
+        """Settings of the current level"""
+        return self.levels[self.level]
+
+    def add_recognizer(self, recognizer):
+        """Put another recognizer under control (gets the current level)"""
+        self.recognizers.append(recognizer)
+        self._apply()
+
+    def should_process(self, frame_number):
+        """Frame sampling at the current level"""
+        return frame_number % self.profile['sample_every'] == 0
+
+    def recognizer_settings(self):
+        """Current level's recognizer settings (for a remote model server)"""
+        return {key: self.profile[key] for key in RECOGNIZER_SETTINGS}
+
+    def record(self, latency_seconds):
+        """
+        Record one decision's end-to-end latency and adjust the level
+
+        Args:
+            latency_seconds (float): Frame capture to decision
+
+        Returns:
+            int: Level step taken (+1 degraded, -1 restored, 0 unchanged)
+        """
+        with self._lock:
+            self.samples.append(latency_seconds)
+            self.stats['decisions'] += 1
+            if latency_seconds > self.budget:
+                self.stats['over_budget'] += 1
+            return self.update()
+
+    def p95(self):
+        """95th percentile of the windowed latencies (None without samples)"""
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def update(self):
+        """
+        Step the level if the p95 is near the budget or well under it
+
+        Also called without a new sample (every camera frame), so a quiet
+        gate can recover.
+        """
+        with self._lock:
+            return self._update()
+
+    def _update(self):
+        """update() with the lock held"""
+        idle = self.clock() - self.last_change
+        if idle < self.cooldown:
+            return 0
+
+        if len(self.samples) < self.min_samples:
+            # Too few decisions to judge this level: the burst that caused it
+            # has passed unless one of them came near the budget
+            if (self.level > 0 and idle >= self.idle_restore
+                    and all(s <= self.budget * self.degrade_at for s in self.samples)):
+                self.stats['idle_step_ups'] += 1
+                self._step(-1, self.p95(), idle_seconds=idle)
+                return -1
+            return 0
+
+        p95 = self.p95()
+        if p95 > self.budget * self.degrade_at and self.level < len(self.levels) - 1:
+            self._step(+1, p95)
+            return 1
+        if p95 < self.budget * self.restore_below and self.level > 0:
+            self._step(-1, p95)
+            return -1
+        return 0
+
+    def _step(self, direction, p95, idle_seconds=None):
+        """Change level, apply it and log the change"""
+        previous = self.profile['name']
+        self.level += direction
+        self.last_change = self.clock()
+        # Judge the new level on its own latencies
+        self.samples.clear()
+        self._apply()
+
+        if direction > 0:
+            self.stats['step_downs'] += 1
+            print(f"\n⚠️  p95 decision latency {p95:.2f}s near the {self.budget:.1f}s budget: "
+                  f"quality {previous} -> {self.profile['name']}")
+        elif idle_seconds is not None:
+            self.stats['step_ups'] += 1
+            print(f"\n✅ Quiet for {idle_seconds:.0f}s with no decision near the budget: "
+                  f"quality {previous} -> {self.profile['name']}")
+        else:
+            self.stats['step_ups'] += 1
+            print(f"\n✅ p95 decision latency {p95:.2f}s has headroom: "
+                  f"quality {previous} -> {self.profile['name']}")
+
+        self.history.append({
+            'time': time.time(),
+            'from': previous,
+            'to': self.profile['name'],
+            'level': self.level,
+            'p95_seconds': round(p95, 3) if p95 is not None else None
+        })
+
+    def _apply(self):
+        """Push the current level's settings to the recognizers"""
+        settings = self.recognizer_settings()
+        for recognizer in self.recognizers:
+            if recognizer is not None and hasattr(recognizer, 'set_quality'):
+                recognizer.set_quality(**settings)
+
+    def get_stats(self):
+        """
+        Controller state
+
+        Returns:
+            dict: level, profile name, p95, budget, counters and step history
+        """
+        p95 = self.p95()
+        return {
+            'level': self.level,
+            'profile': self.profile['name'],
+            'p95_seconds': round(p95, 3) if p95 is not None else None,
+            'budget_seconds': self.budget,
+            **self.stats,
+            'history': list(self.history)
+        }
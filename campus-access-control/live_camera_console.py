@@ -14,6 +14,8 @@ from datetime import datetime
 from pathlib import Path
 from ultralytics import YOLO
 
+from camera_capture import open_camera, camera_source
+
 
 class ConsoleIDCardTester:
     """
@@ -217,11 +219,11 @@ class ConsoleIDCardTester:
         Run live camera feed (console only)
         
         Args:
-            camera_index: Camera index
+            camera_index: Camera index (or a recording to replay)
             interval: Seconds between captures (default 2.0)
         """
         print(f"📷 Opening camera {camera_index}...")
-        cap = cv2.VideoCapture(camera_index)
+        cap = open_camera(camera_index, latest_only=False)
         
         if not cap.isOpened():
             print(f"❌ Failed to open camera {camera_index}")
@@ -321,8 +323,8 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Console ID Card Recognition')
-    parser.add_argument('--camera', type=int, default=0,
-                       help='Camera index (default: 0)')
+    parser.add_argument('--camera', type=camera_source, default=0,
+                       help='Camera index, or a video / image directory to replay (default: 0)')
     parser.add_argument('--interval', type=float, default=2.0,
                        help='Seconds between captures (default: 2.0)')
     
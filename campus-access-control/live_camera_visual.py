@@ -17,6 +17,9 @@ from datetime import datetime
 from pathlib import Path
 from ultralytics import YOLO
 
+from camera_capture import open_camera, camera_source
+from ring_buffer import SpillingRingBuffer
+
 
 class VisualIDCardTester:
     """
@@ -400,13 +403,13 @@ class VisualIDCardTester:
         Run live camera feed with visual annotations
         
         Args:
-            camera_index: Camera index
+            camera_index: Camera index (or a recording to replay)
             interval: Seconds between captures
             resolution: Tuple (width, height) - default 1080p
             fps: Target frames per second - default 30
         """
         print(f"📷 Opening camera {camera_index}...")
-        cap = cv2.VideoCapture(camera_index)
+        cap = open_camera(camera_index, latest_only=False)
         
         if not cap.isOpened():
             print(f"❌ Failed to open camera {camera_index}")
@@ -436,7 +439,7 @@ class VisualIDCardTester:
         
         frame_count = 0
         last_capture_time = 0
-        detections = []
+        detections = SpillingRingBuffer('visual_detections')
         
         # FPS measurement
         fps_start_time = time.time()
@@ -540,8 +543,8 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Visual ID Card Recognition')
-    parser.add_argument('--camera', type=int, default=0,
-                       help='Camera index (default: 0)')
+    parser.add_argument('--camera', type=camera_source, default=0,
+                       help='Camera index, or a video / image directory to replay (default: 0)')
     parser.add_argument('--interval', type=float, default=3.0,
                        help='Seconds between OCR captures (default: 3.0)')
     parser.add_argument('--width', type=int, default=1920,
@@ -0,0 +1,296 @@
+"""
+Metrics Endpoint
+Optional in-process HTTP endpoint serving pipeline counters and latencies in
+the Prometheus text format, so monitoring can scrape every gate node instead
+of parsing stdout. Values are read from the existing stats dicts and stage
+histograms when a scrape arrives; nothing extra runs per frame.
+
+Usage:
+    python access_control_system.py --mode dual --metrics-port 9108
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import METRICS_HOST, METRICS_PORT
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+QUANTILES = (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms'))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value is True or value is False:
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class MetricsText:
+    """
+    Collects samples and renders them as a Prometheus text exposition
+
+    Samples of one metric are grouped under a single HELP / TYPE header no
+    matter in which order they are added.
+    """
+
+    def __init__(self, prefix='campus'):
+        self.prefix = prefix
+        self.families = {}
+
+    def add(self, name, kind, help_text, value, labels=None):
+        """
+        Add one sample (None values are skipped)
+
+        Args:
+            name (str): Metric name without the prefix
+            kind (str): 'counter', 'gauge' or 'summary'
+            help_text (str): HELP line
+            value (int, float or bool): Sample value
+            labels (dict): Label names and values
+        """
+        if value is None:
+            return
+        family = self.families.setdefault(f"{self.prefix}_{name}", (kind, help_text, []))
+        family[2].append(('', labels or {}, value))
+
+    def add_summary(self, name, help_text, summary, labels=None):
+        """
+        Add a latency summary from LatencyHistogram.summary() (milliseconds)
+
+        Exported in seconds with 0.5 / 0.95 / 0.99 quantiles, _sum and _count.
+        """
+        if not summary or not summary.get('count'):
+            return
+        labels = labels or {}
+        family = self.families.setdefault(f"{self.prefix}_{name}", ('summary', help_text, []))
+        for quantile, key in QUANTILES:
+            family[2].append(('', {**labels, 'quantile': quantile}, summary[key] / 1000))
+        family[2].append(('_sum', labels, summary['mean_ms'] * summary['count'] / 1000))
+        family[2].append(('_count', labels, summary['count']))
+
+    def add_stage_latency(self, component, report):
+        """Add every stage of a PipelineTimer.report()"""
+        for stage, summary in (report or {}).items():
+            self.add_summary('stage_latency_seconds', 'Pipeline stage latency', summary,
+                             {'component': component, 'stage': stage})
+
+    def render(self):
+        """The exposition text"""
+        lines = []
+        for name, (kind, help_text, samples) in self.families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}" if label_text
+                             else f"{name}{suffix} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# ========================
+# COLLECTORS
+# ========================
+
+def _add_recognizer(metrics, name, recognizer):
+    """Counters and stage latencies of a VehiclePlateRecognizer / OfflineIDCardRecognizer"""
+    for key, value in getattr(recognizer, 'stats', {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics.add(f"recognizer_{key}_total", 'counter', f"Recognizer {key.replace('_', ' ')}",
+                        value, {'recognizer': name})
+    metrics.add('recognizer_ready', 'gauge', 'Recognizer warmed up and ready',
+                getattr(recognizer, 'ready', None), {'recognizer': name})
+    timing = getattr(recognizer, 'timing', None)
+    if timing:
+        metrics.add_stage_latency(name, timing.report())
+
+
+def access_control_metrics(system):
+    """
+    Collector for an AccessControlSystem
+
+    Args:
+        system (AccessControlSystem): Running system
+
+    Returns:
+        callable: Returns a MetricsText on every scrape
+    """
+    def collect():
+        metrics = MetricsText()
+
+        # Decisions
+        for key, value in system.stats.items():
+            name = key if key.startswith('access_') else f"access_{key}"
+            metrics.add(f"{name}_total", 'counter', f"Access decisions: {key.replace('_', ' ')}", value)
+        metrics.add('ready', 'gauge', 'All local models warmed up', system.ready)
+
+        # Cameras
+        for camera, pipeline in list(system.pipeline_stats.items()):
+            labels = {'camera': camera}
+            frames, dropped = pipeline['frames'], pipeline['frames_dropped']
+            metrics.add('frames_processed_total', 'counter', 'Frames taken for recognition', frames, labels)
+            metrics.add('frames_dropped_total', 'counter', 'Stale frames replaced before being read',
+                        dropped, labels)
+            metrics.add('frame_drop_ratio', 'gauge', 'Dropped / captured frames',
+                        round(dropped / (frames + dropped), 4) if frames + dropped else 0.0, labels)
+            metrics.add('camera_fps', 'gauge', 'Effective recognition FPS', pipeline['fps'], labels)
+            metrics.add('frame_age_seconds', 'gauge', 'Age of the last frame when recognition started',
+                        pipeline['frame_age_ms'] / 1000, labels)
+            metrics.add('detection_events_total', 'counter', 'Detections sent to the decision stage',
+                        pipeline['events'], labels)
+
+        # Queues
+        depths = {
+            'vehicle_events': system.vehicle_queue.qsize(),
+            'id_card_events': system.id_card_queue.qsize(),
+            'pending_verifications': len(system.pending_verifications)
+        }
+        for queue_name, depth in depths.items():
+            metrics.add('queue_depth', 'gauge', 'Items waiting', depth, {'queue': queue_name})
+
+        # Recognizers and latencies
+        metrics.add_stage_latency('system', system.timing.report())
+        for name, recognizer in (('vehicle', system.vehicle_recognizer), ('id_card', system.id_card_verifier)):
+            if recognizer is not None:
+                _add_recognizer(metrics, name, recognizer)
+
+        if system.degradation:
+            quality = system.degradation.get_stats()
+            metrics.add('quality_level', 'gauge', 'Degradation level (0 = full quality)', quality['level'])
+            metrics.add('decision_latency_p95_seconds', 'gauge', 'Windowed p95 capture-to-decision latency',
+                        quality['p95_seconds'])
+
+        # Directory cache
+        if system.directory:
+            cache = system.directory.get_metrics()
+            metrics.add('directory_lookups_total', 'counter', 'Directory cache lookups', cache['lookups'])
+            metrics.add('directory_hits_total', 'counter', 'Directory cache lookups that found an entry',
+                        cache['hits'])
+            metrics.add('directory_hit_ratio', 'gauge', 'Directory cache hit rate', cache['hit_rate'])
+            metrics.add('directory_staleness_seconds', 'gauge', 'Seconds since the last refresh',
+                        cache['staleness_seconds'])
+
+        # Database write-behind
+        if system.db:
+            sync = system.db.get_sync_metrics()
+            metrics.add('queue_depth', 'gauge', 'Items waiting', sync.get('spool_depth'), {'queue': 'db_spool'})
+            metrics.add('db_write_lag_seconds', 'gauge', 'Age of the oldest event not yet in the database',
+                        sync.get('sync_lag_seconds'))
+            for key in ('events_submitted', 'events_written', 'events_duplicate', 'events_rejected',
+                        'events_dropped', 'batches_flushed', 'flush_errors'):
+                metrics.add(f"db_{key}_total", 'counter', f"Database writer {key.replace('_', ' ')}",
+                            sync.get(key))
+        return metrics
+    return collect
+
+
+def model_server_metrics(server):
+    """
+    Collector for a ModelServer
+
+    Args:
+        server (ModelServer): Running server
+
+    Returns:
+        callable: Returns a MetricsText on every scrape
+    """
+    def collect():
+        metrics = MetricsText()
+        stats = server.get_stats()
+        metrics.add('model_server_clients', 'gauge', 'Connected camera clients', stats['clients_active'])
+        metrics.add('model_server_requests_total', 'counter', 'Requests served', stats['requests'])
+        metrics.add('model_server_errors_total', 'counter', 'Requests that failed', stats['errors'])
+        for task, count in stats['requests_by_task'].items():
+            metrics.add('model_server_task_requests_total', 'counter', 'Requests per task', count, {'task': task})
+        for task, batching in stats['batching'].items():
+            metrics.add('queue_depth', 'gauge', 'Items waiting', batching.get('queue_depth'), {'queue': f"batch_{task}"})
+            metrics.add('batch_size_avg', 'gauge', 'Average frames per batch', batching.get('avg_batch_size'),
+                        {'task': task})
+        for task, model in list(server.models.items()):
+            _add_recognizer(metrics, task, model)
+        return metrics
+    return collect
+
+
+# ========================
+# HTTP SERVER
+# ========================
+
+class MetricsServer:
+    """
+    Background HTTP server answering GET /metrics
+    """
+
+    def __init__(self, collect, host=METRICS_HOST, port=METRICS_PORT):
+        """
+        Args:
+            collect (callable): Returns a MetricsText (see the collectors above)
+            host (str): Interface to bind (default: METRICS_HOST)
+            port (int): Port to bind (0 = any free port)
+        """
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self.scrape_errors = 0
+        self._httpd = None
+        self._thread = None
+
+    def render(self):
+        """Current metrics text, including the endpoint's own counters"""
+        metrics = self.collect()
+        metrics.add('metrics_scrapes_total', 'counter', 'Scrapes served', self.scrapes)
+        metrics.add('metrics_scrape_errors_total', 'counter', 'Scrapes that failed', self.scrape_errors)
+        return metrics.render()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                try:
+                    body = server.render().encode('utf-8')
+                    server.scrapes += 1
+                except Exception as e:
+                    server.scrape_errors += 1
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        return Handler
+
+    def start(self):
+        """Bind and serve on a daemon thread; returns self"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='metrics', daemon=True)
+        self._thread.start()
+        print(f"📈 Metrics at http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        """Stop serving"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
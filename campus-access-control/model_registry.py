@@ -0,0 +1,220 @@
+"""
+Shared Model Registry
+One instance per (kind, model path, languages, device) for the whole process.
+Recognizers ask the registry for their YOLO detector and EasyOCR reader, so
+the ID card and plate recognizers in one app share a single reader instead
+of each loading its own. Models load on first use; calls go through a
+per-model lock because the same instance now serves several threads.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+
+def _rss_mb():
+    """Resident memory of this process in MB (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _parameter_mb(instance):
+    """Size of the torch weights held by a YOLO model or EasyOCR reader"""
+    total = 0
+    for name in ('model', 'detector', 'recognizer'):
+        module = getattr(instance, name, None)
+        parameters = getattr(module, 'parameters', None)
+        if callable(parameters):
+            try:
+                total += sum(p.numel() * p.element_size() for p in parameters())
+            except Exception:
+                pass
+    return round(total / 2 ** 20, 1) if total else None
+
+
+class SharedModel:
+    """
+    Lazily loaded, lock-protected handle to one model instance
+
+    Calls (model(frame), reader.readtext(...)) are forwarded to the instance
+    under the model's lock, so existing recognizer code works unchanged.
+    """
+
+    def __init__(self, kind, key, loader):
+        """
+        Args:
+            kind (str): 'yolo' or 'easyocr'
+            key (tuple): Registry key
+            loader (callable): Builds the instance
+        """
+        self.kind = kind
+        self.key = key
+        self._loader = loader
+        self._instance = None
+        self.lock = threading.RLock()
+        self.users = 0
+        self.load_seconds = None
+        self.rss_delta_mb = None
+        self.parameter_mb = None
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def load(self):
+        """Load now (no-op if loaded); returns self"""
+        if self._instance is None:
+            with self.lock:
+                if self._instance is None:
+                    rss_before = _rss_mb()
+                    start = time.perf_counter()
+                    instance = self._loader()
+                    self.load_seconds = round(time.perf_counter() - start, 3)
+                    rss_after = _rss_mb()
+                    if rss_before is not None and rss_after is not None:
+                        self.rss_delta_mb = round(rss_after - rss_before, 1)
+                    self.parameter_mb = _parameter_mb(instance)
+                    self._instance = instance
+        return self
+
+    @property
+    def instance(self):
+        """The underlying model (loaded on first access)"""
+        return self.load()._instance
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            return self.instance(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only reached for attributes SharedModel itself does not define
+        if name.startswith('__'):
+            raise AttributeError(name)
+        attribute = getattr(self.instance, name)
+        if not callable(attribute):
+            return attribute
+
+        def locked(*args, **kwargs):
+            with self.lock:
+                return attribute(*args, **kwargs)
+        return locked
+
+    def describe(self):
+        """Registry entry as a dict"""
+        return {
+            'kind': self.kind,
+            'key': ['+'.join(part) if isinstance(part, tuple) else part for part in self.key[1:]],
+            'loaded': self.loaded,
+            'users': self.users,
+            'load_seconds': self.load_seconds,
+            'rss_delta_mb': self.rss_delta_mb,
+            'parameter_mb': self.parameter_mb
+        }
+
+
+_models = {}
+_registry_lock = threading.Lock()
+
+
+def get_model(kind, key, loader):
+    """
+    Shared handle for a model, created on first request
+
+    Args:
+        kind (str): Model family ('yolo', 'easyocr')
+        key (tuple): Everything that makes two instances different
+        loader (callable): Builds the instance when first used
+
+    Returns:
+        SharedModel: Handle shared by every caller with the same key
+    """
+    key = (kind,) + tuple(key)
+    with _registry_lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = SharedModel(kind, key, loader)
+        model.users += 1
+    return model
+
+
+def resolve_device(use_gpu):
+    """'cuda' when requested and available, else 'cpu'"""
+    if not use_gpu:
+        return 'cpu'
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def get_yolo(model_path, device='cpu'):
+    """
+    Shared YOLO detector
+
+    Args:
+        model_path (str or Path): Weights file
+        device (str): 'cpu' or 'cuda'
+
+    Returns:
+        SharedModel: Call it like a YOLO model
+    """
+    model_path = str(Path(model_path).resolve()) if Path(str(model_path)).exists() else str(model_path)
+
+    def load():
+        from ultralytics import YOLO
+        model = YOLO(model_path)
+        model.to(device)
+        return model
+    return get_model('yolo', (model_path, device), load)
+
+
+def get_ocr_reader(languages=('en',), use_gpu=False, **options):
+    """
+    Shared EasyOCR reader
+
+    Args:
+        languages (list): OCR languages
+        use_gpu (bool): Run on the GPU when one is available
+        **options: Extra easyocr.Reader arguments (first caller's win)
+
+    Returns:
+        SharedModel: Use it like an easyocr.Reader (readtext, ...)
+    """
+    languages = tuple(languages)
+    device = resolve_device(use_gpu)
+
+    def load():
+        import easyocr
+        return easyocr.Reader(list(languages), gpu=(device == 'cuda'), **options)
+    return get_model('easyocr', (languages, device), load)
+
+
+def loaded_models():
+    """
+    What the registry holds
+
+    Returns:
+        list: describe() dict per model
+    """
+    with _registry_lock:
+        models = list(_models.values())
+    return [model.describe() for model in models]
+
+
+def print_loaded_models():
+    """Print registry contents with load time and memory"""
+    print("\n📦 Shared models:")
+    for entry in loaded_models():
+        state = '✅' if entry['loaded'] else '⏸️ '
+        key = ', '.join(str(part) for part in entry['key'])
+        print(f"   {state} {entry['kind']:<8} {key}")
+        if entry['loaded']:
+            print(f"      users: {entry['users']}, load: {entry['load_seconds']}s, "
+                  f"RSS +{entry['rss_delta_mb']} MB, weights {entry['parameter_mb']} MB")
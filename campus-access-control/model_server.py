@@ -0,0 +1,714 @@
+"""
+Shared Model Server
+One process owns the YOLO / EasyOCR models; camera processes connect as
+clients. Frames travel through per-client shared-memory ring buffers (the
+server runs inference on a view of the client's slot, no copy), and only
+small request / result messages go over the socket, so any number of
+cameras share a single copy of the weights.
+
+Usage:
+    python model_server.py --preload vehicle_plates id_cards
+    python access_control_system.py --model-server 127.0.0.1:6070
+"""
+
+import argparse
+import collections
+import ipaddress
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import *
+from batch_scheduler import MicroBatchScheduler
+from model_registry import loaded_models
+from model_warmup import synthetic_frame, time_warmup, print_warmup_report
+
+
+# Tasks the server answers ('ping' is a model-free health check)
+TASKS = ('ping', 'vehicle_plates', 'id_cards')
+
+# Tasks whose requests from all cameras go through a micro-batching scheduler.
+# ID card recognition has no batched path (OCR runs per card), so queueing it
+# would only add latency; it runs per request under the model lock
+BATCHED_TASKS = ('vehicle_plates',)
+
+
+def parse_address(address=None):
+    """
+    Listener / client address from a config string
+
+    Args:
+        address (str or tuple): 'host:port', a Unix socket / named pipe path,
+            or a (host, port) tuple. None = MODEL_SERVER_ADDRESS
+
+    Returns:
+        tuple or str: Address accepted by multiprocessing.connection
+    """
+    address = address or MODEL_SERVER_ADDRESS
+    if isinstance(address, (tuple, list)):
+        return tuple(address)
+    host, sep, port = str(address).rpartition(':')
+    if sep and port.isdigit():
+        return (host or '127.0.0.1', int(port))
+    return str(address)
+
+
+def is_loopback(address):
+    """True if only this machine can reach the address (loopback host or socket path)"""
+    if isinstance(address, tuple):
+        try:
+            return ipaddress.ip_address(socket.gethostbyname(address[0])).is_loopback
+        except (OSError, ValueError):
+            return False
+    # Unix socket, or a named pipe on this machine (\\.\pipe\...)
+    return not address.startswith('\\\\') or address.startswith('\\\\.\\')
+
+
+def key_file(address):
+    """Where a server without an explicit key publishes its per-run key"""
+    address = ':'.join(map(str, address)) if isinstance(address, tuple) else address
+    name = ''.join(ch if ch.isalnum() else '_' for ch in address).strip('_')
+    return Path(MODEL_SERVER_KEY_DIR) / f"model_server_{name}.key"
+
+
+def _as_bytes(authkey):
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def server_authkey(address, authkey=None):
+    """
+    Shared secret the server requires
+
+    multiprocessing.connection unpickles what clients send, so the key is
+    what keeps other processes from running code in the server. Without
+    an explicit key (argument or CAMPUS_MODEL_SERVER_KEY), a random one is
+    generated for this run; serve_forever writes it to an owner-only key
+    file that local clients read. Addresses reachable from other machines
+    need an explicit key.
+
+    Args:
+        address (tuple or str): Parsed listen address
+        authkey (str or bytes): Explicit key (None = MODEL_SERVER_AUTHKEY)
+
+    Returns:
+        tuple: (key bytes, key file to publish it in, or None)
+    """
+    authkey = authkey or MODEL_SERVER_AUTHKEY
+    if authkey:
+        return _as_bytes(authkey), None
+    if not is_loopback(address):
+        raise ValueError(f"{address} is reachable from other machines; "
+                         "set CAMPUS_MODEL_SERVER_KEY to a shared secret")
+    return secrets.token_bytes(32), key_file(address)
+
+
+def write_key_file(path, authkey):
+    """Write a key readable by this user only"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # os.open's mode only applies to new files
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(authkey.hex())
+
+
+def client_authkey(address, authkey=None):
+    """
+    Shared secret a client presents: explicit key, else the running server's key file
+
+    Raises:
+        ConnectionError: No key is set and no local server published one
+    """
+    authkey = authkey or MODEL_SERVER_AUTHKEY
+    if authkey:
+        return _as_bytes(authkey)
+    try:
+        return bytes.fromhex(key_file(address).read_text().strip())
+    except (OSError, ValueError):
+        raise ConnectionError(f"No key for the model server at {address}: start it on this "
+                              "machine or set CAMPUS_MODEL_SERVER_KEY") from None
+
+
+class FrameRing:
+    """
+    Fixed-size frame slots in one shared memory block
+
+    The client creates the block and owns its lifetime; the server attaches
+    to it by name.
+    """
+
+    def __init__(self, slots, slot_bytes, name=None):
+        """
+        Create (name=None) or attach to a ring
+
+        Args:
+            slots (int): Number of frame slots
+            slot_bytes (int): Bytes per slot (largest frame that fits)
+            name (str): Existing block to attach to
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner,
+                                              size=slots * slot_bytes)
+        if not self.owner and os.name == 'posix':
+            # Only the creating client may unlink the block; stop this
+            # process's resource tracker from removing it at exit
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def view(self, slot, shape, dtype='uint8'):
+        """
+        Array backed by a slot (no copy)
+
+        Args:
+            slot (int): Slot index
+            shape (tuple): Frame shape
+            dtype (str): Frame dtype
+
+        Returns:
+            numpy.ndarray: View into shared memory
+        """
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf,
+                          offset=slot * self.slot_bytes)
+
+    def close(self):
+        """Detach (and unlink, for the creating client)"""
+        try:
+            self.shm.close()
+        except BufferError:
+            # A view is still alive somewhere; the mapping goes with the process
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ModelServer:
+    """
+    Serves detection requests from camera clients with one set of models
+    """
+
+    def __init__(self, address=None, authkey=None, use_gpu=USE_GPU, batch_size=BATCH_SIZE,
+                 batch_wait_ms=BATCH_MAX_WAIT_MS, batch_deadline_ms=BATCH_DEADLINE_MS):
+        """
+        Initialize the server (models load on first use or via preload())
+
+        Args:
+            address (str or tuple): Listen address (default: MODEL_SERVER_ADDRESS)
+            authkey (str or bytes): Shared secret clients must present
+            use_gpu (bool): Run the models on the GPU when available
+            batch_size (int): Max frames per inference across cameras (1 = unbatched)
+            batch_wait_ms (float): Longest a frame waits to be batched
+            batch_deadline_ms (float): Drop frames queued longer than this
+        """
+        self.address = parse_address(address)
+        self.authkey, self.key_file = server_authkey(self.address, authkey)
+        self.use_gpu = use_gpu
+        self.batch_size = batch_size
+
+        self.models = {}
+        self._load_lock = threading.Lock()
+        # Recognizers are not thread-safe; one inference per model at a time
+        self._model_locks = {task: threading.Lock() for task in TASKS}
+
+        # Cross-camera micro-batching (see batch_scheduler.py)
+        self.schedulers = {}
+        if batch_size > 1:
+            self.schedulers = {
+                task: MicroBatchScheduler(
+                    lambda items, task=task: self.run_batch(task, items),
+                    max_batch_size=batch_size,
+                    max_wait_ms=batch_wait_ms,
+                    deadline_ms=batch_deadline_ms,
+                    name=task
+                )
+                for task in BATCHED_TASKS
+            }
+
+        self._listener = None
+        self._stopped = threading.Event()
+
+        self.stats = {
+            'clients_connected': 0,
+            'clients_active': 0,
+            'requests': 0,
+            'errors': 0,
+            'inference_seconds': {task: 0.0 for task in TASKS},
+            'requests_by_task': {task: 0 for task in TASKS}
+        }
+
+    def _load_model(self, task):
+        """Build the recognizer that answers a task"""
+        if task == 'vehicle_plates':
+            from vehicle_plate_recognizer import VehiclePlateRecognizer
+            return VehiclePlateRecognizer(use_gpu=self.use_gpu)
+        if task == 'id_cards':
+            from offline_id_card_recognizer import OfflineIDCardRecognizer
+            return OfflineIDCardRecognizer(use_gpu=self.use_gpu)
+        raise ValueError(f"Unknown task: {task}")
+
+    def get_model(self, task):
+        """Recognizer for a task, loaded once and shared by all clients"""
+        model = self.models.get(task)
+        if model is None:
+            with self._load_lock:
+                model = self.models.get(task)
+                if model is None:
+                    print(f"\n📦 Loading model for '{task}'...")
+                    model = self._load_model(task)
+                    self._warm_batch(task, model)
+                    self.models[task] = model
+        return model
+
+    def _warm_batch(self, task, model):
+        """Warm YOLO at the full batch size too (a batch is a new input shape)"""
+        if task not in self.schedulers or not getattr(model, 'ready', False):
+            return
+        frames = [synthetic_frame() for _ in range(self.batch_size)]
+        model.warmup_report['yolo_batch'] = time_warmup(
+            lambda: model.model(frames, conf=YOLO_CONFIDENCE_THRESHOLD, imgsz=model.imgsz, verbose=False)
+        )
+        print_warmup_report({'yolo_batch': model.warmup_report['yolo_batch']})
+
+    def ready_tasks(self):
+        """Tasks whose models are loaded and warmed up"""
+        return [task for task, model in self.models.items() if getattr(model, 'ready', False)]
+
+    def preload(self, tasks):
+        """Load and warm up models before accepting clients"""
+        for task in tasks:
+            if task != 'ping':
+                self.get_model(task)
+
+    def run_task(self, task, frame, params=None):
+        """
+        Run one task on a frame
+
+        Args:
+            task (str): One of TASKS
+            frame (numpy.ndarray): BGR frame (may be a shared-memory view)
+            params (dict): Task parameters (frame_number, timestamp, quality)
+
+        Returns:
+            tuple: (result dict, annotated frame or None)
+        """
+        params = params or {}
+        if task == 'ping':
+            return {'shape': list(frame.shape), 'checksum': int(frame[::64, ::64].sum()),
+                    'ready': self.ready_tasks()}, None
+
+        model = self.get_model(task)
+        with self._model_locks[task]:
+            self._apply_quality(model, params)
+            if task == 'vehicle_plates':
+                # Draws on the frame in place, i.e. straight into the client's slot
+                return model.detect_and_extract(frame, params.get('frame_number', 0),
+                                                params.get('timestamp'))
+
+            cards, annotated = model.recognize_id_card(frame)
+
+        id_cards = []
+        for card in cards:
+            # Crops are not sent back; the client has the frame and the bbox
+            data = dict(card['data'])
+            data['is_valid'] = data.get('moodle_id') is not None
+            id_cards.append(data)
+        return {'id_cards': id_cards}, annotated
+
+    def run_batch(self, task, items):
+        """
+        Run one task on frames from several cameras
+
+        Clients degrade independently, so frames are grouped by the quality
+        their client asked for and each group gets its own YOLO pass at that
+        quality; a batch mixing two levels costs two passes. Frames without a
+        quality run first, at the server's current settings.
+
+        Args:
+            task (str): One of BATCHED_TASKS
+            items (list): (frame, params) tuples
+
+        Returns:
+            list: (result dict, annotated frame) per item, in order
+        """
+        if task != 'vehicle_plates':
+            return [self.run_task(task, frame, item_params) for frame, item_params in items]
+
+        model = self.get_model(task)
+        params = [item_params or {} for _, item_params in items]
+        groups = {}
+        for index, item_params in enumerate(params):
+            quality = tuple(sorted((item_params.get('quality') or {}).items()))
+            groups.setdefault(quality, []).append(index)
+
+        results = [None] * len(items)
+        with self._model_locks[task]:
+            for quality in sorted(groups, key=len):
+                indexes = groups[quality]
+                self._apply_quality(model, params[indexes[0]])
+                batch = model.detect_and_extract_batch(
+                    [items[i][0] for i in indexes],
+                    [params[i].get('frame_number', 0) for i in indexes],
+                    [params[i].get('timestamp') for i in indexes]
+                )
+                for index, result in zip(indexes, batch):
+                    results[index] = result
+        return results
+
+    def _apply_quality(self, model, params):
+        """Use the quality level the client's degradation controller asked for"""
+        quality = params.get('quality')
+        if quality and hasattr(model, 'set_quality'):
+            model.set_quality(**quality)
+
+    def serve_forever(self):
+        """Accept camera clients until stop() is called"""
+        self._listener = Listener(self.address, authkey=self.authkey)
+        print(f"🧠 Model server listening on {self.address}")
+        if self.key_file:
+            # Only once bound, so a second server cannot replace a running one's key
+            write_key_file(self.key_file, self.authkey)
+            print(f"   Per-run key: {self.key_file} (set CAMPUS_MODEL_SERVER_KEY to share one)")
+        print(f"   Models loaded: {', '.join(self.models) or 'none (load on first request)'}")
+
+        while not self._stopped.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._stopped.is_set():
+                    break
+                continue
+            except Exception as e:
+                print(f"⚠️  Rejected client: {e}")
+                continue
+            threading.Thread(target=self._serve_client, args=(conn,),
+                             name='model-client', daemon=True).start()
+
+    def stop(self):
+        """Stop accepting clients"""
+        self._stopped.set()
+        if self._listener:
+            self._listener.close()
+        if self.key_file:
+            self.key_file.unlink(missing_ok=True)
+            self.key_file = None
+        for scheduler in self.schedulers.values():
+            scheduler.stop()
+
+    def _serve_client(self, conn):
+        """Answer one client's requests in order"""
+        ring = None
+        self.stats['clients_connected'] += 1
+        self.stats['clients_active'] += 1
+        try:
+            hello = conn.recv()
+            ring = FrameRing(hello['slots'], hello['slot_bytes'], name=hello['shm'])
+            conn.send({'ok': True, 'tasks': list(TASKS), 'pid': os.getpid()})
+            client = hello.get('name', 'camera')
+            print(f"🔌 Camera client connected: {client}")
+
+            while True:
+                request = conn.recv()
+                conn.send(self._handle(ring, request, client))
+        except (EOFError, ConnectionError):
+            pass
+        except Exception as e:
+            print(f"⚠️  Client error: {e}")
+        finally:
+            self.stats['clients_active'] -= 1
+            conn.close()
+            if ring:
+                ring.close()
+
+    def _handle(self, ring, request, client='camera'):
+        """Run a request and build its response"""
+        response = {'id': request['id'], 'ok': True, 'annotated': False}
+        task = request['task']
+        inline = 'frame' in request
+        start = time.perf_counter()
+
+        try:
+            if task not in TASKS:
+                raise ValueError(f"Unknown task: {task}")
+            frame = request['frame'] if inline else ring.view(request['slot'], request['shape'], request['dtype'])
+            scheduler = self.schedulers.get(task)
+            if scheduler:
+                # Waits for the batch this frame joins; the shared-memory view
+                # stays valid because the client holds the slot until we answer
+                result, annotated = scheduler.run((frame, request.get('params')), source=client,
+                                                  deadline_ms=request.get('deadline_ms'))
+            else:
+                result, annotated = self.run_task(task, frame, request.get('params'))
+
+            if annotated is not None and annotated.shape == frame.shape:
+                if inline:
+                    response['frame'] = annotated
+                elif annotated is not frame:
+                    np.copyto(frame, annotated)
+                response['annotated'] = True
+            response['result'] = result
+        except Exception as e:
+            self.stats['errors'] += 1
+            response.update({'ok': False, 'error': str(e)})
+        finally:
+            # Release the shared-memory view before the slot is reused
+            frame = annotated = None
+
+        elapsed = time.perf_counter() - start
+        response['seconds'] = round(elapsed, 4)
+        self.stats['requests'] += 1
+        if task in TASKS:
+            self.stats['requests_by_task'][task] += 1
+            self.stats['inference_seconds'][task] += elapsed
+        return response
+
+    def get_stats(self):
+        """
+        Server statistics
+
+        Returns:
+            dict: Client counts, requests, errors, per-task timings, warm-up and stage latency
+        """
+        stats = dict(self.stats)
+        stats['models_loaded'] = list(self.models)
+        stats['models_ready'] = self.ready_tasks()
+        stats['warmup'] = {task: getattr(model, 'warmup_report', None) for task, model in self.models.items()}
+        stats['stage_latency'] = {task: model.timing.report() for task, model in self.models.items()
+                                  if getattr(model, 'timing', None)}
+        stats['shared_models'] = loaded_models()
+        stats['batching'] = {task: scheduler.get_stats() for task, scheduler in self.schedulers.items()}
+        stats['avg_inference_ms'] = {
+            task: round(seconds / count * 1000, 2)
+            for task, seconds in self.stats['inference_seconds'].items()
+            if (count := self.stats['requests_by_task'][task])
+        }
+        return stats
+
+
+class ModelClient:
+    """
+    Camera-side connection to the model server
+
+    Not thread-safe: give each camera thread / process its own client.
+    """
+
+    def __init__(self, address=None, authkey=None, slots=MODEL_SERVER_SLOTS,
+                 max_frame_shape=(CAMERA_HEIGHT, CAMERA_WIDTH, 3), name='camera'):
+        """
+        Connect and register a shared-memory ring
+
+        Args:
+            address (str or tuple): Server address (default: MODEL_SERVER_ADDRESS)
+            authkey (str or bytes): Shared secret
+            slots (int): Frames that can be in flight at once
+            max_frame_shape (tuple): Largest frame sent through shared memory;
+                bigger frames are sent inline over the socket
+            name (str): Client name shown by the server
+        """
+        self.address = parse_address(address)
+        self.conn = Client(self.address, authkey=client_authkey(self.address, authkey))
+        self.ring = FrameRing(slots, int(np.prod(max_frame_shape)))
+        self.conn.send({'shm': self.ring.name, 'slots': slots,
+                        'slot_bytes': self.ring.slot_bytes, 'name': name})
+        hello = self.conn.recv()
+        self.tasks = hello['tasks']
+        self.server_pid = hello['pid']
+
+        self._free_slots = collections.deque(range(slots))
+        self._in_flight = {}      # request id -> (slot, shape, dtype)
+        self._responses = {}      # answered but not yet collected
+        self._next_id = 0
+        self._warned_inline = False
+
+    def submit(self, task, frame, deadline_ms=None, **params):
+        """
+        Send a frame for processing without waiting for the result
+
+        Args:
+            task (str): One of TASKS
+            frame (numpy.ndarray): Frame to process
+            deadline_ms (float): Drop the frame if it cannot start within this
+                long on a batching server (default: server's BATCH_DEADLINE_MS)
+            **params: Task parameters (frame_number, timestamp)
+
+        Returns:
+            int: Request id for result()
+        """
+        self._next_id += 1
+        request = {'id': self._next_id, 'task': task, 'params': params, 'deadline_ms': deadline_ms}
+
+        frame = np.ascontiguousarray(frame)
+        if frame.nbytes <= self.ring.slot_bytes:
+            if not self._free_slots:
+                raise RuntimeError("All shared-memory slots are in flight; call result() first")
+            slot = self._free_slots.popleft()
+            np.copyto(self.ring.view(slot, frame.shape, frame.dtype), frame)
+            request.update({'slot': slot, 'shape': frame.shape, 'dtype': frame.dtype.str})
+            self._in_flight[self._next_id] = (slot, frame.shape, frame.dtype.str)
+        else:
+            if not self._warned_inline:
+                print(f"⚠️  Frame {frame.shape} exceeds the shared-memory slot; sending inline")
+                self._warned_inline = True
+            request['frame'] = frame
+            self._in_flight[self._next_id] = None
+
+        self.conn.send(request)
+        return self._next_id
+
+    def result(self, request_id):
+        """
+        Wait for a submitted request
+
+        Args:
+            request_id (int): Id returned by submit()
+
+        Returns:
+            tuple: (result dict, annotated frame copy or None)
+        """
+        while request_id not in self._responses:
+            response = self.conn.recv()
+            self._responses[response['id']] = response
+        response = self._responses.pop(request_id)
+
+        annotated = response.get('frame')
+        placement = self._in_flight.pop(request_id)
+        if placement:
+            slot, shape, dtype = placement
+            if response['annotated']:
+                annotated = self.ring.view(slot, shape, dtype).copy()
+            self._free_slots.append(slot)
+
+        if not response['ok']:
+            raise RuntimeError(f"Model server error: {response['error']}")
+        return response['result'], annotated
+
+    def run(self, task, frame, deadline_ms=None, **params):
+        """Submit a frame and wait for its result"""
+        return self.result(self.submit(task, frame, deadline_ms, **params))
+
+    def detect_plates(self, frame, frame_number=0, timestamp=None, quality=None):
+        """
+        Vehicle plate detection (same shape as VehiclePlateRecognizer.detect_and_extract)
+
+        Args:
+            quality (dict): Recognizer settings (see degradation.py); None = server's current
+
+        Returns:
+            tuple: (results dict with 'detections', annotated frame)
+        """
+        results, annotated = self.run('vehicle_plates', frame, frame_number=frame_number,
+                                      timestamp=timestamp, quality=quality)
+        return results, annotated if annotated is not None else frame
+
+    def recognize_id_cards(self, frame, quality=None):
+        """
+        ID card recognition
+
+        Args:
+            quality (dict): Recognizer settings (see degradation.py); None = server's current
+
+        Returns:
+            tuple: (results dict with 'id_cards', annotated frame)
+        """
+        results, annotated = self.run('id_cards', frame, quality=quality)
+        return results, annotated if annotated is not None else frame
+
+    def close(self):
+        """Disconnect and free the shared-memory ring"""
+        try:
+            self.conn.close()
+        finally:
+            self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def ping(address=None, count=100):
+    """Round-trip blank camera frames through the server and print latency"""
+    frame = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    with ModelClient(address, name='ping') as client:
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            result, _ = client.run('ping', frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"✅ Server {client.address} (pid {client.server_pid}) answered {count} pings")
+    print(f"   Round trip p50: {latencies[len(latencies) // 2]:.3f} ms, "
+          f"max: {latencies[-1]:.3f} ms")
+    print(f"   Models ready: {', '.join(result['ready']) or 'none (loaded on first request; use --preload)'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared YOLO / EasyOCR model server for camera processes')
+    parser.add_argument('--address', default=MODEL_SERVER_ADDRESS,
+                        help='host:port or socket path (default: CAMPUS_MODEL_SERVER env)')
+    parser.add_argument('--preload', nargs='*', choices=TASKS[1:], default=[],
+                        help='Load these models before accepting clients')
+    parser.add_argument('--cpu', action='store_true', help='Do not use the GPU')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Max frames per batched inference, 1 disables batching (default: {BATCH_SIZE})')
+    parser.add_argument('--batch-wait-ms', type=float, default=BATCH_MAX_WAIT_MS,
+                        help=f'Longest a frame waits to be batched (default: {BATCH_MAX_WAIT_MS})')
+    parser.add_argument('--deadline-ms', type=float, default=BATCH_DEADLINE_MS,
+                        help=f'Drop frames queued longer than this (default: {BATCH_DEADLINE_MS})')
+    parser.add_argument('--ping', action='store_true',
+                        help='Check a running server instead of starting one')
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                        help='Serve Prometheus metrics on this port (default: CAMPUS_METRICS_PORT env, off)')
+    parser.add_argument('--profile', type=float, nargs='?', const=PROFILE_SECONDS, metavar='SECONDS',
+                        help=f'Capture a sampling profile once serving (default window: {PROFILE_SECONDS:g}s); '
+                             'kill -USR1 <pid> captures one at any time')
+    args = parser.parse_args()
+
+    if args.ping:
+        ping(args.address)
+        return
+
+    try:
+        server = ModelServer(args.address, use_gpu=USE_GPU and not args.cpu, batch_size=args.batch_size,
+                             batch_wait_ms=args.batch_wait_ms, batch_deadline_ms=args.deadline_ms)
+    except ValueError as e:
+        print(f"❌ Refusing to start: {e}")
+        sys.exit(1)
+    server.preload(args.preload)
+    metrics = None
+    if args.metrics_port:
+        from metrics_server import MetricsServer, model_server_metrics
+        metrics = MetricsServer(model_server_metrics(server), port=args.metrics_port).start()
+    from profiling import start_profiler
+    profiler = start_profiler('model_server', lambda: {task: model.timing for task, model in list(server.models.items())},
+                              seconds=args.profile)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping model server")
+    finally:
+        profiler.stop()
+        if metrics:
+            metrics.stop()
+        server.stop()
+        print(f"📊 {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Model Warm-Up
+The first YOLO / EasyOCR call after a start is several times slower than the
+steady state: lazy allocations, CUDA context creation and kernel selection
+all happen on it. Recognizers run their models on synthetic inputs of the
+real sizes (camera frame, plate crop, ID card crop) before they report ready,
+so that cost is paid at start-up instead of by the first car at the gate.
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import CAMERA_WIDTH, CAMERA_HEIGHT, PLATE_CROP_SIZE, ID_CARD_CROP_SIZE, WARMUP_RUNS
+
+
+def _draw_lines(image, lines, color=(0, 0, 0)):
+    """Write text lines filling the image width (what OCR will find)"""
+    height, width = image.shape[:2]
+    line_height = height // (len(lines) + 1)
+    for i, text in enumerate(lines):
+        (text_width, _), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)
+        scale = min(0.9 * width / text_width, 0.7 * line_height / 22)
+        cv2.putText(image, text, (int(0.05 * width), line_height * (i + 1) + int(11 * scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, scale, color, max(1, int(2 * scale)))
+    return image
+
+
+def synthetic_plate(size=PLATE_CROP_SIZE, text='MH12AB1234'):
+    """
+    Plate crop: white plate, black border and characters
+
+    Args:
+        size (tuple): (width, height)
+        text (str): Plate number to draw
+
+    Returns:
+        numpy.ndarray: BGR image
+    """
+    width, height = size
+    plate = np.full((height, width, 3), 255, dtype=np.uint8)
+    cv2.rectangle(plate, (1, 1), (width - 2, height - 2), (0, 0, 0), 2)
+    return _draw_lines(plate, [text])
+
+
+def synthetic_id_card(size=ID_CARD_CROP_SIZE):
+    """
+    ID card crop with name, ID and department lines
+
+    Args:
+        size (tuple): (width, height)
+
+    Returns:
+        numpy.ndarray: BGR image
+    """
+    width, height = size
+    card = np.full((height, width, 3), 235, dtype=np.uint8)
+    return _draw_lines(card, ['A P SHAH INSTITUTE', 'RAHUL SHARMA', '22102003', 'COMPUTER ENGINEERING'])
+
+
+def synthetic_frame(size=(CAMERA_WIDTH, CAMERA_HEIGHT), insert=None):
+    """
+    Camera frame: sensor-like noise with an optional crop pasted in the middle
+
+    Args:
+        size (tuple): (width, height), default the camera resolution
+        insert (numpy.ndarray): Plate / card image to paste
+
+    Returns:
+        numpy.ndarray: BGR frame
+    """
+    width, height = size
+    frame = np.random.default_rng(0).integers(60, 190, (height, width, 3), dtype=np.uint8)
+    if insert is not None:
+        h, w = min(insert.shape[0], height), min(insert.shape[1], width)
+        y, x = (height - h) // 2, (width - w) // 2
+        frame[y:y + h, x:x + w] = insert[:h, :w]
+    return frame
+
+
+def time_warmup(call, runs=WARMUP_RUNS):
+    """
+    Call a model repeatedly; the first call is the cold one
+
+    Args:
+        call (callable): One inference
+        runs (int): Calls to make (at least 2)
+
+    Returns:
+        dict: cold_ms, warm_ms (median of the later calls) and slowdown (cold / warm)
+    """
+    latencies = []
+    for _ in range(max(2, runs)):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    cold, warm = latencies[0], statistics.median(latencies[1:])
+    return {
+        'cold_ms': round(cold, 1),
+        'warm_ms': round(warm, 1),
+        'slowdown': round(cold / warm, 1) if warm else None
+    }
+
+
+def print_warmup_report(report):
+    """Print cold vs warm latency per model"""
+    print("\n🔥 Warm-up (cold -> warm):")
+    for model, timing in report.items():
+        print(f"   {model:<8} {timing['cold_ms']:>8.1f} ms -> {timing['warm_ms']:>7.1f} ms "
+              f"({timing['slowdown']}x)")
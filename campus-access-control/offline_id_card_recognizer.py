@@ -5,19 +5,20 @@ Uses YOLO for detection + EasyOCR for text extraction
 """
 
 import cv2
-import torch
-import easyocr
 import numpy as np
 import json
 import re
 from datetime import datetime
 from pathlib import Path
-from ultralytics import YOLO
 import sys
 
 # Add config to path
 sys.path.append(str(Path(__file__).resolve().parent))
 from config.config import *
+from camera_capture import open_camera, camera_source
+from model_registry import get_yolo, get_ocr_reader, resolve_device
+from model_warmup import synthetic_frame, synthetic_id_card, time_warmup, print_warmup_report
+from pipeline_timing import PipelineTimer
 
 # Detection constants
 YOLO_CONFIDENCE = 0.25  # YOLO detection confidence threshold
@@ -27,8 +28,6 @@ ID_CARD_SAVE_COOLDOWN = 3.0  # Cooldown between saves (seconds)
 # Output directories
 OUTPUT_ID_CARD_DATA = Path("outputs/id_card_data")
 OUTPUT_CAPTURED_FRAMES = Path("outputs/captured_frames")
-OUTPUT_ID_CARD_DATA.mkdir(parents=True, exist_ok=True)
-OUTPUT_CAPTURED_FRAMES.mkdir(parents=True, exist_ok=True)
 
 
 class OfflineIDCardRecognizer:
@@ -37,16 +36,19 @@ class OfflineIDCardRecognizer:
     Uses local YOLO + EasyOCR - no API calls
     """
     
-    def __init__(self, yolo_model_path=None, use_gpu=True):
+    def __init__(self, yolo_model_path=None, use_gpu=True, warmup=WARMUP_ON_INIT):
         """
         Initialize offline ID card recognizer
         
         Args:
             yolo_model_path (str): Path to YOLO model (optional)
             use_gpu (bool): Use GPU acceleration
+            warmup (bool): Run the models once before returning (see warmup())
         """
         self.use_gpu = use_gpu
-        self.device = 'cuda' if (use_gpu and torch.cuda.is_available()) else 'cpu'
+        self.device = resolve_device(use_gpu)
+        OUTPUT_ID_CARD_DATA.mkdir(parents=True, exist_ok=True)
+        OUTPUT_CAPTURED_FRAMES.mkdir(parents=True, exist_ok=True)
         
         print("=" * 70)
         print("🎴 OFFLINE ID CARD RECOGNITION SYSTEM")
@@ -54,6 +56,7 @@ class OfflineIDCardRecognizer:
         print(f"🔧 Device: {self.device.upper()}")
         
         if self.device == 'cuda':
+            import torch
             print(f"🎮 GPU: {torch.cuda.get_device_name(0)}")
             print(f"🔥 CUDA Version: {torch.version.cuda}")
         
@@ -62,8 +65,8 @@ class OfflineIDCardRecognizer:
         print(f"\n📦 Loading YOLO model: {self.yolo_model_path}")
         
         try:
-            self.yolo_model = YOLO(str(self.yolo_model_path))
-            self.yolo_model.to(self.device)
+            # Shared with any other recognizer using the same weights
+            self.yolo_model = get_yolo(self.yolo_model_path, self.device).load()
             print("✅ YOLO model loaded successfully")
         except Exception as e:
             print(f"⚠️  YOLO model not found: {e}")
@@ -72,11 +75,11 @@ class OfflineIDCardRecognizer:
         
         # Initialize EasyOCR for text extraction
         print(f"\n📝 Initializing EasyOCR (GPU: {OCR_GPU})...")
-        self.reader = easyocr.Reader(
+        self.reader = get_ocr_reader(
             OCR_LANGUAGES,
-            gpu=OCR_GPU,
+            use_gpu=OCR_GPU,
             verbose=False
-        )
+        ).load()
         print("✅ EasyOCR initialized successfully")
         
         # Invalid name patterns (cannot be names)
@@ -105,11 +108,67 @@ class OfflineIDCardRecognizer:
             'frames_processed': 0,
             'cards_detected': 0,
             'cards_recognized': 0,
-            'ids_extracted': 0
+            'ids_extracted': 0,
+            'ocr_calls': 0
         }
         
+        # Per-stage latency histograms (decode, detect, preprocess, ocr, parse)
+        self.timing = PipelineTimer(enabled=PIPELINE_TIMING)
+        
         # Last save time
         self.last_save_time = datetime.min
+        
+        # Quality settings (lowered by degradation.py under load)
+        self.imgsz = YOLO_IMAGE_SIZE
+        self.denoise = True
+        self.fast_preprocess = False
+        
+        # Not ready until the models have run once
+        self.ready = False
+        self.warmup_report = None
+        if warmup:
+            self.warmup()
+    
+    def set_quality(self, imgsz=None, denoise=None, fast_preprocess=None):
+        """
+        Trade accuracy for speed (used by the degradation controller)
+        
+        Args:
+            imgsz (int): YOLO input size
+            denoise (bool): Run fastNlMeansDenoising before OCR
+            fast_preprocess (bool): Grayscale + resize only before OCR
+        """
+        if imgsz is not None:
+            self.imgsz = imgsz
+        if denoise is not None:
+            self.denoise = denoise
+        if fast_preprocess is not None:
+            self.fast_preprocess = fast_preprocess
+    
+    def warmup(self, runs=WARMUP_RUNS):
+        """
+        Run YOLO on a camera-sized frame and EasyOCR on an ID card crop, then
+        mark the recognizer ready
+        
+        Args:
+            runs (int): Passes per model (the first one is the cold one)
+            
+        Returns:
+            dict: Cold / warm latency per model
+        """
+        card = synthetic_id_card()
+        frame = synthetic_frame(insert=card)
+        crop = self.preprocess_for_ocr(card)
+        
+        report = {}
+        if self.yolo_model:
+            report['yolo'] = time_warmup(lambda: self.detect_id_card_yolo(frame), runs)
+        report['easyocr'] = time_warmup(lambda: self.reader.readtext(crop, detail=1), runs)
+        
+        self.warmup_report = report
+        self.ready = True
+        print_warmup_report(report)
+        return report
     
     def detect_id_card_opencv(self, frame):
         """
@@ -161,7 +220,7 @@ class OfflineIDCardRecognizer:
         Returns:
             list: Detected card bounding boxes [(x, y, w, h, confidence), ...]
         """
-        results = self.yolo_model(frame, conf=YOLO_CONFIDENCE, iou=YOLO_IOU, verbose=False)
+        results = self.yolo_model(frame, conf=YOLO_CONFIDENCE, iou=YOLO_IOU, imgsz=self.imgsz, verbose=False)
         
         detections = []
         for result in results:
@@ -193,12 +252,18 @@ class OfflineIDCardRecognizer:
         else:
             gray = image
         
+        if self.fast_preprocess:
+            return gray
+        
         # Increase contrast using CLAHE
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
         enhanced = clahe.apply(gray)
         
         # Denoise
-        denoised = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
+        if self.denoise:
+            denoised = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
+        else:
+            denoised = enhanced
         
         # Sharpen
         kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
@@ -280,11 +345,14 @@ class OfflineIDCardRecognizer:
             list: OCR results [(bbox, text, confidence), ...]
         """
         # Preprocess
-        preprocessed = self.preprocess_for_ocr(image)
+        with self.timing.stage('preprocess'):
+            preprocessed = self.preprocess_for_ocr(image)
         
         # Run OCR
         try:
-            results = self.reader.readtext(preprocessed, detail=1)
+            self.stats['ocr_calls'] += 1
+            with self.timing.stage('ocr'):
+                results = self.reader.readtext(preprocessed, detail=1)
             return results
         except Exception as e:
             print(f"⚠️  OCR error: {e}")
@@ -443,10 +511,11 @@ class OfflineIDCardRecognizer:
         recognized_cards = []
         
         # Step 1: Detect ID cards
-        if self.yolo_model:
-            detections = self.detect_id_card_yolo(frame)
-        else:
-            detections = self.detect_id_card_opencv(frame)
+        with self.timing.stage('detect'):
+            if self.yolo_model:
+                detections = self.detect_id_card_yolo(frame)
+            else:
+                detections = self.detect_id_card_opencv(frame)
         
         self.stats['cards_detected'] += len(detections)
         
@@ -459,7 +528,8 @@ class OfflineIDCardRecognizer:
             ocr_results = self.extract_text_with_ocr(card_image)
             
             # Step 4: Parse structured data
-            card_data, photo = self.parse_id_card_data(ocr_results, card_image)
+            with self.timing.stage('parse'):
+                card_data, photo = self.parse_id_card_data(ocr_results, card_image)
             
             # Add detection info
             card_data['detection_bbox'] = {'x': x, 'y': y, 'w': w, 'h': h}
@@ -553,10 +623,12 @@ class OfflineIDCardRecognizer:
         Process live camera stream
         
         Args:
-            camera_index: Camera index
+            camera_index: Camera index (or a recording to replay)
             save_auto: Auto-save valid detections
         """
-        cap = cv2.VideoCapture(camera_index)
+        # Threaded capture: recognition always runs on the newest frame
+        cap = open_camera(camera_index, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, name='id-cards',
+                          timer=self.timing)
         
         if not cap.isOpened():
             print(f"❌ Failed to open camera {camera_index}")
@@ -623,9 +695,11 @@ class OfflineIDCardRecognizer:
             print(f"\n✅ Session complete!")
             print(f"📊 Stats:")
             print(f"   Frames processed: {self.stats['frames_processed']}")
+            print(f"   Stale frames dropped: {cap.get_stats()['frames_dropped']}")
             print(f"   Cards detected: {self.stats['cards_detected']}")
             print(f"   Cards recognized: {self.stats['cards_recognized']}")
             print(f"   IDs extracted: {self.stats['ids_extracted']}")
+            self.timing.print_report()
     
     def process_single_image(self, image_path):
         """
@@ -673,10 +747,14 @@ def main():
     
     parser = argparse.ArgumentParser(description='Offline ID Card Recognition System')
     parser.add_argument('--camera', action='store_true', help='Use camera stream')
-    parser.add_argument('--camera-index', type=int, default=0, help='Camera index (default: 0)')
+    parser.add_argument('--camera-index', type=camera_source, default=0,
+                        help='Camera index, or a video / image directory to replay as a camera (default: 0)')
     parser.add_argument('--image', type=str, help='Path to ID card image')
     parser.add_argument('--model', type=str, help='Path to YOLO model')
     parser.add_argument('--no-gpu', action='store_true', help='Disable GPU acceleration')
+    parser.add_argument('--profile', type=float, nargs='?', const=PROFILE_SECONDS, metavar='SECONDS',
+                        help=f'Capture a sampling profile once running (default window: {PROFILE_SECONDS:g}s); '
+                             'kill -USR1 <pid> captures one at any time')
     
     args = parser.parse_args()
     
@@ -686,6 +764,9 @@ def main():
         use_gpu=not args.no_gpu
     )
     
+    from profiling import start_profiler
+    profiler = start_profiler('id_cards', {'id_cards': recognizer.timing}, seconds=args.profile)
+    
     if args.camera:
         # Camera mode
         recognizer.process_camera_stream(camera_index=args.camera_index)
@@ -697,6 +778,7 @@ def main():
         print("\nExamples:")
         print("  python offline_id_card_recognizer.py --camera")
         print("  python offline_id_card_recognizer.py --image test.jpg")
+    profiler.stop()
 
 
 if __name__ == "__main__":
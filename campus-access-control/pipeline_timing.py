@@ -0,0 +1,280 @@
+"""
+Pipeline Stage Timing
+Per-stage latency (decode, detection, crop/preprocess, OCR, parsing,
+decision, log / DB write) measured with the monotonic perf_counter clock and kept in
+fixed-size log-bucketed histograms, HDR-histogram style: each power of two
+is split into 32 linear sub-buckets, so any percentile is within ~3% of the
+true value and memory does not grow with uptime. Timing a stage costs about
+3 microseconds against tens of milliseconds per frame for detection and OCR,
+so it stays on in production.
+
+The stage each thread is in is also kept (active_stage), so a sampling
+profiler can attribute stack samples to pipeline stages.
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+
+# Pipeline stages, in order; end_to_end is frame capture to access decision
+STAGES = ('decode', 'detect', 'preprocess', 'ocr', 'parse', 'decision', 'log_write', 'db_write', 'end_to_end')
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # Linear sub-buckets per power of two
+MAX_MICROSECONDS = 1 << 27  # ~134 s; slower samples land in the last bucket
+
+
+def _bucket_index(microseconds):
+    """Bucket for a value: exact below SUB_BUCKETS, log-linear above"""
+    if microseconds < SUB_BUCKETS:
+        return microseconds
+    exponent = microseconds.bit_length() - 1 - SUB_BUCKET_BITS
+    return SUB_BUCKETS * (exponent + 1) + (microseconds >> exponent) - SUB_BUCKETS
+
+
+def _bucket_value(index):
+    """Midpoint (in microseconds) of the values a bucket holds"""
+    if index < SUB_BUCKETS:
+        return float(index)
+    exponent = index // SUB_BUCKETS - 1
+    lowest = (index % SUB_BUCKETS + SUB_BUCKETS) << exponent
+    return lowest + ((1 << exponent) - 1) / 2
+
+
+BUCKET_COUNT = _bucket_index(MAX_MICROSECONDS - 1) + 1
+
+# Thread ident -> stage it is timing right now (innermost)
+_active_stages = {}
+
+
+def active_stage(thread_id):
+    """Stage a thread is inside (None outside any timed stage)"""
+    return _active_stages.get(thread_id)
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram with percentile queries
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """
+        Add one sample
+
+        Args:
+            seconds (float): Latency in seconds
+        """
+        microseconds = min(int(seconds * 1e6), MAX_MICROSECONDS - 1) if seconds > 0 else 0
+        index = _bucket_index(microseconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+
+    def percentile(self, percent):
+        """
+        Latency at a percentile
+
+        Args:
+            percent (float): 0-100
+
+        Returns:
+            float: Seconds (None without samples)
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, int(round(percent / 100 * self.count)))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return min(_bucket_value(index) / 1e6, self.max_seconds)
+        return self.max_seconds
+
+    def merge(self, other):
+        """Add another histogram's samples to this one"""
+        with self._lock:
+            for index, count in enumerate(other.counts):
+                if count:
+                    self.counts[index] += count
+            self.count += other.count
+            self.total_seconds += other.total_seconds
+            self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    def copy(self):
+        """Independent copy of the samples so far"""
+        clone = LatencyHistogram()
+        with self._lock:
+            clone.counts = list(self.counts)
+            clone.count = self.count
+            clone.total_seconds = self.total_seconds
+            clone.max_seconds = self.max_seconds
+        return clone
+
+    def since(self, earlier):
+        """
+        Samples recorded after an earlier copy() of this histogram
+
+        Args:
+            earlier (LatencyHistogram): Copy taken before
+
+        Returns:
+            LatencyHistogram: The difference (max is the highest bucket seen)
+        """
+        window = self.copy()
+        if earlier is None or earlier.count > window.count:
+            return window  # Reset in between: everything is new
+        top = None
+        for index, count in enumerate(earlier.counts):
+            window.counts[index] -= count
+            if window.counts[index]:
+                top = index
+        for index in range(len(earlier.counts), len(window.counts)):
+            if window.counts[index]:
+                top = index
+        window.count -= earlier.count
+        window.total_seconds -= earlier.total_seconds
+        window.max_seconds = min(_bucket_value(top) / 1e6, self.max_seconds) if top is not None else 0.0
+        return window
+
+    def summary(self):
+        """
+        Count, mean, p50 / p95 / p99 and max in milliseconds
+
+        Returns:
+            dict: Summary (None values without samples)
+        """
+        def ms(seconds):
+            return round(seconds * 1000, 2) if seconds is not None else None
+
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total_seconds / self.count) if self.count else None,
+            'p50_ms': ms(self.percentile(50)),
+            'p95_ms': ms(self.percentile(95)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max_seconds) if self.count else None
+        }
+
+
+class _StageTimer:
+    """Context manager that records its block's duration"""
+
+    __slots__ = ('histogram', 'name', 'start', 'thread_id', 'outer')
+
+    def __init__(self, histogram, name):
+        self.histogram = histogram
+        self.name = name
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self.outer = _active_stages.get(self.thread_id)
+        _active_stages[self.thread_id] = self.name
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.record(time.perf_counter() - self.start)
+        if self.outer is None:
+            _active_stages.pop(self.thread_id, None)
+        else:
+            _active_stages[self.thread_id] = self.outer
+        return False
+
+
+class PipelineTimer:
+    """
+    One histogram per pipeline stage
+
+    Usage:
+        with timer.stage('ocr'):
+            results = reader.readtext(crop)
+    """
+
+    def __init__(self, stages=STAGES, enabled=True):
+        """
+        Args:
+            stages (iterable): Stage names (more are added on first use)
+            enabled (bool): False makes stage() / record() no-ops
+        """
+        self.enabled = enabled
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def _histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def stage(self, name):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return nullcontext()
+        return _StageTimer(self._histogram(name), name)
+
+    def record(self, name, seconds):
+        """Record a duration measured elsewhere (e.g. capture-to-decision)"""
+        if self.enabled:
+            self._histogram(name).record(seconds)
+
+    def reset(self):
+        """Drop all samples (e.g. between videos)"""
+        for name in list(self.histograms):
+            self.histograms[name] = LatencyHistogram()
+
+    def merge(self, other):
+        """Add another timer's samples (e.g. per-worker timers)"""
+        for name, histogram in other.histograms.items():
+            self._histogram(name).merge(histogram)
+
+    def snapshot(self):
+        """Copy of every histogram, for report_since()"""
+        return {name: histogram.copy() for name, histogram in list(self.histograms.items())}
+
+    def report_since(self, snapshot):
+        """
+        Per-stage summaries of the samples recorded after snapshot()
+
+        Args:
+            snapshot (dict): Output of snapshot()
+
+        Returns:
+            dict: stage -> {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}
+        """
+        report = {}
+        for name, histogram in list(self.histograms.items()):
+            window = histogram.since(snapshot.get(name))
+            if window.count:
+                report[name] = window.summary()
+        return report
+
+    def report(self):
+        """
+        Per-stage summaries, stages without samples left out
+
+        Returns:
+            dict: stage -> {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}
+        """
+        return {name: histogram.summary() for name, histogram in self.histograms.items()
+                if histogram.count}
+
+    def print_report(self, title="Stage latency"):
+        """Print the per-stage table"""
+        report = self.report()
+        if not report:
+            return
+        print(f"\n⏱️  {title} (ms):")
+        print(f"   {'stage':<12} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for name, summary in report.items():
+            print(f"   {name:<12} {summary['count']:>7} {summary['p50_ms']:>9} "
+                  f"{summary['p95_ms']:>9} {summary['p99_ms']:>9} {summary['max_ms']:>9}")
@@ -0,0 +1,430 @@
+"""
+Prefork Worker Pool
+Loads the YOLO / EasyOCR models once in a parent process, warms them up and
+then forks the workers, which inherit the weights copy-on-write instead of
+each paying the full model load time and memory. Each worker gets its own
+share of the CPU threads so the pool does not oversubscribe the machine.
+
+Jobs:
+    id-cards   OCR every image in a directory (BatchIDCardProcessor)
+    videos     Plate recognition over many videos (VehiclePlateRecognizer)
+
+Usage:
+    python prefork.py id-cards --input data/training_data --workers 4
+    python prefork.py videos data/videos/*.mp4 --workers 2
+    python prefork.py id-cards --workers 4 --compare   # prefork vs spawn-and-load report
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import *
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Seconds between liveness checks while waiting on the workers
+RESULT_POLL_SECONDS = 1.0
+
+
+class WorkerDied(RuntimeError):
+    """A worker exited (crash, kill, failed model load) with work outstanding"""
+
+
+# ========================
+# JOBS
+# ========================
+
+def load_id_card_processor():
+    """OCR worker model: the batch ID card processor's EasyOCR reader"""
+    from batch_process_id_cards import BatchIDCardProcessor
+    return BatchIDCardProcessor(warmup=False)
+
+
+def warm_id_card_processor(processor):
+    """Synthetic passes so lazy initialisation happens before the fork"""
+    processor.warmup()
+
+
+def process_id_card(processor, image_path):
+    """OCR one ID card image"""
+    return processor.process_single_image(image_path)
+
+
+def load_plate_recognizer():
+    """Video worker model: YOLO + EasyOCR plate recognizer"""
+    from vehicle_plate_recognizer import VehiclePlateRecognizer
+    return VehiclePlateRecognizer(use_gpu=USE_GPU, warmup=False)
+
+
+def warm_plate_recognizer(recognizer):
+    """Synthetic passes so lazy initialisation happens before the fork"""
+    recognizer.warmup()
+
+
+def process_video(recognizer, video_path):
+    """Recognize plates in one video; returns its statistics"""
+    # Statistics are per video, not per worker lifetime
+    recognizer.stats.update(frames_processed=0, plates_detected=0, plates_extracted=0, ocr_calls=0)
+    recognizer.timing.reset()
+    results = recognizer.process_video(video_path)
+    if not results:
+        return {'video': str(video_path), 'statistics': None}
+    return {'video': str(video_path), 'statistics': results['statistics'],
+            'stage_latency': results['stage_latency']}
+
+
+# name -> (load, warmup, handle); looked up by name so spawned workers need
+# nothing pickled but the job name
+JOBS = {
+    'id-cards': (load_id_card_processor, warm_id_card_processor, process_id_card),
+    'videos': (load_plate_recognizer, warm_plate_recognizer, process_video),
+}
+
+
+# ========================
+# PROCESS HELPERS
+# ========================
+
+def limit_threads(threads):
+    """Cap the intra-op threads torch and OpenCV use in this process"""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    cv2.setNumThreads(threads)
+
+
+def unique_rss_mb(pid=None):
+    """
+    Memory private to a process (USS): what it would free on exit
+
+    Pages still shared copy-on-write with the parent are not counted.
+
+    Args:
+        pid (int): Process id (None = this process)
+
+    Returns:
+        float: Unique RSS in MB, or None if the platform does not report it
+    """
+    try:
+        import psutil
+        return round(psutil.Process(pid).memory_full_info().uss / 2 ** 20, 1)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    # Linux without psutil
+    try:
+        private_kb = 0
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                    private_kb += int(line.split()[1])
+        return round(private_kb / 1024, 1)
+    except OSError:
+        return None
+
+
+def _cuda_initialized():
+    try:
+        import torch
+        return torch.cuda.is_initialized()
+    except (ImportError, AttributeError):
+        return False
+
+
+# Model inherited from the parent (fork) or loaded by the worker (spawn)
+_worker_model = None
+
+
+def _worker_main(job, tasks, results, threads, launched):
+    """Worker loop: report ready, then handle tasks until the None sentinel"""
+    global _worker_model
+    limit_threads(threads)
+
+    load, _, handle = JOBS[job]
+    if _worker_model is None:
+        _worker_model = load()
+
+    pid = os.getpid()
+    results.put(('ready', pid, time.time() - launched, unique_rss_mb()))
+
+    for index, task in iter(tasks.get, None):
+        try:
+            results.put(('result', pid, index, handle(_worker_model, task), None))
+        except Exception as e:
+            results.put(('result', pid, index, None, str(e)))
+
+    results.put(('done', pid, None, unique_rss_mb()))
+
+
+class PreforkPool:
+    """
+    Worker processes sharing one loaded copy of a job's models
+    """
+
+    def __init__(self, job, workers=2, threads_per_worker=None, start_method='fork'):
+        """
+        Initialize the pool (start() launches the workers)
+
+        Args:
+            job (str): Key of JOBS
+            workers (int): Worker processes
+            threads_per_worker (int): torch / OpenCV threads per worker
+                (default: CPU count split evenly across workers)
+            start_method (str): 'fork' = load once and share copy-on-write,
+                'spawn' = every worker loads its own copy (the old behaviour)
+        """
+        if start_method == 'fork' and 'fork' not in multiprocessing.get_all_start_methods():
+            print("⚠️  fork is not available on this platform; workers will load their own models")
+            start_method = 'spawn'
+
+        self.job = job
+        self.workers = workers
+        self.threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.start_method = start_method
+
+        self.processes = []
+        self._finished = set()   # pids that sent 'done'
+        self.report = {
+            'start_method': start_method,
+            'workers': workers,
+            'threads_per_worker': self.threads,
+            'parent_load_seconds': 0.0,
+            'parent_unique_rss_mb': None,
+            'worker_startup_seconds': {},
+            'worker_unique_rss_mb_ready': {},
+            'worker_unique_rss_mb_done': {},
+            'tasks': 0,
+            'errors': 0,
+            'run_seconds': 0.0
+        }
+
+    def start(self):
+        """Load (fork mode), launch the workers and wait until all are ready"""
+        global _worker_model
+        launched = time.time()
+
+        if self.start_method == 'fork':
+            load, warmup, _ = JOBS[self.job]
+            print(f"📦 Loading '{self.job}' models once in the parent (pid {os.getpid()})...")
+            _worker_model = load()
+            warmup(_worker_model)
+            if _cuda_initialized():
+                print("⚠️  CUDA is initialised in the parent and cannot be used after fork; "
+                      "use model_server.py to share a GPU model")
+            # Keep the garbage collector from touching (and un-sharing) the
+            # parent's objects in every child
+            gc.collect()
+            gc.freeze()
+            self.report['parent_load_seconds'] = round(time.time() - launched, 2)
+            self.report['parent_unique_rss_mb'] = unique_rss_mb()
+            launched = time.time()
+
+        context = multiprocessing.get_context(self.start_method)
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        for _ in range(self.workers):
+            process = context.Process(target=_worker_main,
+                                      args=(self.job, self.tasks, self.results, self.threads, launched),
+                                      daemon=True)
+            process.start()
+            self.processes.append(process)
+
+        ready = 0
+        while ready < self.workers:
+            kind, pid, startup, uss = self._next_message('starting')
+            if kind == 'ready':
+                ready += 1
+                self.report['worker_startup_seconds'][pid] = round(startup, 3)
+                self.report['worker_unique_rss_mb_ready'][pid] = uss
+        print(f"✅ {self.workers} workers ready ({self.start_method}, "
+              f"{self.threads} thread(s) each)")
+        return self
+
+    def map(self, items):
+        """
+        Run the job's handler on every item, spread across the workers
+
+        Args:
+            items (list): Task inputs (image paths, video paths, ...)
+
+        Returns:
+            list: Results in input order (None where the handler failed)
+        """
+        start = time.time()
+        for index, item in enumerate(items):
+            self.tasks.put((index, item))
+        for _ in self.processes:
+            self.tasks.put(None)
+
+        results = [None] * len(items)
+        done = 0
+        while done < len(self.processes):
+            message = self._next_message(f"{len(items)} task(s) were queued")
+            if message[0] == 'result':
+                _, pid, index, result, error = message
+                results[index] = result
+                if error:
+                    self.report['errors'] += 1
+                    print(f"⚠️  Worker {pid}: {items[index]}: {error}")
+            elif message[0] == 'done':
+                done += 1
+                self._finished.add(message[1])
+                self.report['worker_unique_rss_mb_done'][message[1]] = message[3]
+
+        for process in self.processes:
+            process.join(timeout=10)
+        self.processes = []
+        self.report['tasks'] = len(items)
+        self.report['run_seconds'] = round(time.time() - start, 2)
+        return results
+
+    def _next_message(self, waiting_for):
+        """
+        Next message from the workers, failing instead of hanging if one died
+
+        Args:
+            waiting_for (str): What the pool is waiting for (for the error)
+
+        Returns:
+            tuple: The worker's message
+
+        Raises:
+            WorkerDied: A worker exited before finishing and nothing is left
+                in the results queue
+        """
+        while True:
+            try:
+                return self.results.get(timeout=RESULT_POLL_SECONDS)
+            except queue.Empty:
+                pass
+            dead = [process for process in self.processes
+                    if not process.is_alive() and process.pid not in self._finished]
+            if not dead:
+                continue
+            # Its last messages may still be in flight
+            try:
+                return self.results.get(timeout=RESULT_POLL_SECONDS)
+            except queue.Empty:
+                pass
+            self.terminate()
+            details = ', '.join(f"pid {process.pid} (exit code {process.exitcode})" for process in dead)
+            raise WorkerDied(f"'{self.job}' worker(s) died while {waiting_for}: {details}")
+
+    def terminate(self):
+        """Stop all workers without waiting for their tasks"""
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes = []
+
+    def get_report(self):
+        """
+        Startup and memory report
+
+        Returns:
+            dict: Per-worker startup seconds and unique RSS (at ready and after
+                  the tasks), parent load time and totals
+        """
+        report = dict(self.report)
+        startups = list(report['worker_startup_seconds'].values())
+        done_uss = [uss for uss in report['worker_unique_rss_mb_done'].values() if uss is not None]
+        report['worker_startup_seconds_max'] = max(startups) if startups else None
+        report['ready_seconds'] = round(report['parent_load_seconds'] + (max(startups) if startups else 0), 2)
+        report['worker_unique_rss_mb_avg'] = round(sum(done_uss) / len(done_uss), 1) if done_uss else None
+        report['total_unique_rss_mb'] = round(sum(done_uss) + (report['parent_unique_rss_mb'] or 0), 1) if done_uss else None
+        return report
+
+
+def run_pool(job, items, workers, threads=None, start_method='fork'):
+    """Start a pool, run the items and return (results, report)"""
+    pool = PreforkPool(job, workers, threads, start_method).start()
+    results = pool.map(items)
+    return results, pool.get_report()
+
+
+def print_report(reports):
+    """Side-by-side startup / memory table"""
+    print("\n" + "=" * 70)
+    print("📊 WORKER POOL REPORT")
+    print("=" * 70)
+    rows = [
+        ('Parent load (s)', 'parent_load_seconds'),
+        ('Worker startup max (s)', 'worker_startup_seconds_max'),
+        ('All workers ready (s)', 'ready_seconds'),
+        ('Parent unique RSS (MB)', 'parent_unique_rss_mb'),
+        ('Worker unique RSS avg (MB)', 'worker_unique_rss_mb_avg'),
+        ('Total unique RSS (MB)', 'total_unique_rss_mb'),
+        ('Run time (s)', 'run_seconds'),
+    ]
+    print(f"{'':<28}" + "".join(f"{r['start_method']:>14}" for r in reports))
+    for label, key in rows:
+        print(f"{label:<28}" + "".join(f"{r[key]!s:>14}" for r in reports))
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run OCR / video jobs on prefork workers sharing one model copy')
+    parser.add_argument('job', choices=sorted(JOBS), help='Job to run')
+    parser.add_argument('inputs', nargs='*', help='Videos (videos job)')
+    parser.add_argument('--input', type=str, default='data/training_data',
+                        help='Image directory (id-cards job, default: data/training_data)')
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS,
+                        help=f'Worker processes (default: {NUM_WORKERS})')
+    parser.add_argument('--threads', type=int, help='Threads per worker (default: CPUs / workers)')
+    parser.add_argument('--spawn', action='store_true',
+                        help='Let every worker load its own models (old behaviour)')
+    parser.add_argument('--compare', action='store_true',
+                        help='Run spawn-and-load, then prefork, and report both')
+    parser.add_argument('--output', type=str, help='Write results and report JSON here')
+    args = parser.parse_args()
+
+    if args.job == 'id-cards':
+        items = sorted(str(path) for path in Path(args.input).glob('*')
+                       if path.suffix.lower() in IMAGE_EXTENSIONS)
+    else:
+        items = args.inputs
+    if not items:
+        print("❌ Nothing to process")
+        return 1
+    print(f"📁 {len(items)} item(s) for '{args.job}' on {args.workers} worker(s)")
+
+    methods = ['spawn', 'fork'] if args.compare else ['spawn' if args.spawn else 'fork']
+    reports = []
+    for method in methods:
+        try:
+            results, report = run_pool(args.job, items, args.workers, args.threads, method)
+        except WorkerDied as e:
+            print(f"❌ {e}")
+            return 1
+        reports.append(report)
+
+    print_report(reports)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'job': args.job, 'results': results, 'reports': reports}, f,
+                      indent=2, ensure_ascii=False, default=str)
+        print(f"💾 Results saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Hot-Path Profiling
+Statistical stack sampling for a running gate or model server. While a
+capture window is open, a background thread reads the Python stack of every
+other thread (sys._current_frames) every few milliseconds. The counts are
+written as folded stacks to outputs/profiles/, ready for flamegraph.pl,
+speedscope or inferno. Nothing is hooked into the interpreter. Threads run
+unchanged, a capture can be started and stopped on a live process, and the
+overhead is the sampler's own CPU time (reported in the summary). cProfile
+would only see the thread that enabled it and slows every call.
+
+Each stack is rooted at its thread name and the pipeline stage the thread
+was timing (PipelineTimer.stage), e.g. `vehicle_camera;[ocr];...`. A JSON
+summary next to it holds the per-stage latency recorded during the window,
+the busiest functions and the sampling overhead.
+
+Triggers:
+    --profile [SECONDS]   capture as soon as the system is running
+    kill -USR1 <pid>      capture on demand (POSIX), PROFILE_SECONDS long
+
+Usage:
+    python access_control_system.py --mode dual --profile 20
+    kill -USR1 $(pgrep -f access_control_system.py)
+    flamegraph.pl outputs/profiles/access_control_<time>.folded > profile.svg
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import PROFILE_DIR, PROFILE_SECONDS, PROFILE_INTERVAL_MS, PROFILE_ON_SIGNAL, get_output_filename
+from pipeline_timing import active_stage
+
+MAX_STACK_DEPTH = 64
+TOP_FUNCTIONS = 20
+SAMPLING_SWITCH_INTERVAL = 0.0005  # seconds, while a capture runs
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Counts folded stacks of all other threads at a fixed interval
+    """
+
+    def __init__(self, interval_ms=PROFILE_INTERVAL_MS, max_depth=MAX_STACK_DEPTH):
+        """
+        Args:
+            interval_ms (float): Time between samples
+            max_depth (int): Innermost frames kept per stack
+        """
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.stage_samples = Counter()
+        self.thread_samples = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+
+    def sample(self):
+        """Take one sample of every thread except the calling one"""
+        start = time.perf_counter()
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or names.get(thread_id, '').startswith('profiler'):
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            thread = names.get(thread_id, f"thread-{thread_id}").replace(';', '_')
+            stage = active_stage(thread_id)
+            root = [thread, f"[{stage}]"] if stage else [thread]
+            self.stacks[';'.join(root + stack[::-1])] += 1
+            self.thread_samples[thread] += 1
+            self.stage_samples[stage or '(none)'] += 1
+        self.samples += 1
+        self.sampling_seconds += time.perf_counter() - start
+
+    def run(self, seconds, stop_event):
+        """
+        Sample until the window ends or stop_event is set
+
+        Returns:
+            float: Seconds actually sampled
+        """
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_sample = start
+        while not stop_event.is_set():
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now >= next_sample:
+                self.sample()
+                next_sample += self.interval
+                if next_sample < now:
+                    next_sample = now + self.interval  # Fell behind: skip, do not burst
+            stop_event.wait(max(0.0, min(next_sample, deadline) - time.perf_counter()))
+        return time.perf_counter() - start
+
+    def top_functions(self, count=TOP_FUNCTIONS):
+        """
+        Functions on top of the stack most often (self time) and anywhere on it (total time)
+
+        Returns:
+            dict: 'self' and 'total' lists of (function, share of samples)
+        """
+        own, total = Counter(), Counter()
+        for stack, samples in self.stacks.items():
+            frames = [f for f in stack.split(';') if not f.startswith('[')][1:]
+            if frames:
+                own[frames[-1]] += samples
+            for frame in set(frames):
+                total[frame] += samples
+        all_samples = sum(self.stacks.values()) or 1
+        return {
+            'self': [(name, round(n / all_samples, 4)) for name, n in own.most_common(count)],
+            'total': [(name, round(n / all_samples, 4)) for name, n in total.most_common(count)]
+        }
+
+    def write_folded(self, path):
+        """Write 'frame;frame;... count' lines, most frequent first"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+
+class Profiler:
+    """
+    Timed sampling captures on a running process, one at a time
+    """
+
+    def __init__(self, label, timers=None, interval_ms=PROFILE_INTERVAL_MS, output_dir=PROFILE_DIR):
+        """
+        Args:
+            label (str): File name prefix, e.g. 'access_control'
+            timers (dict or callable): name -> PipelineTimer whose stage
+                latency is reported for the window (or a function returning one)
+            interval_ms (float): Time between stack samples
+            output_dir (Path): Where captures are written
+        """
+        self.label = label
+        self.timers = timers if callable(timers) else (lambda: timers or {})
+        self.interval_ms = interval_ms
+        self.output_dir = Path(output_dir)
+        self.captures = []
+        self._busy = threading.Lock()
+        self._stop = threading.Event()
+        self._trigger = threading.Event()
+        self._closed = False
+        self._watcher = None
+
+    def capture(self, seconds=PROFILE_SECONDS):
+        """
+        Sample for `seconds` and write the folded stacks and summary
+
+        Returns without capturing if another capture is running.
+
+        Args:
+            seconds (float): Window length
+
+        Returns:
+            Path: Folded stacks file (None if skipped)
+        """
+        if not self._busy.acquire(blocking=False):
+            print("⚠️  Profiler: a capture is already running")
+            return None
+        try:
+            timers = dict(self.timers())
+            snapshots = {name: timer.snapshot() for name, timer in timers.items()}
+            sampler = StackSampler(self.interval_ms)
+            started = time.strftime('%Y-%m-%dT%H:%M:%S')
+            print(f"🔬 Profiling {self.label} for {seconds:g}s (sample every {self.interval_ms:g} ms)")
+            # A thread running Python code keeps the GIL for up to the switch
+            # interval (5 ms); shorten it for the window so busy threads are
+            # sampled mid-work, not only when they block
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, SAMPLING_SWITCH_INTERVAL))
+            try:
+                elapsed = sampler.run(seconds, self._stop)
+            finally:
+                sys.setswitchinterval(switch_interval)
+
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            folded_path = self.output_dir / get_output_filename(self.label, 'folded')
+            sampler.write_folded(folded_path)
+            stage_share = {stage: round(n / max(sum(sampler.stage_samples.values()), 1), 4)
+                           for stage, n in sampler.stage_samples.most_common()}
+            summary = {
+                'label': self.label,
+                'pid': os.getpid(),
+                'started': started,
+                'seconds': round(elapsed, 2),
+                'interval_ms': self.interval_ms,
+                'samples': sampler.samples,
+                'sampling_overhead': round(sampler.sampling_seconds / elapsed, 4) if elapsed else None,
+                'folded_stacks': str(folded_path),
+                'thread_samples': dict(sampler.thread_samples.most_common()),
+                'stage_share': stage_share,
+                'stage_latency': {name: timer.report_since(snapshots[name]) for name, timer in timers.items()},
+                'top_functions': sampler.top_functions()
+            }
+            with open(folded_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+            self.captures.append(folded_path)
+            self._print_summary(summary, sampler)
+            return folded_path
+        finally:
+            self._busy.release()
+
+    def _print_summary(self, summary, sampler):
+        print(f"\n🔬 Profile: {summary['samples']} samples in {summary['seconds']}s "
+              f"(sampler overhead {summary['sampling_overhead'] * 100:.1f}%)")
+        busy = [(stage, share) for stage, share in summary['stage_share'].items() if stage != '(none)']
+        if busy:
+            print("   Thread time by stage: " + ', '.join(f"{stage} {share * 100:.0f}%" for stage, share in busy))
+        for name, share in sampler.top_functions(5)['self']:
+            print(f"   {share * 100:5.1f}%  {name}")
+        print(f"💾 Folded stacks saved to: {summary['folded_stacks']}")
+
+    def capture_async(self, seconds=PROFILE_SECONDS):
+        """Run capture() on a background thread; returns the thread"""
+        thread = threading.Thread(target=self.capture, args=(seconds,), name='profiler', daemon=True)
+        thread.start()
+        return thread
+
+    def install_signal(self, signum=None, seconds=PROFILE_SECONDS):
+        """
+        Start a capture whenever the process receives a signal (default SIGUSR1)
+
+        The handler only sets an event; the capture itself runs on a
+        watcher thread, so nothing heavy happens inside the signal handler.
+
+        Returns:
+            bool: True if installed (False on Windows or off the main thread)
+        """
+        signum = signum or getattr(signal, 'SIGUSR1', None)
+        if signum is None:
+            print("⚠️  Profiler: no SIGUSR1 on this platform, use --profile")
+            return False
+        try:
+            signal.signal(signum, lambda *_: self._trigger.set())
+        except ValueError:
+            return False  # Not the main thread
+
+        def watch():
+            while True:
+                self._trigger.wait()
+                self._trigger.clear()
+                if self._closed:
+                    return
+                self.capture(seconds)
+
+        self._watcher = threading.Thread(target=watch, name='profiler-trigger', daemon=True)
+        self._watcher.start()
+        print(f"🔬 Profiler armed: kill -{signal.Signals(signum).name[3:]} {os.getpid()}")
+        return True
+
+    def stop(self):
+        """End a running capture early (it is still written) and disarm the trigger"""
+        self._closed = True
+        self._stop.set()
+        self._trigger.set()
+        # Let a running capture write its files
+        if self._busy.acquire(timeout=5):
+            self._busy.release()
+
+
+def start_profiler(label, timers=None, seconds=None):
+    """
+    Profiler for a main(): armed on SIGUSR1 (PROFILE_ON_SIGNAL) and, with
+    seconds, capturing right away
+
+    Args:
+        label (str): File name prefix
+        timers (dict or callable): See Profiler
+        seconds (float): Capture this long now (None = only on signal)
+
+    Returns:
+        Profiler: Call stop() on shutdown
+    """
+    profiler = Profiler(label, timers)
+    if PROFILE_ON_SIGNAL:
+        profiler.install_signal()
+    if seconds:
+        profiler.capture_async(seconds)
+    return profiler
@@ -3,6 +3,7 @@ Quick Start Script for Campus Access Control System
 Helps users get started quickly with the system
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -38,18 +39,17 @@ def check_dependencies():
         print("     Install: pip install opencv-python")
         return False
     
-    try:
-        import easyocr
+    # Only check these are installed; importing them takes seconds
+    if importlib.util.find_spec('easyocr'):
         print("  ✅ EasyOCR installed")
-    except ImportError:
+    else:
         print("  ❌ EasyOCR not installed")
         print("     Install: pip install easyocr")
         return False
     
-    try:
-        from ultralytics import YOLO
+    if importlib.util.find_spec('ultralytics'):
         print("  ✅ Ultralytics YOLO installed")
-    except ImportError:
+    else:
         print("  ❌ Ultralytics not installed")
         print("     Install: pip install ultralytics")
         return False
@@ -115,6 +115,9 @@ def show_usage_examples():
         
         ("6. Unified System (Dual Camera)", 
          "python access_control_system.py --mode dual --vehicle-camera 0 --id-card-camera 1"),
+        
+        ("7. All Tools (one CLI)", 
+         "python campus.py --help"),
     ]
     
     for title, command in examples:
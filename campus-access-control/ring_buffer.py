@@ -0,0 +1,195 @@
+"""
+Bounded Session Buffers
+Session lists that used to grow for as long as a camera ran (access log,
+camera detections, per-frame video results) keep only their newest items in
+memory. Older items are appended to a JSON-lines spill file in outputs/spill/
+and read back when the buffer is iterated. A week-long session still writes
+its complete JSON at the end, but memory stays flat. The spill file is
+removed when the buffer is closed or garbage-collected, or at exit; if the
+process is killed it stays on disk with everything that had left memory.
+
+Usage:
+    detections = SpillingRingBuffer('camera_detections')
+    detections.append(result)
+    with open(path, 'w', encoding='utf-8') as f:
+        dump_json({'detections': detections}, f)
+"""
+
+import json
+import os
+import sys
+import threading
+import weakref
+from collections import deque
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import SESSION_BUFFER_SIZE, SPILL_DIR, get_output_filename
+
+
+def _discard(spill_file, path):
+    """Close and delete a spill file (closed first, or Windows refuses)"""
+    spill_file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpillingRingBuffer:
+    """
+    Append-only sequence with at most ~capacity items in memory
+
+    Evictions happen in batches of a quarter of the capacity, so the
+    spill file gets one write per batch instead of one per item.
+    """
+
+    def __init__(self, name, capacity=SESSION_BUFFER_SIZE, spill=True, spill_dir=SPILL_DIR):
+        """
+        Args:
+            name (str): Spill file prefix
+            capacity (int): Items kept in memory
+            spill (bool): Write evicted items to disk; False drops them
+                (for records that are already persisted elsewhere)
+            spill_dir (Path): Directory for the spill file
+        """
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.spill = spill
+        self.spill_dir = Path(spill_dir)
+        self.spill_path = None
+        self.spilled = 0
+        self.dropped = 0
+        self._batch = max(1, self.capacity // 4)
+        self._items = deque()
+        self._file = None
+        self._finalizer = None
+        self._lock = threading.Lock()
+
+    def append(self, item):
+        """Add an item, evicting the oldest batch once over capacity"""
+        with self._lock:
+            self._items.append(item)
+            if len(self._items) >= self.capacity + self._batch:
+                self._evict(len(self._items) - self.capacity)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def _evict(self, count):
+        evicted = [self._items.popleft() for _ in range(count)]
+        if not self.spill:
+            self.dropped += count
+            return
+        if self._file is None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self.spill_path = self.spill_dir / get_output_filename(f"{self.name}_{os.getpid()}_{id(self):x}",
+                                                                   'jsonl')
+            self._file = open(self.spill_path, 'a', encoding='utf-8')
+            self._finalizer = weakref.finalize(self, _discard, self._file, str(self.spill_path))
+        self._file.write(''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in evicted))
+        self._file.flush()
+        self.spilled += count
+
+    def __len__(self):
+        """Items that can still be read (spilled + in memory)"""
+        with self._lock:
+            return self.spilled + len(self._items)
+
+    @property
+    def total(self):
+        """Items ever appended, dropped ones included"""
+        with self._lock:
+            return self.dropped + self.spilled + len(self._items)
+
+    @property
+    def in_memory(self):
+        with self._lock:
+            return len(self._items)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        """
+        Oldest to newest: spilled items streamed from disk, then memory
+
+        Iterates over the items present when iteration started.
+        """
+        with self._lock:
+            spilled, path = self.spilled, self.spill_path
+            recent = list(self._items)
+        if spilled:
+            with open(path, 'r', encoding='utf-8') as f:
+                for _, line in zip(range(spilled), f):
+                    yield json.loads(line)
+        yield from recent
+
+    def recent(self, count=None):
+        """
+        Newest items (from memory only)
+
+        Args:
+            count (int): How many (None = all in memory)
+
+        Returns:
+            list: Oldest first
+        """
+        with self._lock:
+            items = list(self._items)
+        return items[-count:] if count else items
+
+    def stats(self):
+        """Memory / spill counts for reports"""
+        with self._lock:
+            return {
+                'in_memory': len(self._items),
+                'spilled': self.spilled,
+                'dropped': self.dropped,
+                'spill_path': str(self.spill_path) if self.spill_path else None
+            }
+
+    def close(self):
+        """Drop the items and delete the spill file"""
+        with self._lock:
+            self._items.clear()
+            if self._finalizer:
+                self._finalizer()
+            self._file = None
+            self._finalizer = None
+            self.spill_path = None
+            self.spilled = 0
+
+
+def _indented(text, pad):
+    return text.replace('\n', '\n' + pad)
+
+
+def dump_json(document, f, indent=2):
+    """
+    json.dump(document, f, indent=indent, ensure_ascii=False), except that
+    SpillingRingBuffer values are written item by item instead of being
+    loaded into memory first
+
+    Args:
+        document (dict): Top-level object; buffers may appear as its values
+        f (file): Text file open for writing
+        indent (int): Indent per level
+    """
+    pad = ' ' * indent
+    f.write('{')
+    for index, (key, value) in enumerate(document.items()):
+        f.write(f"{',' if index else ''}\n{pad}{json.dumps(key, ensure_ascii=False)}: ")
+        if not isinstance(value, SpillingRingBuffer):
+            f.write(_indented(json.dumps(value, indent=indent, ensure_ascii=False), pad))
+            continue
+        inner = pad * 2
+        empty = True
+        for item in value:
+            f.write(f"{'[' if empty else ','}\n{inner}")
+            f.write(_indented(json.dumps(item, indent=indent, ensure_ascii=False), inner))
+            empty = False
+        f.write('[]' if empty else f"\n{pad}]")
+    f.write('\n}' if document else '}')
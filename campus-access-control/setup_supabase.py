@@ -28,6 +28,10 @@ def check_env_file():
     from dotenv import load_dotenv
     load_dotenv()
     
+    if os.getenv('CAMPUS_DB_BACKEND', 'postgres').lower() == 'sqlite':
+        print("✅ Using embedded SQLite database (CAMPUS_DB_BACKEND=sqlite)")
+        return True
+    
     required_vars = ['SUPABASE_HOST', 'SUPABASE_USER', 'SUPABASE_PASSWORD']
     missing_vars = []
     
@@ -49,9 +53,9 @@ def test_connection():
     print("\n🔌 Testing Supabase connection...")
     
     try:
-        from database.supabase_manager import SupabaseManager
+        from database.storage import create_storage
         
-        db = SupabaseManager()
+        db = create_storage()
         
         if db.connect():
             print("✅ Connected to Supabase successfully!")
@@ -147,9 +151,9 @@ def import_batch_results():
     print(f"📂 Found batch results: {batch_file}")
     
     try:
-        from database.supabase_manager import SupabaseManager
+        from database.storage import create_storage
         
-        db = SupabaseManager()
+        db = create_storage()
         
         if db.connect():
             count = db.bulk_import_students_from_json(batch_file)
@@ -187,9 +191,9 @@ def show_menu():
 def view_statistics():
     """View today's statistics"""
     try:
-        from database.supabase_manager import SupabaseManager
+        from database.storage import create_storage
         
-        db = SupabaseManager()
+        db = create_storage()
         
         if db.connect():
             print("\n📊 Today's Statistics:")
@@ -213,9 +217,9 @@ def view_statistics():
 def view_logs():
     """View recent logs"""
     try:
-        from database.supabase_manager import SupabaseManager
+        from database.storage import create_storage
         
-        db = SupabaseManager()
+        db = create_storage()
         
         if db.connect():
             print("\n📋 Recent ID Card Logs:")
@@ -270,10 +274,12 @@ def run_all_setup():
 
 def main():
     """Main function"""
-    # Check dependencies
+    # Check dependencies (psycopg2 is only needed for the Postgres backend)
     try:
-        import psycopg2
-        import dotenv
+        from dotenv import load_dotenv
+        load_dotenv()  # The backend may be chosen in .env
+        if os.getenv('CAMPUS_DB_BACKEND', 'postgres').lower() != 'sqlite':
+            import psycopg2
     except ImportError as e:
         print("❌ Missing dependencies!")
         print("\n📦 Please install:")
@@ -0,0 +1,647 @@
+"""
+Synthetic Test Data
+Renders labelled Indian number plates and college ID cards for stress and
+scaling tests. The sample set (three videos, ~50 card photos) is far too
+small for a system meant for thousands of students and vehicles; this
+generator gives any number of images with known ground truth, in the
+formats the benchmarks already read:
+
+    plates/    camera frames with one vehicle each, labels.json (plate text,
+               box, conditions); --video-seconds also writes MP4s of cars
+               driving up to the gate, labelled per frame
+    id_cards/  phone-style photos of cards laid out per ID_CARD_REGIONS,
+               ground_truth.json in the data/training_data format
+
+Plates use the state codes in VALID_STATE_CODES and the BH series, private,
+commercial, electric and rental colours and several fonts. Frames are
+warped, blurred and JPEG-compressed, and a share are night shots (dark,
+noisy, with glare). The output depends only on the seed.
+
+Usage:
+    python synthetic_data.py plates --count 5000 --video-seconds 60
+    python synthetic_data.py id-cards --count 500
+    python benchmarks/bench_id_card_accuracy.py --images outputs/synthetic/id_cards \\
+        --ground-truth outputs/synthetic/id_cards/ground_truth.json
+    python benchmarks/bench_virtual_gates.py --videos outputs/synthetic/plates/videos/*.mp4
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent))
+from config.config import (OUTPUT_DIR, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, VALID_STATE_CODES,
+                           VALID_DEPARTMENTS, ID_CARD_REGIONS)
+
+SYNTHETIC_DIR = OUTPUT_DIR / "synthetic"
+
+# Series letters: I and O are not issued (they read as 1 and 0)
+SERIES_LETTERS = ''.join(ch for ch in string.ascii_uppercase if ch not in 'IO')
+
+# Plate style -> (share, background BGR, text BGR)
+PLATE_STYLES = {
+    'private': (0.70, (255, 255, 255), (0, 0, 0)),
+    'commercial': (0.15, (0, 205, 255), (0, 0, 0)),
+    'electric': (0.10, (60, 150, 30), (255, 255, 255)),
+    'rental': (0.05, (20, 20, 20), (0, 215, 255)),
+}
+PLATE_FONTS = [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_TRIPLEX,
+               cv2.FONT_HERSHEY_COMPLEX]
+PLATE_ASPECT = 500 / 120  # Standard HSRP size in mm
+# Night exposure: darker, with the shadows crushed more than the highlights
+NIGHT_CURVE = np.clip(255 * (np.arange(256) / 255) ** 1.8 * 0.55, 0, 255).astype(np.uint8)
+
+INSTITUTE_NAME = 'A P SHAH INSTITUTE OF TECHNOLOGY'
+ID_CARD_SIZE = (540, 856)  # Portrait CR80 card (width, height)
+FIRST_NAMES = [
+    'AARAV', 'ADITI', 'AMEY', 'ANANYA', 'ANISH', 'ARJUN', 'ASHMIT', 'AVANISH', 'DIVYA', 'GAURAV',
+    'HARSH', 'ISHAN', 'KAVYA', 'MEERA', 'NEHA', 'NIKHIL', 'OMKAR', 'PRANAV', 'PRIYA', 'RAHUL',
+    'RIYA', 'ROHAN', 'SAKSHI', 'SANIKA', 'SHREYA', 'SIDDHESH', 'SNEHA', 'TANVI', 'VEDANT', 'YASH'
+]
+MIDDLE_NAMES = ['ANIL', 'PRAKASH', 'RAJESH', 'SANJAY', 'SUNIL', 'VIJAY']
+LAST_NAMES = [
+    'BHOSALE', 'CHAVAN', 'DESAI', 'GAIKWAD', 'IYER', 'JADHAV', 'JOSHI', 'KADAM', 'KHAN', 'KULKARNI',
+    'MORE', 'NAIR', 'NARVANKAR', 'PATIL', 'PAWAR', 'REDDY', 'SAWANT', 'SHAH', 'SHARMA', 'SHINDE',
+    'SINGH', 'URADE', 'VADKE', 'VERMA'
+]
+
+
+# ========================
+# NUMBER PLATES
+# ========================
+
+def random_plate_number(rng, bh_share=0.1):
+    """
+    A valid Indian registration number without separators
+
+    Args:
+        rng (random.Random): Random source
+        bh_share (float): Share of Bharat (BH) series numbers
+
+    Returns:
+        str: e.g. 'MH12AB1234' or '22BH4543AA'
+    """
+    if rng.random() < bh_share:
+        series = ''.join(rng.choice(SERIES_LETTERS) for _ in range(rng.choice((1, 2))))
+        return f"{rng.randint(21, 25):02d}BH{rng.randint(1, 9999):04d}{series}"
+    series = ''.join(rng.choice(SERIES_LETTERS) for _ in range(1 if rng.random() < 0.2 else 2))
+    return f"{rng.choice(VALID_STATE_CODES)}{rng.randint(1, 99):02d}{series}{rng.randint(1, 9999):04d}"
+
+
+def plate_groups(number):
+    """Split a registration number into the groups printed on the plate"""
+    if number[2:4] == 'BH':
+        return [number[:2], 'BH', number[4:8], number[8:]]
+    return [number[:2], number[2:4], number[4:-4], number[-4:]]
+
+
+def random_vehicle(rng, night_share=0.25, bh_share=0.1):
+    """
+    Appearance of one vehicle, fixed while it is in view
+
+    Args:
+        rng (random.Random): Random source
+        night_share (float): Share of night shots
+        bh_share (float): Share of BH series plates
+
+    Returns:
+        dict: Plate number, style, font, body colour, tilt and capture conditions
+    """
+    styles = list(PLATE_STYLES)
+    style = rng.choices(styles, weights=[PLATE_STYLES[s][0] for s in styles])[0]
+    night = rng.random() < night_share
+    return {
+        'plate': random_plate_number(rng, bh_share),
+        'style': style,
+        'font': rng.choice(PLATE_FONTS),
+        'ind_strip': style == 'private' and rng.random() < 0.6,
+        'body_color': tuple(rng.randint(20, 235) for _ in range(3)),
+        # Corner offsets (fractions of the plate height): camera angle and tilt
+        'skew': [(rng.uniform(-0.25, 0.25), rng.uniform(-0.15, 0.15)) for _ in range(4)],
+        'night': night,
+        'blur': rng.choice((0, 0, 3, 5, 7, 9)),
+        'blur_angle': rng.uniform(0, 180),
+        'noise': rng.uniform(8, 20) if night else rng.uniform(0, 6),
+        'jpeg_quality': rng.randint(40, 90)
+    }
+
+
+def render_plate(vehicle, height=120):
+    """
+    Plate image, flat and front-on
+
+    Args:
+        vehicle (dict): Output of random_vehicle
+        height (int): Plate height in pixels
+
+    Returns:
+        numpy.ndarray: BGR image, PLATE_ASPECT wide
+    """
+    width = int(height * PLATE_ASPECT)
+    _, background, color = PLATE_STYLES[vehicle['style']]
+    plate = np.full((height, width, 3), background, dtype=np.uint8)
+    cv2.rectangle(plate, (3, 3), (width - 4, height - 4), color, max(2, height // 30))
+
+    left = int(0.04 * width)
+    if vehicle['ind_strip']:
+        strip = int(0.09 * width)
+        cv2.rectangle(plate, (8, 8), (8 + strip, height - 9), (160, 60, 0), -1)
+        cv2.putText(plate, 'IND', (12, height - 16), cv2.FONT_HERSHEY_SIMPLEX, height / 160,
+                    (255, 255, 255), max(1, height // 60))
+        left = strip + int(0.04 * width)
+
+    text = ' '.join(plate_groups(vehicle['plate']))
+    font, thickness = vehicle['font'], max(2, height // 14)
+    (text_width, text_height), _ = cv2.getTextSize(text, font, 1.0, thickness)
+    scale = min((width - left - int(0.04 * width)) / text_width, 0.62 * height / text_height)
+    (text_width, text_height), _ = cv2.getTextSize(text, font, scale, thickness)
+    x = left + (width - left - int(0.04 * width) - text_width) // 2
+    cv2.putText(plate, text, (x, (height + text_height) // 2), font, scale, color, thickness, cv2.LINE_AA)
+    return plate
+
+
+def paste_warped(frame, image, quad):
+    """
+    Warp an image onto a quadrilateral of the frame, in place
+
+    Only the quad's bounding box is warped, so the cost follows the pasted
+    size rather than the frame size.
+
+    Args:
+        frame (numpy.ndarray): Frame to draw on
+        image (numpy.ndarray): Flat image (plate, card)
+        quad (numpy.ndarray): Destination corners, clockwise from top-left
+
+    Returns:
+        tuple: Box (x1, y1, x2, y2) of the pasted area, clipped to the frame
+    """
+    height, width = frame.shape[:2]
+    x1, y1 = max(0, int(quad[:, 0].min())), max(0, int(quad[:, 1].min()))
+    x2, y2 = min(width, int(np.ceil(quad[:, 0].max()))), min(height, int(np.ceil(quad[:, 1].max())))
+    if x2 <= x1 or y2 <= y1:
+        return (x1, y1, x1, y1)
+    ih, iw = image.shape[:2]
+    matrix = cv2.getPerspectiveTransform(np.float32([(0, 0), (iw, 0), (iw, ih), (0, ih)]),
+                                         np.float32(quad - (x1, y1)))
+    warped = cv2.warpPerspective(image, matrix, (x2 - x1, y2 - y1))
+    mask = cv2.warpPerspective(np.full((ih, iw), 255, dtype=np.uint8), matrix, (x2 - x1, y2 - y1)) > 127
+    frame[y1:y2, x1:x2][mask] = warped[mask]
+    return (x1, y1, x2, y2)
+
+
+def road_background(np_rng, size=(CAMERA_WIDTH, CAMERA_HEIGHT), night=False):
+    """Gate camera background: sky/wall over a road, with sensor-like texture"""
+    width, height = size
+    top, bottom = ((40, 35, 30), (25, 25, 25)) if night else ((200, 180, 150), (95, 95, 100))
+    rows = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+    frame = (np.float32(top) * (1 - rows) + np.float32(bottom) * rows).repeat(width, axis=1)
+    frame += 6 * np_rng.standard_normal((height, width, 1), dtype=np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def render_vehicle_frame(vehicle, background, scale=1.0, center_x=0.5):
+    """
+    Draw a vehicle and its plate on a background
+
+    Args:
+        vehicle (dict): Output of random_vehicle
+        background (numpy.ndarray): Frame to draw on (not modified)
+        scale (float): Vehicle size; 1.0 = plate about 22% of the frame width
+        center_x (float): Horizontal position (fraction of the frame width)
+
+    Returns:
+        tuple: (frame, plate box (x1, y1, x2, y2) in pixels)
+    """
+    frame = background.copy()
+    height, width = frame.shape[:2]
+    plate_width = 0.22 * width * scale
+    plate_height = plate_width / PLATE_ASPECT
+    cx, plate_y = center_x * width, height * (0.55 + 0.2 * min(scale, 1.2))
+
+    # Car front: body, windscreen, lights
+    body_w, body_h = 4.2 * plate_width, 3.2 * plate_height
+    x1, y1 = int(cx - body_w / 2), int(plate_y - 0.6 * body_h)
+    x2, y2 = int(cx + body_w / 2), int(plate_y + 0.55 * body_h)
+    cv2.rectangle(frame, (x1, y1), (x2, y2), vehicle['body_color'], -1)
+    cv2.rectangle(frame, (int(x1 + 0.12 * body_w), int(y1 - 0.9 * body_h)),
+                  (int(x2 - 0.12 * body_w), y1), (60, 50, 45), -1)
+    light_color = (235, 250, 255) if vehicle['night'] else (200, 210, 215)
+    for lx in (x1 + 0.12 * body_w, x2 - 0.12 * body_w):
+        cv2.ellipse(frame, (int(lx), int(y1 + 0.25 * body_h)), (int(0.09 * body_w), int(0.12 * body_h)),
+                    0, 0, 360, light_color, -1)
+
+    # Plate, warped by the camera angle
+    plate = render_plate(vehicle, height=max(24, int(plate_height * 1.5)))
+    ph, pw = plate.shape[:2]
+    corners = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+    quad = np.float32([
+        (cx + sx * plate_width / 2 + dx * plate_height, plate_y + sy * plate_height / 2 + dy * plate_height)
+        for (sx, sy), (dx, dy) in zip(corners, vehicle['skew'])
+    ])
+    box = paste_warped(frame, plate, quad)
+    return frame, box
+
+
+_noise_tiles = {}
+
+
+def sensor_noise(shape, np_rng, margin=64):
+    """
+    Unit Gaussian noise of the given shape
+
+    Drawing fresh noise for a whole frame costs more than rendering it, so
+    each frame takes a randomly offset window of one cached noise tile.
+    """
+    if shape not in _noise_tiles:
+        tile_shape = (shape[0] + margin, shape[1] + margin) + tuple(shape[2:])
+        _noise_tiles[shape] = np.random.default_rng(0).standard_normal(tile_shape, dtype=np.float32)
+    y, x = np_rng.integers(0, margin, 2)
+    return _noise_tiles[shape][y:y + shape[0], x:x + shape[1]]
+
+
+def degrade(frame, conditions, np_rng):
+    """
+    Apply capture conditions: motion blur, night exposure and glare, sensor noise, JPEG
+
+    Args:
+        frame (numpy.ndarray): Clean BGR frame
+        conditions (dict): blur, blur_angle, night, noise, jpeg_quality (see random_vehicle)
+        np_rng (numpy.random.Generator): Noise source
+
+    Returns:
+        numpy.ndarray: Degraded frame
+    """
+    if conditions.get('blur'):
+        length = conditions['blur']
+        kernel = np.zeros((length, length), dtype=np.float32)
+        kernel[length // 2, :] = 1.0 / length
+        rotation = cv2.getRotationMatrix2D((length / 2 - 0.5, length / 2 - 0.5), conditions['blur_angle'], 1.0)
+        kernel = cv2.warpAffine(kernel, rotation, (length, length))
+        frame = cv2.filter2D(frame, -1, kernel / max(kernel.sum(), 1e-6))
+
+    if conditions.get('night'):
+        frame = cv2.LUT(frame, NIGHT_CURVE)
+    image = frame.astype(np.float32)
+    if conditions.get('night'):
+        # Glare from two light sources, drawn at 1/8 size and scaled up
+        height, width = frame.shape[:2]
+        yy, xx = np.ogrid[:height // 8, :width // 8]
+        glare = np.zeros((height // 8, width // 8), dtype=np.float32)
+        for _ in range(2):
+            gx, gy = np_rng.uniform(0, width / 8), np_rng.uniform(0, 0.6 * height / 8)
+            glare += np.exp(-((xx - gx) ** 2 + (yy - gy) ** 2) / (2 * (0.01 * width) ** 2)).astype(np.float32)
+        image += 120 * cv2.resize(glare, (width, height))[:, :, None]
+    if conditions.get('noise'):
+        image += conditions['noise'] * sensor_noise(image.shape, np_rng)
+    frame = np.clip(image, 0, 255).astype(np.uint8)
+
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, conditions.get('jpeg_quality', 90)])
+    return cv2.imdecode(encoded, cv2.IMREAD_COLOR) if ok else frame
+
+
+def synthetic_plate_frame(rng, size=(CAMERA_WIDTH, CAMERA_HEIGHT), night_share=0.25, bh_share=0.1):
+    """
+    One labelled camera frame with a single vehicle
+
+    Args:
+        rng (random.Random): Random source
+        size (tuple): Frame (width, height)
+        night_share (float): Share of night shots
+        bh_share (float): Share of BH series plates
+
+    Returns:
+        tuple: (frame, label dict with plate, box and conditions)
+    """
+    vehicle = random_vehicle(rng, night_share, bh_share)
+    np_rng = np.random.default_rng(rng.getrandbits(32))
+    background = road_background(np_rng, size, vehicle['night'])
+    frame, box = render_vehicle_frame(vehicle, background, scale=rng.uniform(0.45, 1.2),
+                                      center_x=rng.uniform(0.3, 0.7))
+    return degrade(frame, vehicle, np_rng), vehicle_label(vehicle, box)
+
+
+def vehicle_label(vehicle, box=None):
+    """JSON-ready ground truth of a vehicle"""
+    label = {
+        'plate': vehicle['plate'],
+        'style': vehicle['style'],
+        'bh_series': vehicle['plate'][2:4] == 'BH',
+        'night': vehicle['night'],
+        'blur': vehicle['blur'],
+        'jpeg_quality': vehicle['jpeg_quality']
+    }
+    if box is not None:
+        label['box'] = list(box)
+    return label
+
+
+def write_plate_video(path, rng, seconds, fps=CAMERA_FPS, size=(CAMERA_WIDTH, CAMERA_HEIGHT),
+                      night_share=0.25, bh_share=0.1):
+    """
+    Write a gate recording: vehicles drive up one after another, pause, then leave
+
+    Args:
+        path (Path): Output .mp4
+        rng (random.Random): Random source
+        seconds (float): Video length
+        fps (int): Frame rate
+        size (tuple): Frame (width, height)
+        night_share (float): Share of night videos
+        bh_share (float): Share of BH series plates
+
+    Returns:
+        dict: fps, frame count and per vehicle plate, first/last frame and per-frame boxes
+    """
+    night = rng.random() < night_share
+    np_rng = np.random.default_rng(rng.getrandbits(32))
+    background = road_background(np_rng, size, night)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"cannot write {path}")
+
+    total = int(seconds * fps)
+    vehicles, frame_index = [], 0
+    while frame_index < total:
+        # Empty road between vehicles
+        for _ in range(min(int(rng.uniform(0.5, 2.0) * fps), total - frame_index)):
+            writer.write(degrade(background, {'night': night, 'noise': 12 if night else 3,
+                                              'jpeg_quality': 80}, np_rng))
+            frame_index += 1
+        if frame_index >= total:
+            break
+
+        vehicle = random_vehicle(rng, night_share=float(night), bh_share=bh_share)
+        approach, stop = int(rng.uniform(1.0, 2.5) * fps), int(rng.uniform(0.5, 2.0) * fps)
+        center_x = rng.uniform(0.4, 0.6)
+        entry = {**vehicle_label(vehicle), 'first_frame': frame_index, 'boxes': []}
+        for step in range(min(approach + stop, total - frame_index)):
+            scale = 0.35 + 0.75 * min(1.0, step / approach)
+            moving = step < approach
+            conditions = dict(vehicle, blur=vehicle['blur'] if moving else 0)
+            frame, box = render_vehicle_frame(vehicle, background, scale=scale, center_x=center_x)
+            writer.write(degrade(frame, conditions, np_rng))
+            entry['boxes'].append(list(box))
+            frame_index += 1
+        entry['last_frame'] = frame_index - 1
+        vehicles.append(entry)
+
+    writer.release()
+    return {'fps': fps, 'frames': total, 'night': night, 'vehicles': vehicles}
+
+
+def generate_plates(output_dir, count, seed=42, video_seconds=0, videos=1, night_share=0.25, bh_share=0.1,
+                    size=(CAMERA_WIDTH, CAMERA_HEIGHT)):
+    """
+    Write labelled plate frames (and optionally gate videos) to output_dir
+
+    Args:
+        output_dir (Path): Directory for images/, videos/ and labels.json
+        count (int): Number of frames
+        seed (int): RNG seed
+        video_seconds (float): Length of each video (0 = no videos)
+        videos (int): Number of videos
+        night_share (float): Share of night shots
+        bh_share (float): Share of BH series plates
+        size (tuple): Frame (width, height)
+
+    Returns:
+        Path: labels.json
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    images_dir = output_dir / 'images'
+    images_dir.mkdir(parents=True, exist_ok=True)
+
+    labels = {'description': 'Synthetic plate frames, one vehicle each. Boxes are (x1, y1, x2, y2) pixels.',
+              'seed': seed, 'images': {}, 'videos': {}}
+    for i in range(count):
+        frame, label = synthetic_plate_frame(rng, size, night_share, bh_share)
+        name = f"plate_{i:06d}.jpg"
+        cv2.imwrite(str(images_dir / name), frame)
+        labels['images'][name] = label
+        if (i + 1) % 500 == 0:
+            print(f"   {i + 1}/{count} plate frames")
+
+    if video_seconds > 0:
+        videos_dir = output_dir / 'videos'
+        videos_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(videos):
+            name = f"gate_{i:03d}.mp4"
+            labels['videos'][name] = write_plate_video(videos_dir / name, rng, video_seconds, size=size,
+                                                       night_share=night_share, bh_share=bh_share)
+            print(f"   {name}: {len(labels['videos'][name]['vehicles'])} vehicles")
+
+    labels_path = output_dir / 'labels.json'
+    with open(labels_path, 'w', encoding='utf-8') as f:
+        json.dump(labels, f, indent=2)
+    return labels_path
+
+
+def load_plate_labels(path):
+    """Parsed labels.json of generate_plates"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ========================
+# ID CARDS
+# ========================
+
+def random_student(rng, index=None):
+    """
+    Printed fields of one card
+
+    Args:
+        rng (random.Random): Random source
+        index (int): Unique number folded into the Moodle ID (None = random)
+
+    Returns:
+        dict: moodle_id (8 digits starting with 2), name, department
+    """
+    year = rng.randint(19, 25)
+    # index -> serial is a permutation of 0-999999, so IDs stay unique but do not count up
+    serial = (index * 7919 + 104729) % 1000000 if index is not None else rng.randint(0, 999999)
+    name = [rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)]
+    if rng.random() < 0.3:
+        name.insert(1, rng.choice(MIDDLE_NAMES))
+    return {
+        'moodle_id': f"{year}{serial:06d}",
+        'name': ' '.join(name),
+        'department': rng.choice(VALID_DEPARTMENTS).upper()
+    }
+
+
+def _put_text_in(card, region, text, font, color, thickness):
+    """Write one line of text centred in an ID_CARD_REGIONS box"""
+    height, width = card.shape[:2]
+    x1, y1, x2, y2 = (int(v * s) for v, s in zip(region, (width, height, width, height)))
+    (text_width, text_height), _ = cv2.getTextSize(text, font, 1.0, thickness)
+    scale = min(0.95 * (x2 - x1) / text_width, 0.6 * (y2 - y1) / text_height)
+    (text_width, text_height), _ = cv2.getTextSize(text, font, scale, thickness)
+    cv2.putText(card, text, (x1 + (x2 - x1 - text_width) // 2, (y1 + y2 + text_height) // 2),
+                font, scale, color, thickness, cv2.LINE_AA)
+
+
+def render_id_card(student, rng, size=ID_CARD_SIZE):
+    """
+    Flat card with the fields where ID_CARD_REGIONS expects them
+
+    Args:
+        student (dict): Output of random_student
+        rng (random.Random): Random source
+        size (tuple): Card (width, height)
+
+    Returns:
+        numpy.ndarray: BGR image
+    """
+    width, height = size
+    card = np.full((height, width, 3), rng.randint(235, 250), dtype=np.uint8)
+    header_color = rng.choice([(120, 40, 20), (30, 30, 140), (90, 90, 20)])
+    cv2.rectangle(card, (0, 0), (width, int(0.12 * height)), header_color, -1)
+    _put_text_in(card, (0.04, 0.02, 0.96, 0.10), INSTITUTE_NAME, cv2.FONT_HERSHEY_DUPLEX, (255, 255, 255), 2)
+
+    # Photo: head and shoulders on a plain backdrop
+    px1, py1, px2, py2 = (int(v * s) for v, s in zip(ID_CARD_REGIONS['photo'], (width, height, width, height)))
+    cv2.rectangle(card, (px1, py1), (px2, py2), (rng.randint(150, 220),) * 3, -1)
+    skin = (rng.randint(60, 140), rng.randint(100, 170), rng.randint(150, 220))
+    pw, ph = px2 - px1, py2 - py1
+    cv2.ellipse(card, (px1 + pw // 2, py2 + ph // 20), (int(0.42 * pw), int(0.3 * ph)), 0, 180, 360,
+                tuple(rng.randint(20, 120) for _ in range(3)), -1)
+    cv2.ellipse(card, (px1 + pw // 2, py1 + int(0.42 * ph)), (int(0.2 * pw), int(0.27 * ph)), 0, 0, 360, skin, -1)
+    cv2.rectangle(card, (px1, py1), (px2, py2), (80, 80, 80), 2)
+
+    font = rng.choice([cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX])
+    _put_text_in(card, ID_CARD_REGIONS['name'], student['name'], font, (0, 0, 0), 2)
+    _put_text_in(card, ID_CARD_REGIONS['department'], student['department'], font, (60, 30, 10), 2)
+    _put_text_in(card, ID_CARD_REGIONS['moodle_id'], student['moodle_id'], cv2.FONT_HERSHEY_DUPLEX, (0, 0, 0), 2)
+    return card
+
+
+def id_card_photo(card, rng, night=False):
+    """
+    Photograph a card: on a table, at an angle, under uneven light
+
+    Args:
+        card (numpy.ndarray): Output of render_id_card
+        rng (random.Random): Random source
+        night (bool): Dim, noisy indoor light
+
+    Returns:
+        numpy.ndarray: BGR photo (portrait or landscape phone frame)
+    """
+    width, height = rng.choice([(960, 1280), (1280, 960), (720, 1280)])
+    np_rng = np.random.default_rng(rng.getrandbits(32))
+    table = np.array([rng.randint(60, 200) for _ in range(3)], dtype=np.float32)
+    photo = np.clip(table + np_rng.normal(0, 10, (height, width, 3)), 0, 255).astype(np.uint8)
+
+    ch, cw = card.shape[:2]
+    card_height = rng.uniform(0.55, 0.85) * height
+    card_width = card_height * cw / ch
+    cx, cy = width / 2 + rng.uniform(-0.1, 0.1) * width, height / 2 + rng.uniform(-0.05, 0.05) * height
+    jitter = 0.06 * card_height
+    quad = np.float32([
+        (cx + sx * card_width / 2 + rng.uniform(-jitter, jitter), cy + sy * card_height / 2 + rng.uniform(-jitter, jitter))
+        for sx, sy in [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+    ])
+    paste_warped(photo, card, quad)
+
+    # Light falling off from one side
+    xx = np.linspace(0, 1, width)[None, :, None]
+    light = 1.0 - rng.uniform(0, 0.35) * (xx if rng.random() < 0.5 else 1 - xx)
+    photo = np.clip(photo.astype(np.float32) * light, 0, 255).astype(np.uint8)
+    conditions = {
+        'night': night,
+        'noise': rng.uniform(8, 16) if night else rng.uniform(0, 4),
+        'blur': rng.choice((0, 0, 0, 3, 5)),
+        'blur_angle': rng.uniform(0, 180),
+        'jpeg_quality': rng.randint(60, 92)
+    }
+    return degrade(photo, conditions, np_rng)
+
+
+def generate_id_cards(output_dir, count, seed=42, night_share=0.1):
+    """
+    Write card photos and a ground_truth.json in the data/training_data format
+
+    Args:
+        output_dir (Path): Output directory
+        count (int): Number of cards
+        seed (int): RNG seed
+        night_share (float): Share of dim photos
+
+    Returns:
+        Path: ground_truth.json
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    images = {}
+    for i in range(count):
+        student = random_student(rng, i)
+        photo = id_card_photo(render_id_card(student, rng), rng, night=rng.random() < night_share)
+        name = f"card_{i:06d}.jpg"
+        cv2.imwrite(str(output_dir / name), photo)
+        images[name] = {'cards': [student]}
+        if (i + 1) % 500 == 0:
+            print(f"   {i + 1}/{count} ID cards")
+
+    ground_truth_path = output_dir / 'ground_truth.json'
+    with open(ground_truth_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'description': f"Synthetic ID card photos (seed {seed}), fields laid out per ID_CARD_REGIONS.",
+            'fields': ['moodle_id', 'name', 'department'],
+            'images': images
+        }, f, indent=2)
+    return ground_truth_path
+
+
+# ========================
+# MAIN
+# ========================
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate labelled synthetic plates and ID cards for stress tests')
+    subparsers = parser.add_subparsers(dest='kind', required=True)
+
+    plates = subparsers.add_parser('plates', help='Vehicle frames and gate videos')
+    plates.add_argument('--count', type=int, default=1000, help='Frames to write (default: 1000)')
+    plates.add_argument('--video-seconds', type=float, default=0, help='Also write gate videos of this length')
+    plates.add_argument('--videos', type=int, default=4, help='Number of gate videos (default: 4)')
+    plates.add_argument('--bh-share', type=float, default=0.1, help='Share of BH series plates (default: 0.1)')
+    plates.add_argument('--night-share', type=float, default=0.25, help='Share of night shots (default: 0.25)')
+    plates.add_argument('--output', type=str, default=str(SYNTHETIC_DIR / 'plates'), help='Output directory')
+
+    cards = subparsers.add_parser('id-cards', help='ID card photos with ground truth')
+    cards.add_argument('--count', type=int, default=500, help='Cards to write (default: 500)')
+    cards.add_argument('--night-share', type=float, default=0.1, help='Share of dim photos (default: 0.1)')
+    cards.add_argument('--output', type=str, default=str(SYNTHETIC_DIR / 'id_cards'), help='Output directory')
+
+    for subparser in (plates, cards):
+        subparser.add_argument('--seed', type=int, default=42, help='RNG seed (default: 42)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧪 SYNTHETIC TEST DATA")
+    print("=" * 70)
+    start = time.perf_counter()
+    if args.kind == 'plates':
+        path = generate_plates(args.output, args.count, args.seed, args.video_seconds, args.videos,
+                               args.night_share, args.bh_share)
+    else:
+        path = generate_id_cards(args.output, args.count, args.seed, args.night_share)
+    print(f"✅ {args.count} {args.kind} in {time.perf_counter() - start:.1f}s")
+    print(f"💾 Labels saved to: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
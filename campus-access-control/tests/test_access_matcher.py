@@ -0,0 +1,134 @@
+"""
+Pending Verification Matcher Tests
+Pairing and expiry of access_matcher.PendingMatcher, on a fake clock
+
+Usage:
+    python -m pytest tests/test_access_matcher.py
+    python tests/test_access_matcher.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from access_matcher import PendingMatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDirectory:
+    """Owner index with the DirectoryCache lookup interface (canonical plates)"""
+
+    def __init__(self, owners):
+        self.owners = owners
+
+    def owner_of(self, plate):
+        return self.owners.get(plate)
+
+    def plates_of(self, moodle_id):
+        return frozenset(plate for plate, owner in self.owners.items() if owner == moodle_id)
+
+
+def vehicle(plate):
+    return {'plate_text': plate}
+
+
+def card(moodle_id):
+    return {'moodle_id': moodle_id}
+
+
+def make_matcher(clock):
+    directory = FakeDirectory({'MH01AB1234': '22102003', 'MH02CD5678': '22102004',
+                               'MH03EF9012': '22102003'})
+    return PendingMatcher(30, directory=directory, clock=clock)
+
+
+def test_vehicle_pairs_with_its_owners_card_only():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    assert matcher.add_id_card(card('22102004'), 't0') is None
+    assert matcher.add_id_card(card('22102003'), 't1') is None
+
+    # Spacing / case differences still find the owner
+    match = matcher.add_vehicle(vehicle('mh 01-ab 1234'), 't2')
+    assert match['id_card']['moodle_id'] == '22102003'
+    assert list(matcher.pending_cards) == ['22102004']
+
+
+def test_card_pairs_with_the_oldest_of_its_owners_vehicles():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    matcher.add_vehicle(vehicle('MH03EF9012'), 't0')
+    clock.now += 1
+    matcher.add_vehicle(vehicle('MH01AB1234'), 't1')
+    matcher.add_vehicle(vehicle('MH02CD5678'), 't2')
+
+    match = matcher.add_id_card(card('22102003'), 't3')
+    assert match['vehicle']['plate_text'] == 'MH03EF9012'
+    assert set(matcher.pending_vehicles) == {'MH01AB1234', 'MH02CD5678'}
+
+
+def test_unknown_plate_stays_pending():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    matcher.add_id_card(card('22102003'), 't0')
+    assert matcher.add_vehicle(vehicle('KA05XY0001'), 't1') is None
+    assert len(matcher) == 2
+
+
+def test_unmatched_events_expire_after_the_window():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    matcher.add_vehicle(vehicle('MH01AB1234'), 't0')
+    clock.now += 10
+    matcher.add_id_card(card('22102004'), 't1')
+
+    clock.now += 25
+    expired = matcher.expire()
+    assert [entry['vehicle']['plate_text'] for entry in expired] == ['MH01AB1234']
+    assert len(matcher) == 1
+
+    clock.now += 10
+    assert [entry['id_card']['moodle_id'] for entry in matcher.expire()] == ['22102004']
+    assert len(matcher) == 0
+
+
+def test_expired_entry_is_not_matched_before_expire_runs():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    matcher.add_id_card(card('22102003'), 't0')
+    clock.now += 31
+    assert matcher.add_vehicle(vehicle('MH01AB1234'), 't1') is None
+
+
+def test_repeated_detection_restarts_the_window():
+    clock = FakeClock()
+    matcher = make_matcher(clock)
+    matcher.add_vehicle(vehicle('MH01AB1234'), 't0')
+    clock.now += 20
+    matcher.add_vehicle(vehicle('MH01AB1234'), 't1')
+    clock.now += 20
+    assert matcher.expire() == []
+    assert matcher.add_id_card(card('22102003'), 't2')['timestamp'] == 't1'
+
+
+def test_without_directory_pairs_with_the_oldest_pending():
+    clock = FakeClock()
+    matcher = PendingMatcher(30, clock=clock)
+    matcher.add_id_card(card('A'), 't0')
+    matcher.add_id_card(card('B'), 't1')
+    assert matcher.add_vehicle(vehicle('ANY1'), 't2')['id_card']['moodle_id'] == 'A'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,93 @@
+"""
+Micro-Batching Scheduler Tests
+Deadline and batching behaviour of batch_scheduler.MicroBatchScheduler
+
+Usage:
+    python -m pytest tests/test_batch_scheduler.py
+    python tests/test_batch_scheduler.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from batch_scheduler import DeadlineExceeded, MicroBatchScheduler
+
+
+def double(items):
+    return [item * 2 for item in items]
+
+
+def test_deadline_shorter_than_max_wait_is_dispatched():
+    """A deadline inside the batching window closes the batch early instead of expiring the request"""
+    scheduler = MicroBatchScheduler(double, max_wait_ms=50, deadline_ms=20)
+    try:
+        assert scheduler.run(3, timeout=1) == 6
+        stats = scheduler.get_stats()
+        assert stats['batches'] == 1
+        assert stats['deadline_misses'] == 0
+    finally:
+        scheduler.stop()
+
+
+def test_batch_closes_before_max_wait_for_deadline():
+    """The early close happens near the deadline, not after max_wait"""
+    scheduler = MicroBatchScheduler(double, max_wait_ms=500, deadline_ms=30)
+    try:
+        request = scheduler.submit(1)
+        assert request.wait(timeout=1) == 2
+        assert request.latency_ms < 250
+    finally:
+        scheduler.stop()
+
+
+def test_request_stuck_behind_a_slow_batch_expires():
+    """A request still queued past its deadline is reported, not run"""
+    started = threading.Event()
+
+    def slow(items):
+        started.set()
+        time.sleep(0.2)
+        return double(items)
+
+    scheduler = MicroBatchScheduler(slow, max_batch_size=1, max_wait_ms=0, deadline_ms=50)
+    try:
+        first = scheduler.submit(1)
+        assert started.wait(1)
+        second = scheduler.submit(2)
+        assert first.wait(timeout=1) == 2
+        try:
+            second.wait(timeout=1)
+            raise AssertionError("expected DeadlineExceeded")
+        except DeadlineExceeded:
+            pass
+        assert scheduler.get_stats()['deadline_misses'] == 1
+    finally:
+        scheduler.stop()
+
+
+def test_requests_from_several_sources_share_a_batch():
+    """Requests queued within the window run in one batch, each getting its own result"""
+    sizes = []
+
+    def record(items):
+        sizes.append(len(items))
+        return double(items)
+
+    scheduler = MicroBatchScheduler(record, max_batch_size=4, max_wait_ms=100)
+    try:
+        requests = [scheduler.submit(i, source=f"cam{i}") for i in range(4)]
+        assert [request.wait(timeout=1) for request in requests] == [0, 2, 4, 6]
+        assert sizes == [4]
+    finally:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,114 @@
+"""
+Degradation Controller Tests
+Step-down / step-up behaviour of degradation.DegradationController, on a fake clock
+
+Usage:
+    python -m pytest tests/test_degradation.py
+    python tests/test_degradation.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from degradation import DegradationController, QUALITY_LEVELS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.settings = None
+
+    def set_quality(self, **settings):
+        self.settings = settings
+
+
+def make_controller(clock, recognizer=None):
+    return DegradationController(2.0, recognizers=[recognizer] if recognizer else (),
+                                 degrade_at=0.8, restore_below=0.5, cooldown_seconds=5,
+                                 min_samples=20, idle_restore_seconds=30, clock=clock)
+
+
+def degrade(controller, clock):
+    """Advance past the cooldown and record a slow burst"""
+    clock.now += 6
+    for _ in range(20):
+        controller.record(1.9)
+
+
+def test_slow_decisions_step_down_and_apply_settings():
+    clock, recognizer = FakeClock(), FakeRecognizer()
+    controller = make_controller(clock, recognizer)
+    assert recognizer.settings['denoise'] is True
+
+    degrade(controller, clock)
+    assert controller.level == 1
+    assert recognizer.settings['denoise'] is False
+    assert controller.get_stats()['step_downs'] == 1
+
+
+def test_no_step_inside_cooldown():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    for _ in range(40):
+        controller.record(1.9)
+    assert controller.level == 0
+
+
+def test_fast_decisions_step_up():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    degrade(controller, clock)
+    clock.now += 6
+    for _ in range(20):
+        controller.record(0.2)
+    assert controller.level == 0
+    assert controller.get_stats()['step_ups'] == 1
+
+
+def test_quiet_gate_steps_up_without_new_decisions():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    degrade(controller, clock)
+    assert controller.level == 1
+
+    clock.now += 10
+    assert controller.update() == 0          # Past the cooldown, not yet idle long enough
+    clock.now += 25
+    assert controller.update() == -1
+    assert controller.level == 0
+    assert controller.get_stats()['idle_step_ups'] == 1
+    assert controller.history[-1]['p95_seconds'] is None
+
+
+def test_slow_decision_blocks_idle_step_up():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    degrade(controller, clock)
+    controller.record(1.9)                   # Still near the budget, just few decisions
+    clock.now += 60
+    assert controller.update() == 0
+    assert controller.level == 1
+
+
+def test_bottom_level_does_not_step_further():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    for _ in range(len(QUALITY_LEVELS) + 2):
+        degrade(controller, clock)
+    assert controller.level == len(QUALITY_LEVELS) - 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
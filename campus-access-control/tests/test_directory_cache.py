@@ -0,0 +1,88 @@
+"""
+Directory Cache Tests
+Loading, incremental refresh and full reload of database.directory_cache
+against an in-memory SQLite backend
+
+Usage:
+    python -m pytest tests/test_directory_cache.py
+    python tests/test_directory_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from database.directory_cache import DirectoryCache, canonical_plate
+from database.sqlite_manager import SQLiteManager
+
+
+def make_db():
+    db = SQLiteManager(':memory:')
+    assert db.connect() and db.create_tables()
+    db.insert_student('22102003', 'RAHUL SHARMA', 'COMPUTER ENGINEERING')
+    db.insert_student('22102004', 'PRIYA PATIL', 'CIVIL ENGINEERING')
+    db.insert_vehicle('MH 01 AB 1234', '22102003')
+    db.insert_vehicle('MH02CD5678', '22102004')
+    return db
+
+
+def test_canonical_plate():
+    assert canonical_plate('mh 01-ab 1234') == 'MH01AB1234'
+    assert canonical_plate(None) == ''
+
+
+def test_load_and_lookups():
+    directory = DirectoryCache(make_db())
+    assert directory.load()
+    assert directory.get_student('22102003')['name'] == 'RAHUL SHARMA'
+    assert directory.get_vehicle('mh01ab-1234')['owner_moodle_id'] == '22102003'
+    assert directory.owner_of('MH01AB1234') == '22102003'
+    assert directory.plates_of('22102003') == {'MH01AB1234'}
+    assert directory.get_student('99999999') is None
+
+
+def test_refresh_moves_a_plate_to_its_new_owner():
+    db = make_db()
+    directory = DirectoryCache(db)
+    directory.load()
+    db.insert_vehicle('MH 01 AB 1234', '22102004')
+    assert directory.refresh()
+    assert directory.owner_of('MH01AB1234') == '22102004'
+    assert directory.plates_of('22102003') == frozenset()
+    assert directory.plates_of('22102004') == {'MH01AB1234', 'MH02CD5678'}
+
+
+def test_placeholders_are_not_registered():
+    db = make_db()
+    db.ensure_student('11111111', 'OCR NAME')
+    db.ensure_vehicle('KA05XY0001')
+    directory = DirectoryCache(db)
+    directory.load()
+    assert directory.get_student('11111111') is None
+    assert directory.get_vehicle('KA05XY0001') is None
+
+
+def test_full_reload_drops_deleted_rows():
+    db = make_db()
+    directory = DirectoryCache(db)
+    directory.load()
+    with db.connection:
+        db.connection.execute("DELETE FROM vehicles WHERE owner_moodle_id = '22102004';")
+        db.connection.execute("DELETE FROM students WHERE moodle_id = '22102004';")
+
+    directory.refresh()                      # Polling cannot see deletions
+    assert directory.get_student('22102004') is not None
+
+    assert directory.load()
+    assert directory.get_student('22102004') is None
+    assert directory.owner_of('MH02CD5678') is None
+    assert directory.plates_of('22102004') == frozenset()
+    assert directory.get_student('22102003') is not None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,88 @@
+"""
+Local Event Spool Tests
+Durability and idempotent replay of database.local_spool.LocalEventSpool
+
+Usage:
+    python -m pytest tests/test_local_spool.py
+    python tests/test_local_spool.py
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from database.local_spool import LocalEventSpool
+
+
+def vehicle_event(event_id, plate):
+    row = (plate, 0.91, 'gate-1', None, 'allowed', datetime(2026, 10, 18, 9, 30, 15, 250000))
+    return (event_id, 'vehicle', row)
+
+
+def test_rows_round_trip_with_datetimes():
+    with tempfile.TemporaryDirectory() as folder:
+        spool = LocalEventSpool(Path(folder) / 'spool.db')
+        event = vehicle_event('e1', 'MH01AB1234')
+        assert spool.put(event)
+        [(_, taken)] = spool.take(10)
+        assert taken == event
+        spool.close()
+
+
+def test_unacked_events_replay_with_the_same_ids_after_restart():
+    """A crash between take() and ack() resends the same event_ids, so ON CONFLICT skips rows already written"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / 'spool.db'
+        spool = LocalEventSpool(path)
+        events = [vehicle_event(f"e{i}", f"MH01AB{i:04d}") for i in range(3)]
+        for event in events:
+            spool.put(event)
+        first = spool.take(10)
+        assert spool.take(10) == []          # Handed out once per run
+        spool.close()                        # No ack: the write never committed
+
+        spool = LocalEventSpool(path)
+        replayed = spool.take(10)
+        assert [event for _, event in replayed] == [event for _, event in first] == events
+        spool.ack(replayed)
+        assert spool.depth() == 0
+        spool.close()
+
+        spool = LocalEventSpool(path)
+        assert spool.depth() == 0
+        assert spool.take(10) == []
+        spool.close()
+
+
+def test_acked_events_are_not_replayed():
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / 'spool.db'
+        spool = LocalEventSpool(path)
+        spool.put(vehicle_event('e1', 'MH01AB0001'))
+        spool.put(vehicle_event('e2', 'MH01AB0002'))
+        spool.ack(spool.take(1))
+        spool.close()
+
+        spool = LocalEventSpool(path)
+        assert [event[0] for _, event in spool.take(10)] == ['e2']
+        spool.close()
+
+
+def test_full_spool_refuses_new_events():
+    with tempfile.TemporaryDirectory() as folder:
+        spool = LocalEventSpool(Path(folder) / 'spool.db', max_events=2)
+        assert spool.put(vehicle_event('e1', 'A1'))
+        assert spool.put(vehicle_event('e2', 'A2'))
+        assert not spool.put(vehicle_event('e3', 'A3'))
+        assert spool.depth() == 2
+        spool.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,76 @@
+"""
+Pipeline Timing Tests
+Percentiles and windows of pipeline_timing.LatencyHistogram / PipelineTimer
+
+Usage:
+    python -m pytest tests/test_pipeline_timing.py
+    python tests/test_pipeline_timing.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from pipeline_timing import LatencyHistogram, PipelineTimer
+
+
+def close_to(value, expected, tolerance=0.05):
+    """Within the histogram's relative bucket error"""
+    return abs(value - expected) <= expected * tolerance
+
+
+def test_percentiles_within_bucket_error():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert close_to(histogram.percentile(50), 0.5)
+    assert close_to(histogram.percentile(95), 0.95)
+    assert close_to(histogram.percentile(99), 0.99)
+    assert histogram.percentile(100) == 1.0
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_merge_adds_samples():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(0.01)
+    second.record(0.2)
+    second.record(0.3)
+    first.merge(second)
+    assert first.count == 3
+    assert first.max_seconds == 0.3
+
+
+def test_report_since_covers_only_new_samples():
+    timer = PipelineTimer()
+    for _ in range(50):
+        timer.record('ocr', 0.5)
+    snapshot = timer.snapshot()
+    for _ in range(10):
+        timer.record('ocr', 0.01)
+
+    report = timer.report_since(snapshot)
+    assert report['ocr']['count'] == 10
+    assert report['ocr']['p99_ms'] <= 11
+    assert 'detect' not in report
+    assert timer.report()['ocr']['count'] == 60
+
+
+def test_stage_context_manager_and_disabled_timer():
+    timer = PipelineTimer()
+    with timer.stage('parse'):
+        pass
+    assert timer.report()['parse']['count'] == 1
+
+    disabled = PipelineTimer(enabled=False)
+    with disabled.stage('parse'):
+        pass
+    disabled.record('ocr', 1.0)
+    assert disabled.report() == {}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
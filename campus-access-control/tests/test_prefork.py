@@ -0,0 +1,58 @@
+"""
+Prefork Pool Tests
+Worker failure handling of prefork.PreforkPool (fork start method, fake job)
+
+Usage:
+    python -m pytest tests/test_prefork.py
+    python tests/test_prefork.py
+"""
+
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import prefork
+
+
+def handle(model, item):
+    """Double an item; 'crash' kills the worker the way an OOM kill would"""
+    if item == 'crash':
+        os._exit(9)
+    return item * 2
+
+
+# Forked workers inherit this entry, so nothing needs to be importable by name
+prefork.JOBS['test-double'] = (lambda: object(), lambda model: None, handle)
+
+
+def fork_available():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def test_map_returns_results_in_order():
+    if not fork_available():
+        return
+    pool = prefork.PreforkPool('test-double', workers=2, threads_per_worker=1).start()
+    assert pool.map([1, 2, 3, 4]) == [2, 4, 6, 8]
+
+
+def test_dead_worker_raises_instead_of_hanging():
+    if not fork_available():
+        return
+    pool = prefork.PreforkPool('test-double', workers=2, threads_per_worker=1).start()
+    try:
+        pool.map([1, 'crash', 3, 4])
+        raise AssertionError("expected WorkerDied")
+    except prefork.WorkerDied as e:
+        assert 'exit code 9' in str(e)
+    assert pool.processes == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,70 @@
+"""
+Bounded Session Buffer Tests
+Eviction, spill and JSON output of ring_buffer.SpillingRingBuffer
+
+Usage:
+    python -m pytest tests/test_ring_buffer.py
+    python tests/test_ring_buffer.py
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ring_buffer import SpillingRingBuffer, dump_json
+
+
+def test_memory_stays_bounded_and_every_item_reads_back_in_order():
+    with tempfile.TemporaryDirectory() as folder:
+        buffer = SpillingRingBuffer('test', capacity=8, spill_dir=folder)
+        buffer.extend({'n': i} for i in range(100))
+        assert buffer.in_memory < 8 + 8 // 4
+        assert len(buffer) == buffer.total == 100
+        assert [item['n'] for item in buffer] == list(range(100))
+        assert [item['n'] for item in buffer.recent(3)] == [97, 98, 99]
+        buffer.close()
+
+
+def test_without_spill_old_items_are_dropped():
+    with tempfile.TemporaryDirectory() as folder:
+        buffer = SpillingRingBuffer('test', capacity=8, spill=False, spill_dir=folder)
+        buffer.extend(range(100))
+        assert buffer.total == 100
+        assert len(buffer) == buffer.in_memory
+        assert list(buffer) == list(range(100 - len(buffer), 100))
+        assert buffer.stats()['spill_path'] is None
+
+
+def test_close_deletes_the_spill_file():
+    with tempfile.TemporaryDirectory() as folder:
+        buffer = SpillingRingBuffer('test', capacity=4, spill_dir=folder)
+        buffer.extend(range(20))
+        path = Path(buffer.stats()['spill_path'])
+        assert path.exists()
+        buffer.close()
+        assert not path.exists()
+        assert len(buffer) == 0
+
+
+def test_dump_json_matches_json_dump():
+    with tempfile.TemporaryDirectory() as folder:
+        buffer = SpillingRingBuffer('test', capacity=4, spill_dir=folder)
+        buffer.extend({'plate': f"MH01AB{i:04d}", 'ok': i % 2 == 0} for i in range(15))
+        document = {'session': 'gate-1', 'detections': buffer, 'empty': SpillingRingBuffer('none')}
+
+        out = io.StringIO()
+        dump_json(document, out)
+        expected = {'session': 'gate-1', 'detections': list(buffer), 'empty': []}
+        assert out.getvalue() == json.dumps(expected, indent=2, ensure_ascii=False)
+        buffer.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
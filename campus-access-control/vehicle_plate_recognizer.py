@@ -5,19 +5,21 @@ Processes video frame-by-frame and saves to JSON
 """
 
 import cv2
-import torch
-import easyocr
 import numpy as np
 import json
 import re
 from datetime import datetime
 from pathlib import Path
-from ultralytics import YOLO
 import sys
 
 # Add config to path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from config.config import *
+from camera_capture import open_camera, camera_source
+from model_registry import get_yolo, get_ocr_reader, resolve_device
+from model_warmup import synthetic_frame, synthetic_plate, time_warmup, print_warmup_report
+from pipeline_timing import PipelineTimer
+from ring_buffer import SpillingRingBuffer, dump_json
 
 
 class VehiclePlateRecognizer:
@@ -25,16 +27,18 @@ class VehiclePlateRecognizer:
     Vehicle number plate recognition system for Indian license plates
     """
     
-    def __init__(self, model_path=None, use_gpu=True):
+    def __init__(self, model_path=None, use_gpu=True, warmup=WARMUP_ON_INIT):
         """
         Initialize the vehicle plate recognizer
         
         Args:
             model_path (str): Path to YOLO model weights
             use_gpu (bool): Whether to use GPU acceleration
+            warmup (bool): Run the models once before returning (see warmup())
         """
         self.use_gpu = use_gpu
-        self.device = 'cuda' if (use_gpu and torch.cuda.is_available()) else 'cpu'
+        self.device = resolve_device(use_gpu)
+        ensure_directories()
         
         print("=" * 70)
         print("🚗 VEHICLE NUMBER PLATE RECOGNITION SYSTEM")
@@ -42,6 +46,7 @@ class VehiclePlateRecognizer:
         print(f"🔧 Device: {self.device.upper()}")
         
         if self.device == 'cuda':
+            import torch
             print(f"🎮 GPU: {torch.cuda.get_device_name(0)}")
             print(f"🔥 CUDA Version: {torch.version.cuda}")
         
@@ -49,17 +54,18 @@ class VehiclePlateRecognizer:
         if model_path is None:
             model_path = YOLO_MODEL_PATH
         
+        # Models come from the process-wide registry, so other recognizers
+        # with the same weights / languages reuse these instances
         print(f"\n📦 Loading YOLO model from: {model_path}")
-        self.model = YOLO(str(model_path))
-        self.model.to(self.device)
+        self.model = get_yolo(model_path, self.device).load()
         print("✅ YOLO model loaded successfully")
         
         # Initialize EasyOCR
         print(f"\n📝 Initializing EasyOCR (GPU: {OCR_GPU})...")
-        self.reader = easyocr.Reader(
+        self.reader = get_ocr_reader(
             OCR_LANGUAGES, 
-            gpu=OCR_GPU if self.device == 'cuda' else False
-        )
+            use_gpu=OCR_GPU and self.device == 'cuda'
+        ).load()
         print("✅ EasyOCR initialized successfully")
         
         # Statistics
@@ -67,11 +73,67 @@ class VehiclePlateRecognizer:
             'frames_processed': 0,
             'plates_detected': 0,
             'plates_extracted': 0,
-            'processing_times': []
+            'ocr_calls': 0
         }
         
+        # Per-stage latency histograms (decode, detect, preprocess, ocr, parse)
+        self.timing = PipelineTimer(enabled=PIPELINE_TIMING)
+        
+        # Quality settings (lowered by degradation.py under load)
+        self.imgsz = YOLO_IMAGE_SIZE
+        self.denoise = True
+        self.fast_preprocess = False
+        
+        # Not ready until the models have run once
+        self.ready = False
+        self.warmup_report = None
+        if warmup:
+            self.warmup()
+        
         print("=" * 70)
     
+    def set_quality(self, imgsz=None, denoise=None, fast_preprocess=None):
+        """
+        Trade accuracy for speed (used by the degradation controller)
+        
+        Args:
+            imgsz (int): YOLO input size
+            denoise (bool): Run fastNlMeansDenoising before OCR
+            fast_preprocess (bool): Grayscale + resize only before OCR
+        """
+        if imgsz is not None:
+            self.imgsz = imgsz
+        if denoise is not None:
+            self.denoise = denoise
+        if fast_preprocess is not None:
+            self.fast_preprocess = fast_preprocess
+    
+    def warmup(self, runs=WARMUP_RUNS):
+        """
+        Run YOLO on a camera-sized frame and EasyOCR on a plate crop, then
+        mark the recognizer ready
+        
+        Args:
+            runs (int): Passes per model (the first one is the cold one)
+            
+        Returns:
+            dict: Cold / warm latency per model
+        """
+        plate = synthetic_plate()
+        frame = synthetic_frame(insert=plate)
+        crop = self.preprocess_plate_roi(plate)
+        
+        self.warmup_report = {
+            'yolo': time_warmup(
+                lambda: self.model(frame, conf=YOLO_CONFIDENCE_THRESHOLD, imgsz=self.imgsz, verbose=False),
+                runs
+            ),
+            'easyocr': time_warmup(lambda: self.reader.readtext(crop, detail=1), runs)
+        }
+        self.ready = True
+        print_warmup_report(self.warmup_report)
+        return self.warmup_report
+    
     def extract_text_from_roi(self, frame, x1, y1, x2, y2):
         """
         Extract text from license plate region using EasyOCR
@@ -91,19 +153,23 @@ class VehiclePlateRecognizer:
             return ""
         
         # Preprocess ROI
-        roi = self.preprocess_plate_roi(roi)
+        with self.timing.stage('preprocess'):
+            roi = self.preprocess_plate_roi(roi)
         
         # Run OCR
         try:
-            results = self.reader.readtext(roi, detail=1)
-            
-            text = ""
-            for (bbox, detected_text, confidence) in results:
-                if confidence > OCR_CONFIDENCE_THRESHOLD:
-                    text += detected_text + " "
+            self.stats['ocr_calls'] += 1
+            with self.timing.stage('ocr'):
+                results = self.reader.readtext(roi, detail=1)
             
-            # Clean and format text
-            text = self.clean_plate_text(text.strip())
+            with self.timing.stage('parse'):
+                text = ""
+                for (bbox, detected_text, confidence) in results:
+                    if confidence > OCR_CONFIDENCE_THRESHOLD:
+                        text += detected_text + " "
+                
+                # Clean and format text
+                text = self.clean_plate_text(text.strip())
             return text
             
         except Exception as e:
@@ -131,12 +197,18 @@ class VehiclePlateRecognizer:
         else:
             gray = roi
         
+        if self.fast_preprocess:
+            return gray
+        
         # Apply adaptive thresholding
         thresh = cv2.adaptiveThreshold(
             gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
             cv2.THRESH_BINARY, 11, 2
         )
         
+        if not self.denoise:
+            return thresh
+        
         # Denoise
         denoised = cv2.fastNlMeansDenoising(thresh, h=10)
         
@@ -228,15 +300,45 @@ class VehiclePlateRecognizer:
         Returns:
             dict: Detection results
         """
+        # Run YOLO detection
+        with self.timing.stage('detect'):
+            results = self.model(frame, conf=YOLO_CONFIDENCE_THRESHOLD, imgsz=self.imgsz, verbose=False)
+        
+        return self._extract_detections(frame, results, frame_number, timestamp)
+    
+    def detect_and_extract_batch(self, frames, frame_numbers, timestamps):
+        """
+        Detect license plates in several frames with one YOLO call
+        
+        Args:
+            frames (list): Input frames (e.g. from different cameras)
+            frame_numbers (list): Frame number of each frame
+            timestamps (list): Timestamp of each frame
+            
+        Returns:
+            list: (results_data, annotated_frame) per frame, in input order
+        """
+        if not frames:
+            return []
+        
+        # One forward pass for the whole batch; OCR still runs per plate
+        with self.timing.stage('detect'):
+            batch_results = self.model(list(frames), conf=YOLO_CONFIDENCE_THRESHOLD, imgsz=self.imgsz, verbose=False)
+        
+        return [
+            self._extract_detections(frame, [result], frame_number, timestamp)
+            for frame, result, frame_number, timestamp
+            in zip(frames, batch_results, frame_numbers, timestamps)
+        ]
+    
+    def _extract_detections(self, frame, results, frame_number, timestamp):
+        """OCR, validate and draw the YOLO boxes found in one frame"""
         results_data = {
             'frame_number': frame_number,
             'timestamp': timestamp,
             'detections': []
         }
         
-        # Run YOLO detection
-        results = self.model(frame, conf=YOLO_CONFIDENCE_THRESHOLD, verbose=False)
-        
         # Process detections
         for result in results:
             boxes = result.boxes
@@ -333,7 +435,7 @@ class VehiclePlateRecognizer:
                 'total_frames': total_frames
             },
             'processing_started': get_timestamp(),
-            'frames': []
+            'frames': SpillingRingBuffer(f"video_{video_path.stem}")
         }
         
         frame_count = 0
@@ -342,7 +444,8 @@ class VehiclePlateRecognizer:
         print("\n🔄 Processing frames...")
         
         while True:
-            ret, frame = cap.read()
+            with self.timing.stage('decode'):
+                ret, frame = cap.read()
             if not ret:
                 break
             
@@ -389,19 +492,21 @@ class VehiclePlateRecognizer:
             'plates_extracted': self.stats['plates_extracted'],
             'avg_fps': round(frame_count / processing_time, 2) if processing_time > 0 else 0
         }
+        all_results['stage_latency'] = self.timing.report()
         
         # Save to JSON
         if output_json_path is None:
             output_json_path = VEHICLE_OUTPUT_DIR / get_output_filename(f"vehicle_{video_path.stem}")
         
         with open(output_json_path, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, indent=2, ensure_ascii=False)
+            dump_json(all_results, f)
         
         print(f"\n✅ Processing complete!")
         print(f"⏱️  Time: {processing_time:.2f}s")
         print(f"📊 Stats: {self.stats['frames_processed']} frames, "
               f"{self.stats['plates_detected']} plates detected, "
               f"{self.stats['plates_extracted']} plates extracted")
+        self.timing.print_report()
         print(f"💾 Results saved to: {output_json_path}")
         
         return all_results
@@ -411,31 +516,30 @@ class VehiclePlateRecognizer:
         Process live camera stream
         
         Args:
-            camera_index (int): Camera index
+            camera_index (int or str): Camera index (or a recording to replay)
             duration (int): Duration in seconds (None = infinite)
         """
         print(f"\n📷 Starting camera stream (index: {camera_index})")
         
-        cap = cv2.VideoCapture(camera_index)
+        # Threaded capture: OCR always runs on the newest frame, never a stale backlog
+        cap = open_camera(camera_index, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, name='plates',
+                          timer=self.timing)
         if not cap.isOpened():
             print(f"❌ Failed to open camera: {camera_index}")
             return
         
-        # Set camera properties
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-        cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
-        
         print("✅ Camera opened. Press 'q' to quit, 's' to save detection")
         
         frame_count = 0
-        detections_log = []
+        detections_log = SpillingRingBuffer('camera_detections')
         start_time = datetime.now()
         
         while True:
-            ret, frame = cap.read()
+            ret, frame, frame_info = cap.read_latest()
             if not ret:
-                print("❌ Failed to read frame")
+                if cap.isOpened():
+                    continue  # No new frame within the timeout: stalled, not lost
+                print("❌ Camera stopped delivering frames")
                 break
             
             frame_count += 1
@@ -443,6 +547,7 @@ class VehiclePlateRecognizer:
             
             # Process frame
             results, annotated_frame = self.detect_and_extract(frame, frame_count, timestamp)
+            results['frame_age_ms'] = frame_info['age_ms']
             
             # Save detections
             if results['detections']:
@@ -469,6 +574,12 @@ class VehiclePlateRecognizer:
         cap.release()
         cv2.destroyAllWindows()
         
+        capture_stats = cap.get_stats()
+        print(f"📷 Frames captured: {capture_stats['frames_captured']}, "
+              f"processed: {capture_stats['frames_delivered']}, "
+              f"dropped (stale): {capture_stats['frames_dropped']}")
+        self.timing.print_report()
+        
         # Save all detections
         if detections_log:
             output_path = VEHICLE_OUTPUT_DIR / get_output_filename('camera_session')
@@ -476,11 +587,14 @@ class VehiclePlateRecognizer:
                 'session_started': start_time.isoformat(),
                 'session_ended': get_timestamp(),
                 'total_detections': len(detections_log),
+                'capture': capture_stats,
+                'stage_latency': self.timing.report(),
                 'detections': detections_log
             }
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
+                dump_json(session_data, f)
             print(f"💾 Session log saved: {output_path}")
+        detections_log.close()
 
 
 def main():
@@ -490,22 +604,31 @@ def main():
     parser = argparse.ArgumentParser(description='Vehicle Number Plate Recognition')
     parser.add_argument('--video', type=str, help='Path to video file')
     parser.add_argument('--camera', action='store_true', help='Use camera stream')
+    parser.add_argument('--camera-index', type=camera_source, default=0,
+                        help='Camera index, or a video / image directory to replay as a camera (default: 0)')
     parser.add_argument('--model', type=str, help='Path to YOLO model')
     parser.add_argument('--save-video', action='store_true', help='Save annotated video')
+    parser.add_argument('--profile', type=float, nargs='?', const=PROFILE_SECONDS, metavar='SECONDS',
+                        help=f'Capture a sampling profile once running (default window: {PROFILE_SECONDS:g}s); '
+                             'kill -USR1 <pid> captures one at any time')
     
     args = parser.parse_args()
     
     # Initialize recognizer
     recognizer = VehiclePlateRecognizer(model_path=args.model)
     
+    from profiling import start_profiler
+    profiler = start_profiler('plates', {'plates': recognizer.timing}, seconds=args.profile)
+    
     if args.camera:
         # Process camera stream
-        recognizer.process_camera_stream()
+        recognizer.process_camera_stream(camera_index=args.camera_index)
     elif args.video:
         # Process video file
         recognizer.process_video(args.video, save_video=args.save_video)
     else:
         print("❌ Please specify --video or --camera")
+    profiler.stop()
 
 
 if __name__ == "__main__":